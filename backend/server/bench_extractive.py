@@ -0,0 +1,95 @@
+"""
+Scaling benchmark for the built-in extractive summarizer (utils/extractive.py).
+
+Generates synthetic documents of growing size from a fixed vocabulary and
+times LSA and TextRank on one core, warm (after a first call has imported
+SciPy and filled the stem cache). If sumy is installed its LsaSummarizer is
+timed as well for comparison.
+
+Usage:
+    python bench_extractive.py [--sizes 1000,10000,50000] [--repeat 3] [--budget 1.0]
+"""
+
+import sys
+import time
+import random
+import argparse
+
+from utils import extractive
+
+TOPICS = [
+    "plants use sunlight water and carbon dioxide to make glucose and oxygen in their leaves",
+    "the water cycle moves water between oceans clouds rain rivers and the ground",
+    "fractions describe equal parts of a whole with a numerator and a denominator",
+    "volcanoes form where molten rock rises through cracks in the crust of the earth",
+    "ancient traders crossed deserts with caravans carrying silk spices and salt",
+]
+
+
+def make_document(n_words, seed=0):
+    rng = random.Random(seed)
+    vocabulary = " ".join(TOPICS).split()
+    sentences, count = [], 0
+    while count < n_words:
+        topic = rng.choice(TOPICS).split()
+        words = rng.sample(topic, rng.randint(6, len(topic))) + rng.sample(vocabulary, rng.randint(2, 8))
+        sentences.append(" ".join(words).capitalize() + ".")
+        count += len(words)
+    return " ".join(sentences)
+
+
+def best_time(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def sumy_lsa(text, sentence_count=3):
+    from sumy.parsers.plaintext import PlaintextParser
+    from sumy.nlp.tokenizers import Tokenizer
+    from sumy.summarizers.lsa import LsaSummarizer
+    from sumy.nlp.stemmers import Stemmer
+    from sumy.utils import get_stop_words
+
+    parser = PlaintextParser.from_string(text, Tokenizer("english"))
+    summarizer = LsaSummarizer(Stemmer("english"))
+    summarizer.stop_words = get_stop_words("english")
+    return summarizer(parser.document, sentence_count)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,10000,50000")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--budget", type=float, default=1.0, help="max seconds for the largest document")
+    args = parser.parse_args()
+
+    try:
+        import sumy  # noqa: F401
+        with_sumy = True
+    except ImportError:
+        with_sumy = False
+
+    extractive.summarize(make_document(200))  # warm-up: SciPy imports
+
+    print(f"{'Words':>8} {'LSA (s)':>10} {'TextRank (s)':>13}" + (f" {'sumy LSA (s)':>13}" if with_sumy else ""))
+    print("-" * (33 + (14 if with_sumy else 0)))
+    slowest = 0.0
+    for n_words in [int(s) for s in args.sizes.split(",")]:
+        text = make_document(n_words)
+        lsa = best_time(lambda: extractive.summarize(text, 3, "lsa"), args.repeat)
+        textrank = best_time(lambda: extractive.summarize(text, 3, "textrank"), args.repeat)
+        slowest = max(lsa, textrank)
+        line = f"{n_words:>8} {lsa:>10.3f} {textrank:>13.3f}"
+        if with_sumy:
+            line += f" {best_time(lambda: sumy_lsa(text), 1):>13.3f}"
+        print(line)
+
+    return 1 if slowest > args.budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
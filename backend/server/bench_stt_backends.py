@@ -0,0 +1,152 @@
+"""
+Real-time factor and memory benchmark for the STT backends.
+
+Each backend runs in its own subprocess (STT_BACKEND=<name>) so that peak RSS
+is measured per backend. Real-time factor is inference time divided by audio
+duration (lower is faster; below 1.0 is faster than real time). Transcripts
+are compared against the openai-whisper output.
+
+Without --audio a synthetic 16 kHz clip (voiced bursts separated by pauses)
+is generated. It exercises VAD, decoding and model cost but contains no words,
+so use real recordings to judge transcript parity.
+
+Usage:
+    python bench_stt_backends.py [--backends openai,faster] [--model small]
+                                 [--audio clip1.wav clip2.mp3 ...] [--repeat 2]
+"""
+
+import sys
+import os
+import json
+import time
+import wave
+import argparse
+import tempfile
+import subprocess
+from difflib import SequenceMatcher
+
+from utils.telemetry import metrics
+
+SAMPLE_RATE = 16000
+
+
+def synthesize_clip(path, seconds=20.0, seed=0):
+    """Write a 16 kHz mono WAV of pitch-modulated bursts with pauses"""
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    pitch = 140 + 40 * np.sin(2 * np.pi * 0.5 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / SAMPLE_RATE
+    voiced = sum(np.sin(k * phase) / k for k in range(1, 8))
+
+    # ~1.5 s of "speech" followed by ~0.7 s of silence, repeated
+    envelope = ((t % 2.2) < 1.5).astype(np.float32)
+    audio = 0.3 * voiced * envelope + 0.003 * rng.standard_normal(len(t))
+
+    pcm = (np.clip(audio, -1, 1) * 32767).astype(np.int16)
+    with wave.open(path, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes(pcm.tobytes())
+    return path
+
+
+def run_backend(audio_paths, repeat):
+    """Child mode: benchmark the backend selected by STT_BACKEND"""
+    from utils import stt
+    from bridge_stt import decode_audio
+
+    clips = []
+    for path in audio_paths:
+        audio, error = decode_audio(path)
+        if error:
+            raise RuntimeError(f"{path}: {error}")
+        clips.append(audio)
+    audio_seconds = sum(len(clip) for clip in clips) / SAMPLE_RATE
+
+    load_start = time.perf_counter()
+    stt.get_model()
+    load_seconds = time.perf_counter() - load_start
+
+    texts = []
+    start = time.perf_counter()
+    for _ in range(repeat):
+        texts = [stt.speech_to_text(clip).get("text", "") for clip in clips]
+    elapsed = (time.perf_counter() - start) / repeat
+
+    return {
+        "backend": stt.get_backend().name,
+        "model": "/".join(stt._model_key()),
+        "load_seconds": round(load_seconds, 2),
+        "audio_seconds": round(audio_seconds, 2),
+        "seconds": round(elapsed, 3),
+        "rtf": round(elapsed / audio_seconds, 4) if audio_seconds else None,
+        "peak_rss_mb": metrics.peak_rss_mb(),
+        "texts": texts,
+    }
+
+
+def benchmark(backend, audio_paths, repeat, model):
+    env = dict(os.environ, STT_BACKEND=backend)
+    if model:
+        env["WHISPER_MODEL"] = model
+    proc = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", "--repeat", str(repeat),
+         "--audio", *audio_paths],
+        env=env, capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__))
+    )
+    if proc.returncode != 0:
+        return {"backend": backend, "error": proc.stderr.strip().splitlines()[-1:] or ["failed"]}
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", default="openai,faster")
+    parser.add_argument("--model", help="Whisper model size (default: WHISPER_MODEL or small)")
+    parser.add_argument("--audio", nargs="+", help="audio files to transcribe")
+    parser.add_argument("--repeat", type=int, default=2)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_backend(args.audio, args.repeat)))
+        return 0
+
+    audio_paths = [os.path.abspath(p) for p in args.audio or []]
+    if not audio_paths:
+        audio_paths = [synthesize_clip(os.path.join(tempfile.mkdtemp(), "synthetic.wav"))]
+        print("No --audio given; using a synthetic clip (timing only, no transcript parity)\n")
+
+    backends = [b.strip() for b in args.backends.split(",") if b.strip()]
+    results = {b: benchmark(b, audio_paths, args.repeat, args.model) for b in backends}
+    reference = results.get("openai", {}).get("texts")
+
+    print(f"{'Backend':<8} {'Model':<28} {'Load (s)':>9} {'RTF':>8} {'Peak RSS MB':>12} {'Parity':>8}")
+    print("-" * 78)
+    failed = False
+    for backend, result in results.items():
+        if "error" in result:
+            print(f"{backend:<8} ERROR: {result['error'][0]}")
+            failed = True
+            continue
+
+        parity = None
+        if reference and any(reference):
+            parity = sum(
+                SequenceMatcher(None, ref.lower(), out.lower()).ratio()
+                for ref, out in zip(reference, result["texts"])
+            ) / len(reference)
+
+        rss = f"{result['peak_rss_mb']:.0f}" if result["peak_rss_mb"] else "n/a"
+        similarity = f"{parity:.3f}" if parity is not None else "n/a"
+        print(f"{backend:<8} {result['model']:<28} {result['load_seconds']:>9} {result['rtf']:>8} "
+              f"{rss:>12} {similarity:>8}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
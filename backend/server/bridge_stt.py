@@ -3,7 +3,8 @@ import os
 import json
 import traceback
 import subprocess
-import tempfile
+import time
+import wave
 
 # Add the STT directory to path - configurable via environment variable
 # Set STT_PATH environment variable to point to your STT utils directory
@@ -12,10 +13,14 @@ sys.path.append(stt_path)
 
 try:
     from utils import stt
+    from utils.result_cache import get_cache, file_digest
+    from utils.telemetry import metrics
 except ImportError as e:
     # Try alternative import if utils is in the same directory
     try:
         import stt
+        from result_cache import get_cache, file_digest
+        from telemetry import metrics
     except ImportError:
         print(json.dumps({
             "error": f"Import failed: {str(e)}", 
@@ -24,75 +29,117 @@ except ImportError as e:
         }))
         sys.exit(1)
 
-def convert_to_wav(input_path):
-    """Convert any audio format to WAV using ffmpeg"""
+SAMPLE_RATE = 16000  # Whisper's expected input rate
+AUDIO_SECONDS_BUCKETS = (5, 15, 30, 60, 120, 300, 600, 1800)
+
+
+def read_wav_16k_mono(path):
+    """Load a 16 kHz mono 16-bit PCM WAV directly; returns None for any other format"""
+    import numpy as np
+    try:
+        with wave.open(path, 'rb') as wav:
+            if (wav.getframerate() != SAMPLE_RATE or wav.getnchannels() != 1
+                    or wav.getsampwidth() != 2 or wav.getcomptype() != 'NONE'):
+                return None
+            frames = wav.readframes(wav.getnframes())
+    except (wave.Error, EOFError):
+        return None
+    return np.frombuffer(frames, dtype=np.int16).astype(np.float32) / 32768.0
+
+
+def decode_audio(input_path):
+    """
+    Decode any audio format to a 16 kHz mono float32 NumPy array in memory.
+
+    ffmpeg streams raw PCM to stdout, so there is no temporary WAV file.
+    Uploads that are already 16 kHz mono WAV skip ffmpeg entirely. They are
+    recognised by their RIFF/WAVE header, not the name: multer stores
+    uploads without an extension.
+
+    Returns (audio, error)
+    """
     try:
-        # Create temp WAV file
-        temp_wav = tempfile.NamedTemporaryFile(suffix='.wav', delete=False)
-        temp_wav.close()
-        
-        # Use ffmpeg to convert to WAV (16kHz mono for Whisper)
+        import numpy as np
+
+        audio = read_wav_16k_mono(input_path)
+        if audio is not None:
+            metrics.inc("stt_decodes_total", path="wav")
+            return audio, None
+
         cmd = [
             'ffmpeg',
+            '-nostdin',
             '-i', input_path,
-            '-ar', '16000',  # 16kHz sample rate
-            '-ac', '1',      # Mono
-            '-y',            # Overwrite
-            temp_wav.name
+            '-f', 's16le',            # raw 16-bit PCM
+            '-acodec', 'pcm_s16le',
+            '-ar', str(SAMPLE_RATE),  # 16kHz sample rate
+            '-ac', '1',               # Mono
+            '-loglevel', 'error',
+            'pipe:1'
         ]
-        
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        
+
+        with metrics.span("stt.ffmpeg"):
+            result = subprocess.run(cmd, capture_output=True)
+        metrics.inc("stt_decodes_total", path="ffmpeg" if result.returncode == 0 else "ffmpeg_failed")
+
         if result.returncode != 0:
-            return None, f"FFmpeg conversion failed: {result.stderr}"
-        
-        return temp_wav.name, None
-        
+            return None, f"FFmpeg conversion failed: {result.stderr.decode(errors='replace')}"
+
+        return np.frombuffer(result.stdout, dtype=np.int16).astype(np.float32) / 32768.0, None
+
     except FileNotFoundError:
         return None, "FFmpeg not found. Please install ffmpeg and add it to PATH."
+    except ImportError:
+        return None, "NumPy not installed. Install with: pip install numpy"
     except Exception as e:
         return None, f"Conversion error: {str(e)}"
 
 def run_transcription(audio_path):
-    converted_path = None
     try:
         if not os.path.exists(audio_path):
             return {"error": "Audio file not found"}
 
-        # Convert to WAV if needed
-        if not audio_path.lower().endswith('.wav'):
-            converted_path, error = convert_to_wav(audio_path)
-            if error:
-                return {"error": error}
-            processing_path = converted_path
-        else:
-            processing_path = audio_path
+        # Same clip, same model, decoding options and pipeline version: skip decode and Whisper entirely
+        key = get_cache().make_key("stt", file_digest(audio_path), model=stt._model_key(),
+                                   options=stt.TRANSCRIBE_OPTIONS, version=stt.STT_VERSION)
+        cached = get_cache().get(key, input_bytes=os.path.getsize(audio_path))
+        if cached is not None:
+            cached["cached"] = True
+            return cached
+
+        # Decode straight into memory (no intermediate file)
+        start = time.perf_counter()
+        with metrics.span("stt.decode"):
+            audio, error = decode_audio(audio_path)
+        if error:
+            return {"error": error}
+        decode_seconds = time.perf_counter() - start
 
         # Call the existing STT function
-        result = stt.speech_to_text(processing_path)
-        
-        # Clean up converted file
-        if converted_path and os.path.exists(converted_path):
-            try:
-                os.unlink(converted_path)
-            except:
-                pass
-        
+        start = time.perf_counter()
+        with metrics.span("stt.transcribe"):
+            result = stt.speech_to_text(audio)
+        inference_seconds = time.perf_counter() - start
+        metrics.observe("stt_audio_seconds", len(audio) / SAMPLE_RATE, buckets=AUDIO_SECONDS_BUCKETS)
+
         # Ensure we return serializable dict
         if isinstance(result, dict):
-            return result
+            output = result
         elif isinstance(result, str):
-            return {"text": result.strip(), "language": "en"}
+            output = {"text": result.strip(), "language": "en"}
         else:
-            return {"text": "", "language": "unknown", "raw_result": str(result)}
-            
+            output = {"text": "", "language": "unknown", "raw_result": str(result)}
+
+        output["timings"] = {
+            "decode_seconds": round(decode_seconds, 3),
+            "inference_seconds": round(inference_seconds, 3),
+            "audio_seconds": round(len(audio) / SAMPLE_RATE, 2)
+        }
+        if not output.get("error"):
+            get_cache().set(key, output)
+        return output
+
     except Exception as e:
-        # Clean up on error
-        if converted_path and os.path.exists(converted_path):
-            try:
-                os.unlink(converted_path)
-            except:
-                pass
         return {"error": str(e), "traceback": traceback.format_exc()}
 
 if __name__ == "__main__":
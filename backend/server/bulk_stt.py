@@ -0,0 +1,207 @@
+"""
+Bulk speech-to-text for a whole set of audio submissions.
+
+Unlike bridge_stt.py (one file per process), the Whisper model is loaded once
+in this process while ffmpeg decoding is spread over a process pool sized to
+the CPU cores. Transcription itself is serial: files go through the model one
+at a time in this process, so --workers only speeds up decoding. To use more
+cores for Whisper, set STT_SEGMENT_WORKERS (utils/stt.py): each file's speech
+segments are then transcribed in that many worker processes, each loading its
+own model. Each file is written as one JSON line as soon as it finishes, so
+partial results survive an interrupted run. Failed files are retried and then
+reported with "ok": false; they never abort the batch.
+
+Input is a directory (audio files, optionally --recursive) or a manifest:
+    - .jsonl: one object per line with a "path" key; other keys (student id,
+      question, ...) are copied to the output line
+    - anything else: one path per line, '#' comments allowed
+Relative manifest paths are resolved against the manifest's directory.
+
+Usage:
+    python bulk_stt.py <directory|manifest> [-o results.jsonl] [--workers N]
+                       [--retries 2] [--recursive]
+"""
+
+import sys
+import os
+import json
+import time
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+from bridge_stt import decode_audio, SAMPLE_RATE, stt
+
+AUDIO_EXTENSIONS = ('.wav', '.mp3', '.m4a', '.webm', '.ogg', '.oga', '.flac', '.aac', '.mp4')
+
+
+# -------------------------------
+# Inputs
+# -------------------------------
+
+def read_manifest(path):
+    """Yield {"path": ..., ...} entries from a .jsonl or plain-text manifest"""
+    base = os.path.dirname(os.path.abspath(path))
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            entry = json.loads(line) if path.endswith('.jsonl') else {"path": line}
+            entry["path"] = os.path.join(base, os.path.expanduser(entry["path"]))
+            yield entry
+
+
+def scan_directory(path, recursive=False):
+    """Yield {"path": ...} for every audio file in a directory, sorted by name"""
+    if recursive:
+        paths = (os.path.join(root, name) for root, _, names in os.walk(path) for name in names)
+    else:
+        paths = (os.path.join(path, name) for name in os.listdir(path))
+    for file_path in sorted(paths):
+        if file_path.lower().endswith(AUDIO_EXTENSIONS) and os.path.isfile(file_path):
+            yield {"path": file_path}
+
+
+def collect_inputs(target, recursive=False):
+    if os.path.isdir(target):
+        return list(scan_directory(target, recursive))
+    return list(read_manifest(target))
+
+
+# -------------------------------
+# Batch
+# -------------------------------
+
+def _decode(path):
+    # Runs in a decode worker process
+    start = time.perf_counter()
+    audio, error = decode_audio(path)
+    return audio, error, time.perf_counter() - start
+
+
+def transcribe(audio):
+    """Transcribe decoded audio in this process; returns (result, error)"""
+    try:
+        start = time.perf_counter()
+        result = stt.speech_to_text(audio)
+        inference_seconds = time.perf_counter() - start
+    except Exception as e:
+        return None, f"Transcription failed: {str(e)}"
+
+    if result.get("error"):
+        return None, result["error"]
+    result["timings"] = {
+        "inference_seconds": round(inference_seconds, 3),
+        "audio_seconds": round(len(audio) / SAMPLE_RATE, 2)
+    }
+    return result, None
+
+
+def run_batch(entries, out, workers=None, retries=2):
+    """
+    Decode in a process pool, transcribe here (one file at a time) as decodes
+    complete, and write one JSON line per entry to `out`. At most workers * 2
+    files are decoding or waiting for transcription at a time. Returns (succeeded, failed) counts.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = workers * 2
+    attempts = [0] * len(entries)
+    succeeded = failed = 0
+
+    def write(index, record):
+        record = dict(entries[index], index=index, attempts=attempts[index], **record)
+        out.write(json.dumps(record) + "\n")
+        out.flush()
+
+    # spawn, not fork: this process already holds the model and its torch threads
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        def submit(index):
+            attempts[index] += 1
+            return pool.submit(_decode, entries[index]["path"])
+
+        # Decoded audio waits in finished futures until it is transcribed here,
+        # one file at a time; cap how many files are decoding or decoded
+        queued = iter(range(len(entries)))
+        pending = {}
+
+        def top_up():
+            while len(pending) < max_in_flight:
+                index = next(queued, None)
+                if index is None:
+                    return
+                pending[submit(index)] = index
+
+        top_up()
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = pending.pop(future)
+
+                try:
+                    audio, error, decode_seconds = future.result()
+                except Exception as e:
+                    audio, error = None, f"Decode worker failed: {str(e)}"
+
+                if error is None:
+                    result, error = transcribe(audio)
+
+                if error is None:
+                    result["timings"]["decode_seconds"] = round(decode_seconds, 3)
+                    succeeded += 1
+                    write(index, dict(ok=True, **result))
+                elif attempts[index] <= retries:
+                    pending[submit(index)] = index
+                else:
+                    failed += 1
+                    write(index, {"ok": False, "error": error})
+
+                top_up()
+
+    return succeeded, failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", help="directory of audio files or a manifest file")
+    parser.add_argument("-o", "--output", help="JSON Lines output file (default: stdout)")
+    parser.add_argument("--workers", type=int, help="decode processes (default: CPU count); transcription stays serial")
+    parser.add_argument("--retries", type=int, default=2, help="extra attempts per failed file")
+    parser.add_argument("--recursive", action="store_true", help="scan sub-directories too")
+    args = parser.parse_args()
+
+    try:
+        entries = collect_inputs(args.input, args.recursive)
+    except (OSError, ValueError, KeyError) as e:
+        print(json.dumps({"error": f"Could not read input: {str(e)}"}))
+        return 1
+
+    # Load once up front; a missing model fails the batch before any work starts
+    try:
+        start = time.perf_counter()
+        stt.get_model()
+        load_seconds = time.perf_counter() - start
+    except Exception as e:
+        print(json.dumps({"error": f"Could not load Whisper model: {str(e)}"}))
+        return 1
+
+    out = open(args.output, 'a', encoding='utf-8') if args.output else sys.stdout
+    start = time.perf_counter()
+    try:
+        succeeded, failed = run_batch(entries, out, args.workers, args.retries)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    print(json.dumps({
+        "files": len(entries),
+        "succeeded": succeeded,
+        "failed": failed,
+        "model_load_seconds": round(load_seconds, 2),
+        "elapsed_seconds": round(time.perf_counter() - start, 2)
+    }), file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+// Smoke check for POST /api/dyslexia/summarize/stream against a running server:
+// the client must receive at least one "delta" or "partial" event and then "done".
+//
+// Usage:
+//     node check_summarize_stream.js [--url http://localhost:5000] [--token <access token>]
+// (the token can also come from ACCESS_TOKEN). Exits with status 1 on failure.
+
+const http = require('http');
+const https = require('https');
+
+const TEXT = [
+    'Plants use sunlight, water and carbon dioxide to make glucose and oxygen in their leaves.',
+    'The water cycle moves water between oceans, clouds, rain, rivers and the ground.',
+    'Volcanoes form where molten rock rises through cracks in the crust of the earth.',
+    'Ancient traders crossed deserts with caravans carrying silk, spices and salt.',
+].join(' ').repeat(4);
+
+function option(name, fallback) {
+    const index = process.argv.indexOf(`--${name}`);
+    return index !== -1 && index + 1 < process.argv.length ? process.argv[index + 1] : fallback;
+}
+
+function parseEvents(body) {
+    return body.split('\n\n').filter(Boolean).map((block) => {
+        const name = (block.match(/^event: (.*)$/m) || [])[1];
+        const data = (block.match(/^data: (.*)$/m) || [])[1];
+        return { name, data: data ? JSON.parse(data) : null };
+    });
+}
+
+function main() {
+    const url = new URL('/api/dyslexia/summarize/stream', option('url', 'http://localhost:5000'));
+    const token = option('token', process.env.ACCESS_TOKEN);
+    const payload = JSON.stringify({ text: TEXT });
+    const started = Date.now();
+
+    const request = (url.protocol === 'https:' ? https : http).request(url, {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+            'Content-Length': Buffer.byteLength(payload),
+            ...(token ? { Authorization: `Bearer ${token}` } : {})
+        }
+    }, (res) => {
+        let body = '';
+        let firstFrameMs = null;
+        res.setEncoding('utf8');
+        res.on('data', (chunk) => {
+            if (firstFrameMs === null) firstFrameMs = Date.now() - started;
+            body += chunk;
+        });
+        res.on('end', () => {
+            if (res.statusCode !== 200) {
+                console.error(`FAIL: HTTP ${res.statusCode} ${body}`);
+                process.exit(1);
+            }
+            const events = parseEvents(body);
+            const counts = events.reduce((acc, e) => ({ ...acc, [e.name]: (acc[e.name] || 0) + 1 }), {});
+            const done = events.find(e => e.name === 'done');
+            console.log(`events: ${JSON.stringify(counts)}, first frame after ${firstFrameMs} ms, ` +
+                        `total ${Date.now() - started} ms`);
+            if (!events.length) {
+                console.error('FAIL: the stream delivered no events');
+                process.exit(1);
+            }
+            if (!done || !done.data.summary) {
+                console.error(`FAIL: no "done" event with a summary (${events.map(e => e.name).join(', ')})`);
+                process.exit(1);
+            }
+            if (!counts.delta && !counts.partial && done.data.engine === 'BART') {
+                console.error('FAIL: BART summary arrived without any delta/partial event');
+                process.exit(1);
+            }
+            console.log(`OK (${done.data.engine}, reason ${done.data.route && done.data.route.reason})`);
+        });
+    });
+
+    request.on('error', (err) => {
+        console.error(`FAIL: ${err.message}`);
+        process.exit(1);
+    });
+    request.end(payload);
+}
+
+main();
@@ -17,6 +17,7 @@ const { requestLogger }       = require('./src/middleware/requestLogger');
 const { globalLimiter }       = require('./src/middleware/rateLimiter');
 const { errorHandler }        = require('./src/middleware/errorHandler');
 const logger                  = require('./src/utils/logger');
+const { stopWorkerPool }      = require('./utils/pythonWorkerPool');
 
 const app  = express();
 app.set('trust proxy', 1); // Trust Render reverse proxy for accurate client IP rate-limiting
@@ -217,6 +218,7 @@ async function startServer() {
 function shutdown(signal) {
   logger.info(`Received ${signal} — shutting down gracefully`, { category: 'system' });
   if (pythonProcess) pythonProcess.kill();
+  stopWorkerPool();
   process.exit(0);
 }
 
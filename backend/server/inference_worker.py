@@ -0,0 +1,274 @@
+"""
+Long-lived Python inference worker.
+
+Spawning a fresh interpreter per HTTP request re-imports torch/transformers and
+reloads BART, Whisper or MiniLM every time. This worker loads each model once
+and then serves requests over a newline-delimited JSON protocol on stdin/stdout,
+so the Node side can keep a warm pool of processes.
+
+Protocol (one JSON object per line):
+    request  -> {"id": "42", "op": "summarize", "params": {"text": "..."}}
+    response <- {"id": "42", "ok": true, "result": {...}}
+    error    <- {"id": "42", "ok": false, "error": "..."}
+
+Streaming ops (summarize with "stream": true in params) send any number of
+event frames for the request before its final response:
+    event    <- {"id": "42", "stream": {"type": "delta", "text": "..."}}
+
+With "trace": true in params, the response also carries the stages the
+request went through and how long each took:
+    response <- {"id": "42", "ok": true, "result": {...},
+                 "trace": [{"stage": "summarize.route", "seconds": 0.0001}, ...]}
+
+The "metrics" op returns the worker's stage timings, counters and histograms,
+as Prometheus text ({"format": "prometheus"}, the default) or JSON
+({"format": "json"}). METRICS=0 turns recording off.
+
+On startup the worker prints {"event": "ready", "pid": ...} once it is able to
+accept requests. Closing stdin shuts it down.
+
+Usage:
+    python inference_worker.py [--preload summarize,simplify,study_aid,ocr,stt]
+"""
+
+import sys
+import os
+import json
+import time
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+_STARTED = time.perf_counter()
+
+SERVER_DIR = os.path.dirname(os.path.abspath(__file__))
+DYSLEXIA_DIR = os.path.abspath(os.path.join(SERVER_DIR, '../../cognitive_disability/dyslexia'))
+
+for _path in (SERVER_DIR, DYSLEXIA_DIR):
+    if _path not in sys.path:
+        sys.path.append(_path)
+
+from utils.telemetry import metrics  # noqa: E402
+
+# The real stdout carries protocol frames only. Anything the ML libraries print
+# (progress bars, emoji status lines) is redirected to stderr instead.
+_protocol_out = sys.stdout
+sys.stdout = sys.stderr
+_write_lock = threading.Lock()
+
+
+def send(message):
+    """Write a single protocol frame to stdout"""
+    line = json.dumps(message)
+    with _write_lock:
+        _protocol_out.write(line + "\n")
+        _protocol_out.flush()
+
+
+# -------------------------------
+# Handlers (loaded once, lazily)
+# -------------------------------
+
+def _load_summarize():
+    # Cached results first; concurrent misses are coalesced into one BART forward pass.
+    # The engine router may pick fewer beams or the extractive engine under load.
+    from utils.summarizer import summarize_text
+    from bart_summarization import get_model, get_tokenizer
+    get_tokenizer()
+    get_model()
+
+    def handle(params, emit=None):
+        kwargs = {k: params[k] for k in ("max_length", "min_length", "deadline_ms") if k in params}
+        return summarize_text(params["text"], on_event=emit, **kwargs)
+
+    return handle
+
+
+def _load_simplify():
+    from utils.simplify import simplify_logic
+    from text_simplification_advanced import get_simplifier
+    get_simplifier()
+
+    def handle(params):
+        return {"simplified": simplify_logic(params["text"])}
+
+    return handle
+
+
+def _load_study_aid():
+    # Keywords and summary run concurrently inside the pipeline
+    from main_pipeline import study_aid
+
+    def handle(params):
+        kwargs = {k: params[k] for k in ("top_n",) if k in params}
+        return study_aid(params["text"], **kwargs)
+
+    return handle
+
+
+def _load_ocr():
+    from utils.ocr import extract_text, extract_batch
+
+    def handle(params):
+        if "paths" in params:
+            return extract_batch(params["paths"])
+        return extract_text(params["path"])
+
+    return handle
+
+
+def _load_stt():
+    from bridge_stt import run_transcription
+    from utils import stt
+    stt.preload_models()
+    # Whisper installs decoder hooks per transcribe() call, so one model
+    # must not be used from several threads at once
+    lock = threading.Lock()
+
+    def handle(params):
+        with lock:
+            return run_transcription(params["path"])
+
+    return handle
+
+
+LOADERS = {
+    "summarize": _load_summarize,
+    "simplify": _load_simplify,
+    "study_aid": _load_study_aid,
+    "ocr": _load_ocr,
+    "stt": _load_stt,
+}
+
+# Ops whose handler takes an emit(event) callback for streaming frames
+STREAMING_OPS = {"summarize"}
+
+_handlers = {}
+_handler_locks = {op: threading.Lock() for op in LOADERS}
+
+
+def get_handler(op):
+    """Return the handler for an op, loading its model on first use"""
+    handler = _handlers.get(op)
+    if handler is not None:
+        return handler
+
+    with _handler_locks[op]:
+        if op not in _handlers:
+            print(f"[worker] loading '{op}'...", file=sys.stderr)
+            try:
+                with metrics.span("worker.load", op=op):
+                    _handlers[op] = LOADERS[op]()
+            except SystemExit as e:
+                # bridge_stt exits the interpreter when its imports fail
+                raise ImportError(f"Failed to load '{op}' (exit code {e.code})")
+            print(f"[worker] '{op}' ready", file=sys.stderr)
+        return _handlers[op]
+
+
+# -------------------------------
+# Request loop
+# -------------------------------
+
+def handle_request(request):
+    request_id = request.get("id")
+    op = request.get("op")
+
+    if op == "ping":
+        send({"id": request_id, "ok": True, "result": {"pong": True, "loaded": sorted(_handlers)}})
+        return
+
+    if op == "stats":
+        send({"id": request_id, "ok": True, "result": collect_stats()})
+        return
+
+    if op == "metrics":
+        send({"id": request_id, "ok": True, "result": collect_metrics(request.get("params") or {})})
+        return
+
+    if op not in LOADERS:
+        send({"id": request_id, "ok": False, "error": f"Unknown op: {op}"})
+        return
+
+    params = request.get("params") or {}
+    try:
+        with metrics.trace() as spans, metrics.span("worker.request", op=op):
+            handler = get_handler(op)
+            if params.get("stream") and op in STREAMING_OPS:
+                result = handler(params, lambda event: send({"id": request_id, "stream": event}))
+            else:
+                result = handler(params)
+        response = {"id": request_id, "ok": True, "result": result}
+        if params.get("trace"):
+            response["trace"] = spans
+        send(response)
+    except Exception as e:
+        send({
+            "id": request_id,
+            "ok": False,
+            "error": str(e),
+            "traceback": traceback.format_exc()
+        })
+
+
+def collect_stats():
+    from utils.result_cache import get_cache
+    stats = {"result_cache": get_cache().stats()}
+    if "summarize" in _handlers:
+        from utils.engine_router import get_router
+        stats["summarize_router"] = get_router().stats()
+    if "stt" in _handlers:
+        from utils import stt
+        stats["stt"] = stt.get_stats()
+    stats["metrics"] = metrics.snapshot()
+    return stats
+
+
+def collect_metrics(params):
+    if params.get("format", "prometheus") == "json":
+        return {"format": "json", "metrics": metrics.snapshot()}
+    return {"format": "prometheus", "text": metrics.render_prometheus({"pid": os.getpid()})}
+
+
+def preload(ops):
+    for op in ops:
+        try:
+            get_handler(op)
+        except Exception as e:
+            print(f"[worker] preload of '{op}' failed: {e}", file=sys.stderr)
+
+
+def parse_preload(argv):
+    value = os.environ.get('INFERENCE_WORKER_PRELOAD', '')
+    if '--preload' in argv:
+        index = argv.index('--preload')
+        if index + 1 < len(argv):
+            value = argv[index + 1]
+    return [op.strip() for op in value.split(',') if op.strip() in LOADERS]
+
+
+def main(argv):
+    preload(parse_preload(argv))
+
+    threads = int(os.environ.get('INFERENCE_WORKER_THREADS', '8'))
+    executor = ThreadPoolExecutor(max_workers=max(1, threads))
+
+    metrics.set_gauge("worker_startup_seconds", time.perf_counter() - _STARTED)
+    send({"event": "ready", "pid": os.getpid()})
+
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as e:
+            send({"id": None, "ok": False, "error": f"Invalid JSON: {e}"})
+            continue
+        executor.submit(handle_request, request)
+
+    executor.shutdown(wait=True)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -1,18 +1,21 @@
 const express = require('express');
 const router = express.Router();
-const { spawn } = require('child_process');
-const path = require('path');
-const fs = require('fs');
+const { getWorkerPool } = require('../utils/pythonWorkerPool');
 
 // MOCK MODE - Set to true to test without Python
 const MOCK_MODE = false;
 
 
-const pythonCommand = process.env.PYTHON_EXECUTABLE || 'python';
-
 console.log('Dyslexia Routes - Mock Mode:', MOCK_MODE);
-if (!MOCK_MODE) {
-    console.log('Using Python command:', pythonCommand);
+
+// deadlineMs is optional; anything other than a positive number of milliseconds is rejected
+function parseDeadline(value) {
+    if (value === undefined || value === null || value === '') return { deadlineMs: null };
+    const deadlineMs = Number(value);
+    if (!Number.isFinite(deadlineMs) || deadlineMs <= 0) {
+        return { error: 'deadlineMs must be a positive number of milliseconds' };
+    }
+    return { deadlineMs };
 }
 
 // POST /api/dyslexia/summarize
@@ -20,6 +23,8 @@ router.post('/summarize', async (req, res) => {
     try {
         const { text } = req.body;
         if (!text) return res.status(400).json({ error: 'No text provided' });
+        const { deadlineMs, error } = parseDeadline(req.body.deadlineMs);
+        if (error) return res.status(400).json({ error });
 
         // MOCK MODE - Return simulated summary
         if (MOCK_MODE) {
@@ -27,61 +32,61 @@ router.post('/summarize', async (req, res) => {
             return res.json({ summary });
         }
 
-        // REAL MODE - Use Python script
-        const pythonScript = path.join(__dirname, '../../../cognitive_disability/dyslexia/bart_summarization.py');
-        console.log('Spawning Python for Summarization:', pythonCommand, pythonScript);
-        const python = spawn(pythonCommand, [pythonScript]);
-
-        let output = '';
-        let errorOutput = '';
+        // REAL MODE - Use the warm Python worker pool
+        // deadlineMs lets the worker trade BART quality for latency (see utils/engine_router.py)
+        const params = { text };
+        if (deadlineMs) params.deadline_ms = deadlineMs;
 
-        python.stdout.on('data', (data) => {
-            console.log(`Python stdout: ${data}`);
-            output += data.toString();
-        });
-
-        python.stderr.on('data', (data) => {
-            console.error(`Python stderr: ${data}`);
-            errorOutput += data.toString();
-        });
+        const result = await getWorkerPool().request('summarize', params);
+        if (!result.summary) throw new Error('Empty output from Python worker');
+        res.json({ summary: result.summary, engine: result.engine, route: result.route });
 
-        python.on('error', (err) => {
-            console.error('Failed to start Python process:', err);
-            if (!res.headersSent) {
-                res.status(500).json({ error: 'Failed to start Python process', details: err.message });
-            }
-        });
+    } catch (err) {
+        console.error('Summarize error:', err);
+        if (!res.headersSent) {
+            res.status(500).json({ error: 'Summarization failed', details: err.message });
+        }
+    }
+});
 
-        python.on('close', (code) => {
-            console.log(`Python process exited with code ${code}`);
-            if (res.headersSent) return;
-            if (code !== 0) {
-                console.error('Summarization error output:', errorOutput);
-                return res.status(500).json({
-                    error: 'Summarization failed',
-                    details: errorOutput || 'Unknown error',
-                    code: code
-                });
-            }
-            try {
-                const result = output.trim();
-                if (!result) throw new Error("Empty output from Python script");
-                res.json({ summary: result });
-            } catch (e) {
-                console.error("Error parsing Python output:", e);
-                if (!res.headersSent) {
-                    res.status(500).json({ error: "Invalid output from AI model", details: output });
-                }
-            }
-        });
+// POST /api/dyslexia/summarize/stream
+// Server-Sent Events: "delta" events carry summary text as BART decodes it
+// ("partial" events carry chunk summaries of long documents), then one
+// "done" event with the same body as /summarize, or an "error" event.
+// A "reset" event means BART failed mid-stream: discard the text shown so
+// far; "done" then carries the fallback summary.
+// Smoke check against a running server: node check_summarize_stream.js
+router.post('/summarize/stream', async (req, res) => {
+    const { text } = req.body;
+    if (!text) return res.status(400).json({ error: 'No text provided' });
+    const { deadlineMs, error } = parseDeadline(req.body.deadlineMs);
+    if (error) return res.status(400).json({ error });
+
+    res.writeHead(200, {
+        'Content-Type': 'text/event-stream',
+        'Cache-Control': 'no-cache',
+        'Connection': 'keep-alive',
+        'X-Accel-Buffering': 'no'
+    });
+
+    // res, not req: on Node 20 req emits 'close' once the body has been read,
+    // while res closes when the response ends or the client disconnects
+    const sendEvent = (name, data) => {
+        if (!res.writableEnded && !res.destroyed) res.write(`event: ${name}\ndata: ${JSON.stringify(data)}\n\n`);
+    };
 
-        python.stdin.write(text);
-        python.stdin.end();
+    try {
+        const params = { text };
+        if (deadlineMs) params.deadline_ms = deadlineMs;
 
+        const result = await getWorkerPool().stream('summarize', params, (event) => sendEvent(event.type, event));
+        if (!result.summary) throw new Error('Empty output from Python worker');
+        sendEvent('done', { summary: result.summary, engine: result.engine, route: result.route });
     } catch (err) {
-        console.error('Summarize error:', err);
-        res.status(500).json({ error: 'Summarization failed' });
+        console.error('Summarize stream error:', err);
+        sendEvent('error', { error: 'Summarization failed', details: err.message });
     }
+    res.end();
 });
 
 // POST /api/dyslexia/simplify
@@ -102,52 +107,42 @@ router.post('/simplify', async (req, res) => {
             return res.json({ simplified });
         }
 
-        // REAL MODE - Use Python script
-        const pythonScript = path.join(__dirname, '../../../cognitive_disability/dyslexia/simplify_wrapper.py');
-        console.log(`[Simplify] Spawning Python: ${pythonCommand} ${pythonScript}`);
+        // REAL MODE - Use the warm Python worker pool
+        const result = await getWorkerPool().request('simplify', { text });
+        res.json({ simplified: (result.simplified || '').trim() });
 
-        const python = spawn(pythonCommand, [pythonScript]);
-
-        let output = '';
-        let errorOutput = '';
-
-        python.stdout.on('data', (data) => {
-            console.log(`[Simplify] stdout: ${data}`);
-            output += data.toString();
-        });
+    } catch (err) {
+        console.error('Simplify error:', err);
+        if (!res.headersSent) {
+            res.status(500).json({ error: 'Simplification failed', details: err.message });
+        }
+    }
+});
 
-        python.stderr.on('data', (data) => {
-            console.error(`[Simplify] stderr: ${data}`);
-            errorOutput += data.toString();
-        });
+// POST /api/dyslexia/study-aid
+// Keywords, summary and simplified summary in one call; keywords and summary
+// run concurrently in the worker, so this takes about as long as the summary.
+router.post('/study-aid', async (req, res) => {
+    try {
+        const { text, topN } = req.body;
+        if (!text) return res.status(400).json({ error: 'No text provided' });
 
-        python.on('error', (err) => {
-            console.error('[Simplify] Spawn Error:', err);
-            if (!res.headersSent) {
-                res.status(500).json({ error: 'Failed to start Python process', details: err.message });
-            }
-        });
+        const params = { text };
+        if (topN) params.top_n = topN;
 
-        python.on('close', (code) => {
-            console.log(`[Simplify] process exited with code ${code}`);
-            if (res.headersSent) return;
-            if (code !== 0) {
-                console.error('[Simplify] Error output:', errorOutput);
-                return res.status(500).json({
-                    error: 'Simplification failed',
-                    details: errorOutput || 'Unknown error',
-                    code: code
-                });
-            }
-            res.json({ simplified: output.trim() });
+        const result = await getWorkerPool().request('study_aid', params);
+        res.json({
+            keywords: result.keywords,
+            summary: result.summary,
+            simplified: (result.simplified || '').trim(),
+            timings: result.timings
         });
 
-        python.stdin.write(text);
-        python.stdin.end();
-
     } catch (err) {
-        console.error('Simplify error:', err);
-        res.status(500).json({ error: 'Simplification failed' });
+        console.error('Study aid error:', err);
+        if (!res.headersSent) {
+            res.status(500).json({ error: 'Study aid failed', details: err.message });
+        }
     }
 });
 
@@ -2,7 +2,7 @@ const express = require('express');
 const router = express.Router();
 const multer = require('multer');
 const path = require('path');
-const { spawn } = require('child_process');
+const { getWorkerPool } = require('../utils/pythonWorkerPool');
 const fs = require('fs');
 
 // Configure upload
@@ -18,63 +18,74 @@ router.post('/scan', upload.single('image'), async (req, res) => {
     }
 
     const imagePath = path.resolve(req.file.path);
-    const scriptPath = path.join(__dirname, '../utils/ocr.py');
-
-    const pythonExecutable = process.env.PYTHON_EXECUTABLE || 'python';
 
     console.log(`[OCR] Processing image: ${imagePath}`);
-    const pythonProcess = spawn(pythonExecutable, [scriptPath, imagePath]);
-
-    let dataString = '';
-    let errorString = '';
-
-    pythonProcess.stdout.on('data', (data) => {
-        dataString += data.toString();
-    });
 
-    pythonProcess.stderr.on('data', (data) => {
-        errorString += data.toString();
-        console.log(`[OCR Python Log]: ${data}`);
-    });
-
-    pythonProcess.on('error', (error) => {
-        console.error('[OCR] Failed to start Python process:', error);
-        fs.unlink(imagePath, () => { });
-        return res.status(500).json({
+    try {
+        const result = await getWorkerPool().request('ocr', { path: imagePath });
+        if (result.error) {
+            return res.status(500).json({ success: false, message: result.error });
+        }
+        res.json({
+            success: true,
+            text: result.text,
+            pages: result.pages
+        });
+    } catch (err) {
+        console.error('[OCR] Worker request failed:', err);
+        res.status(500).json({
             success: false,
-            message: "Failed to start OCR process",
-            error: error.message
+            message: "OCR process failed",
+            error: err.message
         });
-    });
-
-    pythonProcess.on('close', (code) => {
+    } finally {
         // cleanup temp file
         fs.unlink(imagePath, (err) => {
             if (err) console.error("[OCR] Failed to delete temp file:", err);
         });
+    }
+});
 
-        if (code !== 0) {
-            return res.status(500).json({
-                success: false,
-                message: "OCR process failed",
-                error: errorString
-            });
-        }
+// POST /api/ocr/scan-batch
+// Multi-page PDFs/TIFFs and whole stacks of worksheets in one request
+router.post('/scan-batch', upload.array('images', 50), async (req, res) => {
+    if (!req.files || req.files.length === 0) {
+        return res.status(400).json({ success: false, message: "No image files uploaded" });
+    }
+
+    const imagePaths = req.files.map(file => path.resolve(file.path));
 
-        try {
-            const result = JSON.parse(dataString.trim());
-            if (result.error) {
-                return res.status(500).json({ success: false, message: result.error });
-            }
-            res.json({
-                success: true,
-                text: result.text
+    console.log(`[OCR] Processing batch of ${imagePaths.length} files`);
+
+    try {
+        const result = await getWorkerPool().request('ocr', { paths: imagePaths });
+        if (result.error) {
+            return res.status(500).json({ success: false, message: result.error });
+        }
+        res.json({
+            success: true,
+            results: result.results.map((entry, i) => ({
+                filename: req.files[i].originalname,
+                success: entry.success,
+                text: entry.text,
+                pages: entry.pages,
+                message: entry.error
+            }))
+        });
+    } catch (err) {
+        console.error('[OCR] Worker request failed:', err);
+        res.status(500).json({
+            success: false,
+            message: "OCR process failed",
+            error: err.message
+        });
+    } finally {
+        for (const imagePath of imagePaths) {
+            fs.unlink(imagePath, (err) => {
+                if (err) console.error("[OCR] Failed to delete temp file:", err);
             });
-        } catch (err) {
-            console.error("[OCR] JSON Parse Error:", err, "\nRaw Output:", dataString);
-            res.status(500).json({ success: false, message: "Failed to parse OCR output" });
         }
-    });
+    }
 });
 
 module.exports = router;
@@ -0,0 +1,198 @@
+"""
+Latency-budgeted engine routing for summaries.
+
+Each summarize request is routed to BART or to the built-in extractive
+engine (utils/extractive.py) using the input length, the caller's deadline,
+the number of summaries already in flight in this process and an EWMA of
+the latency each engine profile has actually shown. Under load or a tight
+deadline BART is degraded step by step (fewer beams, then greedy decoding
+with a shorter max_length) before falling back to the extractive engine.
+
+Latency is tracked per profile ("BART/b4", "BART/b2", "BART/b1",
+"extractive") in seconds per input chunk of about one BART window, so
+estimates scale with input length.
+
+Environment:
+    SUMMARY_DEADLINE_MS      budget for callers that send none (default: 0 = no budget)
+    SUMMARY_MIN_WORDS_BART   shorter inputs use the extractive engine (default: 80)
+    SUMMARY_DEGRADE_DEPTH    summaries in flight at which BART drops beams (default: 4)
+    SUMMARY_SHED_DEPTH       summaries in flight at which BART is skipped (default: 16)
+    SUMMARY_EWMA_ALPHA       weight of the newest latency sample (default: 0.2)
+"""
+
+import os
+import math
+import threading
+from collections import Counter
+from contextlib import contextmanager
+
+CHARS_PER_CHUNK = 4000  # about one 1024-token BART window
+
+# Starting estimates (seconds per chunk on CPU) until real samples arrive
+PRIOR_SECONDS = {
+    "BART/b4": 3.0,
+    "BART/b2": 2.0,
+    "BART/b1": 1.2,
+    "extractive": 0.02,
+}
+
+GREEDY_MAX_LENGTH = 80
+
+
+def _env_number(name, default, cast=int):
+    try:
+        return cast(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def bart_profile(num_beams):
+    return f"BART/b{num_beams}"
+
+
+class EngineRouter:
+    def __init__(self, default_deadline_ms=None, min_words_bart=None, degrade_depth=None,
+                 shed_depth=None, alpha=None, batch_size=None):
+        self.default_deadline_ms = (default_deadline_ms if default_deadline_ms is not None
+                                    else _env_number("SUMMARY_DEADLINE_MS", 0, float)) or None
+        self.min_words_bart = min_words_bart or _env_number("SUMMARY_MIN_WORDS_BART", 80)
+        self.degrade_depth = degrade_depth or _env_number("SUMMARY_DEGRADE_DEPTH", 4)
+        self.shed_depth = shed_depth or _env_number("SUMMARY_SHED_DEPTH", 16)
+        self.alpha = alpha or _env_number("SUMMARY_EWMA_ALPHA", 0.2, float)
+        # Requests ahead of us share BART forward passes in batches of this size
+        self.batch_size = batch_size or _env_number("BART_MAX_BATCH_SIZE", 8)
+
+        self.latency = dict(PRIOR_SECONDS)
+        self.samples = Counter()
+        self.reasons = Counter()
+        self.in_flight = 0
+        self._lock = threading.Lock()
+
+    # ---------- Estimates ----------
+
+    @staticmethod
+    def chunks(text):
+        return max(1, math.ceil(len(text) / CHARS_PER_CHUNK))
+
+    def estimate_ms(self, profile, text, depth=0):
+        """Expected wall time for text on a profile, including batches queued ahead"""
+        with self._lock:
+            per_chunk = self._per_chunk(profile)
+        batches_ahead = depth // self.batch_size if profile != "extractive" else 0
+        return (self.chunks(text) + batches_ahead) * per_chunk * 1000.0
+
+    def _per_chunk(self, profile):
+        if self.samples[profile] or profile == "extractive":
+            return self.latency.get(profile, PRIOR_SECONDS["BART/b4"])
+        # Not measured yet: scale a measured BART profile by the prior ratio,
+        # so one fast or slow machine calibrates every beam setting
+        for measured in ("BART/b4", "BART/b2", "BART/b1"):
+            if self.samples[measured]:
+                return self.latency[measured] * PRIOR_SECONDS[profile] / PRIOR_SECONDS[measured]
+        return self.latency.get(profile, PRIOR_SECONDS["BART/b4"])
+
+    def observe(self, profile, text, seconds):
+        """Fold one measured run into the profile's EWMA"""
+        per_chunk = seconds / self.chunks(text)
+        with self._lock:
+            previous = self.latency.get(profile, per_chunk)
+            # The first real sample replaces the prior outright
+            weight = self.alpha if self.samples[profile] else 1.0
+            self.latency[profile] = (1 - weight) * previous + weight * per_chunk
+            self.samples[profile] += 1
+
+    # ---------- Routing ----------
+
+    def ladder(self, max_length, max_beams=4):
+        """BART settings from full quality to cheapest, with at most max_beams"""
+        steps = [(num_beams, max_length) for num_beams in (4, 2) if num_beams <= max_beams]
+        # Greedy with a shorter summary is the last resort, unless it is the only option
+        steps.append((1, min(max_length, GREEDY_MAX_LENGTH) if steps else max_length))
+        return steps
+
+    def choose(self, text, deadline_ms=None, max_length=130, bart_available=True, max_beams=4):
+        """
+        Route one request (max_beams=1 for streaming, which needs greedy decoding).
+        Returns a dict:
+            {"engine": "BART" | "extractive", "reason": ..., "num_beams", "max_length",
+             "estimated_ms", "deadline_ms", "queue_depth"}
+        """
+        deadline_ms = deadline_ms or self.default_deadline_ms
+        with self._lock:
+            depth = self.in_flight
+
+        route = {"deadline_ms": deadline_ms, "queue_depth": depth}
+
+        def extractive(reason):
+            return dict(route, engine="extractive", reason=reason, num_beams=None, max_length=None,
+                        estimated_ms=round(self.estimate_ms("extractive", text), 1))
+
+        if not bart_available:
+            return self._count(extractive("bart_unavailable"))
+        if len(text.split()) < self.min_words_bart:
+            return self._count(extractive("short_input"))
+        if depth >= self.shed_depth:
+            return self._count(extractive("overloaded"))
+
+        # Under load, start below full quality
+        ladder = self.ladder(max_length, max_beams)
+        start = 1 if depth >= self.degrade_depth and len(ladder) > 1 else 0
+        for step, (num_beams, length) in enumerate(ladder):
+            if step < start:
+                continue
+            estimated = self.estimate_ms(bart_profile(num_beams), text, depth)
+            if deadline_ms is None or estimated <= deadline_ms:
+                if step == 0:
+                    reason = "within_deadline" if deadline_ms else "default"
+                elif step == start:
+                    reason = "degraded_for_load"
+                else:
+                    reason = "degraded_for_deadline"
+                return self._count(dict(route, engine="BART", reason=reason, num_beams=num_beams,
+                                        max_length=length, estimated_ms=round(estimated, 1)))
+
+        return self._count(extractive("deadline_too_tight"))
+
+    def cached_route(self, deadline_ms=None, num_beams=4, max_length=130):
+        """Route for a request answered by an already cached full-quality BART summary"""
+        with self._lock:
+            depth = self.in_flight
+        return self._count({"deadline_ms": deadline_ms or self.default_deadline_ms, "queue_depth": depth,
+                            "engine": "BART", "reason": "cached_full_quality", "num_beams": num_beams,
+                            "max_length": max_length, "estimated_ms": 0.0})
+
+    def _count(self, route):
+        with self._lock:
+            self.reasons[route["reason"]] += 1
+        return route
+
+    @contextmanager
+    def track(self):
+        """Count a summary as in flight for the duration of the block"""
+        with self._lock:
+            self.in_flight += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                "in_flight": self.in_flight,
+                "ms_per_chunk": {profile: round(seconds * 1000.0, 1) for profile, seconds in self.latency.items()},
+                "samples": dict(self.samples),
+                "reasons": dict(self.reasons),
+            }
+
+
+_router = None
+_router_lock = threading.Lock()
+
+def get_router():
+    global _router
+    with _router_lock:
+        if _router is None:
+            _router = EngineRouter()
+        return _router
@@ -0,0 +1,167 @@
+"""
+Built-in extractive summarizer (fallback when BART is unavailable).
+
+Sentences are scored on a sparse TF-IDF sentence-term matrix, either with
+LSA (truncated SVD, Steinberger & Jezek sentence lengths as in sumy's
+LsaSummarizer) or with TextRank (power iteration over sentence cosine
+similarities). Stop words and stems are cached for the whole process, so
+long materials (50k words) summarize in a fraction of a second.
+
+Environment:
+    EXTRACTIVE_METHOD   lsa or textrank (default: lsa)
+"""
+
+import os
+import re
+from functools import lru_cache
+
+METHODS = ("lsa", "textrank")
+ENGINES = {"lsa": "LSA", "textrank": "TextRank"}
+
+SENTENCE_PATTERN = re.compile(r'[^.!?\n]+(?:[.!?]+["\')\]]*|\n|$)')
+WORD_PATTERN = re.compile(r"[a-z]+(?:'[a-z]+)?")
+
+STOP_WORDS = frozenset("""
+a about above after again against all am an and any are aren't as at be because been before being
+below between both but by can can't cannot could couldn't did didn't do does doesn't doing don't down
+during each few for from further had hadn't has hasn't have haven't having he he'd he'll he's her here
+here's hers herself him himself his how how's i i'd i'll i'm i've if in into is isn't it it's its
+itself let's me more most mustn't my myself no nor not of off on once only or other ought our ours
+ourselves out over own same shan't she she'd she'll she's should shouldn't so some such than that
+that's the their theirs them themselves then there there's these they they'd they'll they're they've
+this those through to too under until up very was wasn't we we'd we'll we're we've were weren't what
+what's when when's where where's which while who who's whom why why's will with won't would wouldn't
+you you'd you'll you're you've your yours yourself yourselves also may might must shall us
+""".split())
+
+
+# -------------------------------
+# Cached Resources
+# -------------------------------
+
+# Light suffix stripping: conflates plurals and common derivations, and is far
+# cheaper than a full Porter stemmer on the long tail of rare words
+_SUFFIXES = ("ational", "ization", "fulness", "iveness", "ations", "ation", "ness", "ment",
+             "ings", "ing", "ies", "ied", "edly", "ed", "ly", "es", "s")
+
+@lru_cache(maxsize=200000)
+def stem(word):
+    for suffix in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            return word[:-len(suffix)]
+    return word
+
+
+def split_sentences(text):
+    return [s.strip() for s in SENTENCE_PATTERN.findall(text) if s.strip()]
+
+
+# -------------------------------
+# TF-IDF
+# -------------------------------
+
+def tfidf_matrix(sentences, normalize=True):
+    """Sparse TF-IDF matrix [n_sentences, n_terms] (CSR), rows L2-normalized by default"""
+    import numpy as np
+    from scipy import sparse
+
+    vocabulary = {}
+    rows, cols = [], []
+    for i, sentence in enumerate(sentences):
+        for word in WORD_PATTERN.findall(sentence.lower()):
+            if word in STOP_WORDS or len(word) < 2:
+                continue
+            term = vocabulary.setdefault(stem(word), len(vocabulary))
+            rows.append(i)
+            cols.append(term)
+
+    counts = sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.float32), (rows, cols)),
+        shape=(len(sentences), max(len(vocabulary), 1))
+    )
+    counts.sum_duplicates()
+
+    # Sublinear tf, smoothed idf
+    counts.data = 1.0 + np.log(counts.data)
+    df = np.bincount(counts.indices, minlength=counts.shape[1])
+    idf = np.log((1.0 + len(sentences)) / (1.0 + df)) + 1.0
+    matrix = counts.multiply(idf.astype(np.float32)).tocsr()
+    if not normalize:
+        return matrix
+
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return sparse.diags(1.0 / norms).dot(matrix).tocsr()
+
+
+# -------------------------------
+# Scoring
+# -------------------------------
+
+def lsa_scores(matrix, dimensions=None):
+    """
+    Sentence importance from the top singular vectors of the TF-IDF matrix.
+    Only the strongest topics are kept (about sqrt(n_sentences), at most 10).
+    """
+    import numpy as np
+
+    n = min(matrix.shape)
+    k = dimensions or max(1, min(n - 1, 10, int(np.sqrt(matrix.shape[0]))))
+    if n <= 2 or k >= n:
+        _, sigma, vt = np.linalg.svd(matrix.toarray().T, full_matrices=False)
+        sigma, v = sigma[:k], vt[:k].T
+    else:
+        from scipy.sparse.linalg import svds
+        _, sigma, vt = svds(matrix.T.astype(np.float32), k=k, tol=1e-4, random_state=0)
+        v = vt.T
+    # Weight each sentence's topic loadings by topic strength
+    return np.sqrt(((v * sigma) ** 2).sum(axis=1))
+
+
+def textrank_scores(matrix, damping=0.85, iterations=50, tolerance=1e-6):
+    """PageRank over the sentence cosine-similarity graph (sparse power iteration)"""
+    import numpy as np
+    from scipy import sparse
+
+    n = matrix.shape[0]
+    similarity = matrix.dot(matrix.T).tocsr()
+    similarity.setdiag(0)
+    similarity.eliminate_zeros()
+
+    out_weight = np.asarray(similarity.sum(axis=1)).ravel()
+    out_weight[out_weight == 0] = 1.0
+    transition = sparse.diags(1.0 / out_weight).dot(similarity).T.tocsr()
+
+    scores = np.full(n, 1.0 / n)
+    for _ in range(iterations):
+        updated = (1 - damping) / n + damping * transition.dot(scores)
+        if np.abs(updated - scores).sum() < tolerance:
+            return updated
+        scores = updated
+    return scores
+
+
+def summarize(text, sentence_count=3, method=None):
+    """
+    Return (summary, engine): the sentence_count highest scoring sentences,
+    in document order. summary is "" when there is nothing to summarize.
+    """
+    import numpy as np
+
+    method = method or os.environ.get('EXTRACTIVE_METHOD', 'lsa')
+    if method not in METHODS:
+        raise ValueError(f"Unknown extractive method '{method}', expected one of {METHODS}")
+
+    sentences = split_sentences(text)
+    if not sentences:
+        return "", ENGINES[method]
+    if len(sentences) <= sentence_count:
+        return " ".join(sentences), ENGINES[method]
+
+    if method == "lsa":
+        # Unnormalized rows: sentences that carry more of a topic score higher
+        scores = lsa_scores(tfidf_matrix(sentences, normalize=False))
+    else:
+        scores = textrank_scores(tfidf_matrix(sentences))
+    best = np.sort(np.argsort(-scores, kind="stable")[:sentence_count])
+    return " ".join(sentences[i] for i in best), ENGINES[method]
@@ -1,53 +1,341 @@
+"""
+OCR for uploaded images, multi-page TIFFs and PDFs.
+
+Tesseract stays initialized in-process: with tesserocr installed each worker
+thread keeps its own PyTessBaseAPI handle, so language data is loaded once per
+thread instead of once per image. Without tesserocr it falls back to
+pytesseract (one tesseract process per page). Pages are OCR'd in parallel on
+a shared thread pool (tesserocr releases the GIL while recognizing) and
+returned in order.
+
+Environment:
+    OCR_LANG          Tesseract language(s) (default: eng)
+    OCR_WORKERS       pages OCR'd in parallel (default: CPU count)
+    OCR_PREPROCESS    1 to grayscale/downscale/deskew pages first (default: 0)
+    OCR_MAX_SIDE      downscale pages whose longest side exceeds this (default: 2500 px)
+    OCR_PDF_DPI       render resolution for PDF pages (default: 300)
+    TESSDATA_PREFIX   tessdata directory for tesserocr
+    TESSERACT_CMD     tesseract binary for the pytesseract fallback
+"""
 
 import sys
 import json
 import os
+import threading
+from itertools import count
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
-# Import from Dyslexia folder if possible
 try:
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    dyslexia_path = os.path.abspath(os.path.join(current_dir, '../../../cognitive_disability/dyslexia'))
-    sys.path.append(dyslexia_path)
-    
-    # Check if we can use any specific extraction tools from there
-    # The folder list showed 'keyword_extraction_minilm.py', might be useful
+    from .result_cache import get_cache, file_digest
+    from .telemetry import metrics
+except ImportError:
+    from result_cache import get_cache, file_digest
+    from telemetry import metrics
+
+OCR_LANG = os.environ.get('OCR_LANG', 'eng')
+PREPROCESS = os.environ.get('OCR_PREPROCESS', '0') == '1'
+MAX_SIDE = int(os.environ.get('OCR_MAX_SIDE', '2500'))
+PDF_DPI = int(os.environ.get('OCR_PDF_DPI', '300'))
+
+MISSING_DEPENDENCIES = "Missing dependencies. Please install: pip install tesserocr pillow (or pytesseract pillow)"
+
+# -------------------------------
+# Engine (one Tesseract handle per thread)
+# -------------------------------
+
+_local = threading.local()
+_apis = []
+_apis_lock = threading.Lock()
+
+def _tesserocr_api():
+    api = getattr(_local, "api", None)
+    if api is None:
+        import tesserocr
+        tessdata = os.environ.get('TESSDATA_PREFIX')
+        with metrics.span("ocr.engine_init"):
+            api = tesserocr.PyTessBaseAPI(path=tessdata, lang=OCR_LANG) if tessdata else \
+                tesserocr.PyTessBaseAPI(lang=OCR_LANG)
+        _local.api = api
+        with _apis_lock:
+            _apis.append(api)
+    return api
+
+
+def get_engine():
+    """'tesserocr' when the in-process API is available, else 'pytesseract'"""
     try:
-        from keyword_extraction_minilm import extract_keywords
-        USING_ADVANCED_MODEL = True
+        import tesserocr  # noqa: F401
+        return "tesserocr"
     except ImportError:
-        USING_ADVANCED_MODEL = False
-except Exception:
-    USING_ADVANCED_MODEL = False
+        import pytesseract
+        # On Windows, Tesseract path often needs to be set explicitly
+        tesseract_path = os.environ.get('TESSERACT_CMD')
+        if tesseract_path:
+            pytesseract.pytesseract.tesseract_cmd = tesseract_path
+        return "pytesseract"
+
+
+def ocr_image(image, engine=None):
+    """OCR a single PIL image"""
+    if (engine or get_engine()) == "tesserocr":
+        api = _tesserocr_api()
+        api.SetImage(image)
+        return api.GetUTF8Text()
+
+    import pytesseract
+    return pytesseract.image_to_string(image, lang=OCR_LANG)
+
+
+_pool = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
 
-def extract_text(image_path):
+def _get_pool():
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None:
+            _pool_workers = int(os.environ.get('OCR_WORKERS', '0')) or os.cpu_count() or 1
+            _pool = ThreadPoolExecutor(max_workers=_pool_workers, thread_name_prefix="ocr")
+        return _pool
+
+
+def shutdown():
+    """Release the thread pool and every Tesseract handle"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True)
+            _pool = None
+    with _apis_lock:
+        for api in _apis:
+            api.End()
+        _apis.clear()
+
+
+# -------------------------------
+# Page Loading
+# -------------------------------
+
+def is_pdf(path):
+    """Recognise PDFs by their header: multer stores uploads without an extension"""
+    with open(path, 'rb') as f:
+        return b'%PDF-' in f.read(1024)
+
+
+def load_pages(path):
+    """Yield every page of an image, multi-frame TIFF or PDF as a PIL image"""
+    from PIL import Image, ImageSequence
+
+    if is_pdf(path):
+        yield from _render_pdf(path)
+        return
+
+    with Image.open(path) as image:
+        for frame in ImageSequence.Iterator(image):
+            yield frame.copy()
+
+
+def _render_pdf(path):
     try:
+        import pypdfium2 as pdfium
+    except ImportError:
         try:
-            from PIL import Image
-            import pytesseract
+            from pdf2image import convert_from_path
         except ImportError:
-            return {"error": "Missing dependencies. Please install: pip install pytesseract pillow"}
+            raise ImportError("PDF support needs: pip install pypdfium2 (or pdf2image with poppler)")
+        yield from convert_from_path(path, dpi=PDF_DPI)
+        return
 
-        # Attempt OCR
-        # On Windows, Tesseract path often needs to be set explicitly
-        tesseract_path = os.environ.get('TESSERACT_CMD')
-        if tesseract_path:
-            pytesseract.pytesseract.tesseract_cmd = tesseract_path
+    pdf = pdfium.PdfDocument(path)
+    try:
+        for page in pdf:
+            yield page.render(scale=PDF_DPI / 72).to_pil()
+    finally:
+        pdf.close()
 
-        text = pytesseract.image_to_string(Image.open(image_path))
-        
-        if not text.strip():
-            return {"error": "No text detected in the image. Try a clearer image.", "success": False}
-        
-        return {"text": text.strip(), "success": True}
 
+# -------------------------------
+# Preprocessing
+# -------------------------------
+
+def preprocess(image, max_side=MAX_SIDE):
+    """
+    Cheap clean-up before OCR: apply EXIF rotation, convert to grayscale,
+    downscale oversized phone photos and straighten small skews.
+    """
+    from PIL import ImageOps
+
+    image = ImageOps.exif_transpose(image).convert('L')
+    if max(image.size) > max_side:
+        image.thumbnail((max_side, max_side))
+
+    angle = estimate_skew(image)
+    if angle:
+        image = image.rotate(angle, expand=True, fillcolor=255)
+    return image
+
+
+def estimate_skew(image, max_angle=5.0, step=0.5, sample_side=800):
+    """
+    Skew angle in degrees from a projection profile: text lines are level when
+    the row sums of the ink mask vary the most. Works on a small copy.
+    """
+    import numpy as np
+
+    small = image.copy()
+    small.thumbnail((sample_side, sample_side))
+    pixels = np.asarray(small, dtype=np.uint8)
+    if pixels.size == 0:
+        return 0.0
+    ink = pixels < min(128, pixels.mean() - 20)
+    if ink.mean() < 0.005:
+        return 0.0  # blank page
+
+    from PIL import Image
+    mask = Image.fromarray((ink * 255).astype(np.uint8))
+
+    best_angle, best_score = 0.0, None
+    for angle in np.arange(-max_angle, max_angle + step / 2, step):
+        rows = np.asarray(mask.rotate(float(angle)), dtype=np.float32).sum(axis=1)
+        score = float(np.var(rows))
+        if best_score is None or score > best_score:
+            best_angle, best_score = float(angle), score
+    return best_angle
+
+
+# -------------------------------
+# Public API
+# -------------------------------
+
+def _ocr_page(image, engine, clean):
+    if clean:
+        with metrics.span("ocr.preprocess"):
+            image = preprocess(image)
+    with metrics.span("ocr.recognize", engine=engine):
+        text = ocr_image(image, engine).strip()
+    metrics.inc("ocr_pages_total", engine=engine)
+    return text
+
+
+def extract_pages(paths, clean=None):
+    """
+    OCR every page of every file in parallel. Pages are loaded as the pool
+    frees up, so at most twice the pool size are held in memory at once.
+
+    Returns a list of {"source": path, "page": n, "text": "..."} in input
+    order (page numbers start at 1 within each file).
+    """
+    engine = get_engine()
+    clean = PREPROCESS if clean is None else clean
+
+    pages = []
+
+    def images():
+        for path in paths:
+            loaded = load_pages(path)
+            for number in count(1):
+                with metrics.span("ocr.load_page"):
+                    image = next(loaded, None)
+                if image is None:
+                    break
+                pages.append((path, number))
+                yield image
+
+    pool = _get_pool()
+    window = _pool_workers * 2
+    texts = []
+    in_flight = deque()
+    for image in images():
+        in_flight.append(pool.submit(_ocr_page, image, engine, clean))
+        if len(in_flight) >= window:
+            texts.append(in_flight.popleft().result())
+    texts.extend(future.result() for future in in_flight)
+
+    return [
+        {"source": path, "page": number, "text": text}
+        for (path, number), text in zip(pages, texts)
+    ]
+
+
+NO_TEXT = "No text detected in the image. Try a clearer image."
+
+def _file_result(pages):
+    """Combine one file's pages into an extract_text result"""
+    text = "\n\n".join(page["text"] for page in pages if page["text"])
+    if not text:
+        return {"error": NO_TEXT, "success": False}
+    return {
+        "text": text,
+        "pages": [{"page": page["page"], "text": page["text"]} for page in pages],
+        "success": True
+    }
+
+
+def _cache_key(path, clean):
+    # Built from the file bytes and OCR settings only; nothing is initialized
+    return get_cache().make_key(
+        "ocr", file_digest(path), engine=get_engine(), lang=OCR_LANG,
+        preprocess=clean, max_side=MAX_SIDE, pdf_dpi=PDF_DPI
+    )
+
+
+def extract_text(image_path, clean=None):
+    """OCR one image, TIFF or PDF: {"text", "pages", "success"}"""
+    try:
+        clean = PREPROCESS if clean is None else clean
+        key = _cache_key(image_path, clean)
+        cached = get_cache().get(key, input_bytes=os.path.getsize(image_path))
+        if cached is not None:
+            return cached
+
+        result = _file_result(extract_pages([image_path], clean))
+        if result["success"]:
+            get_cache().set(key, result)
+        return result
+
+    except ImportError as e:
+        return {"error": f"{MISSING_DEPENDENCIES} ({str(e)})", "success": False}
     except Exception as e:
         return {"error": str(e), "success": False}
 
+
+def extract_batch(paths, clean=None):
+    """
+    OCR a batch of scanned worksheets, all pages sharing one pool.
+    Returns {"results": [...]} with one extract_text-style entry per path, in order.
+    Files already in the result cache are not OCR'd again.
+    """
+    clean = PREPROCESS if clean is None else clean
+    try:
+        keys = {path: _cache_key(path, clean) for path in paths}
+        results = {path: get_cache().get(keys[path], input_bytes=os.path.getsize(path)) for path in paths}
+        missing = [path for path in paths if results[path] is None]
+        pages = extract_pages(missing, clean) if missing else []
+    except ImportError as e:
+        return {"error": f"{MISSING_DEPENDENCIES} ({str(e)})", "success": False}
+    except Exception:
+        # One unreadable file should not sink the batch: fall back to per-file OCR
+        return {"results": [dict(extract_text(path, clean), source=path) for path in paths], "success": True}
+
+    by_source = {path: [] for path in missing}
+    for page in pages:
+        by_source[page["source"]].append(page)
+    for path in missing:
+        results[path] = _file_result(by_source[path])
+        if results[path]["success"]:
+            get_cache().set(keys[path], results[path])
+
+    return {"results": [dict(results[path], source=path) for path in paths], "success": True}
+
+
 if __name__ == "__main__":
     if len(sys.argv) < 2:
         print(json.dumps({"error": "No image path provided"}))
         sys.exit(1)
 
-    image_path = sys.argv[1]
-    result = extract_text(image_path)
+    if len(sys.argv) > 2:
+        result = extract_batch(sys.argv[1:])
+    else:
+        result = extract_text(sys.argv[1])
     print(json.dumps(result))
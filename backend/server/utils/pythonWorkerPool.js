@@ -0,0 +1,195 @@
+const { spawn } = require('child_process');
+const path = require('path');
+const readline = require('readline');
+const logger = require('../src/utils/logger');
+
+// Warm pool of long-lived Python inference workers (see inference_worker.py).
+// Each worker loads its models once and answers newline-delimited JSON
+// requests, so routes no longer pay interpreter + model load on every call.
+
+const WORKER_SCRIPT = path.join(__dirname, '../inference_worker.py');
+const RESTART_DELAY_MS = 1000;
+
+class PythonWorker {
+    constructor(index, options) {
+        this.index = index;
+        this.options = options;
+        this.pending = new Map();
+        this.queued = [];  // request lines sent before the worker reported ready
+        this.process = null;
+        this.ready = false;
+        this.stopped = false;
+        this.start();
+    }
+
+    start() {
+        const { pythonCommand, scriptPath, preload } = this.options;
+        const args = [scriptPath];
+        if (preload) args.push('--preload', preload);
+
+        this.ready = false;
+        this.process = spawn(pythonCommand, args, { stdio: ['pipe', 'pipe', 'pipe'] });
+
+        readline.createInterface({ input: this.process.stdout }).on('line', (line) => this.onLine(line));
+
+        // Writes to a worker that just died fail here; its 'exit' rejects the pending requests
+        this.process.stdin.on('error', (err) => {
+            logger.warn('Python worker stdin closed', { category: 'python-worker', worker: this.index, error: err.message });
+        });
+
+        this.process.stderr.on('data', (data) => {
+            logger.debug(data.toString().trim(), { category: 'python-worker', worker: this.index });
+        });
+
+        // 'error' and 'exit' may both fire for one process; only the first restarts it
+        let died = false;
+        const onDeath = (reason) => {
+            if (died) return;
+            died = true;
+            this.restart(reason);
+        };
+
+        this.process.on('error', (err) => {
+            logger.warn('Failed to start Python worker', { category: 'python-worker', error: err.message });
+            // A failed spawn (e.g. ENOENT) emits 'error' without 'exit'
+            if (this.process.pid === undefined) onDeath(`failed to start: ${err.message}`);
+        });
+
+        this.process.on('exit', (code) => onDeath(`exited with code ${code}`));
+    }
+
+    restart(reason) {
+        this.ready = false;
+        this.failAll(new Error(`Python worker ${reason}`));
+        if (this.stopped) return;
+        logger.warn(`Python worker ${this.index} ${reason} — restarting`, { category: 'python-worker' });
+        setTimeout(() => { if (!this.stopped) this.start(); }, RESTART_DELAY_MS);
+    }
+
+    onLine(line) {
+        let message;
+        try {
+            message = JSON.parse(line);
+        } catch (e) {
+            logger.warn('Ignoring non-JSON worker output', { category: 'python-worker', output: line });
+            return;
+        }
+
+        if (message.event === 'ready') {
+            this.ready = true;
+            logger.info(`Python worker ${this.index} ready (pid ${message.pid})`, { category: 'python-worker' });
+            for (const { id, line } of this.queued.splice(0)) {
+                if (this.pending.has(id)) this.process.stdin.write(line);
+            }
+            return;
+        }
+
+        const entry = this.pending.get(message.id);
+        if (!entry) return;
+
+        // Streaming ops send event frames before their final response
+        if (message.stream !== undefined) {
+            if (entry.onEvent) entry.onEvent(message.stream);
+            return;
+        }
+
+        this.pending.delete(message.id);
+        clearTimeout(entry.timer);
+
+        if (message.ok) {
+            entry.resolve(message.result);
+        } else {
+            const err = new Error(message.error || 'Python worker request failed');
+            err.traceback = message.traceback;
+            entry.reject(err);
+        }
+    }
+
+    send(id, op, params, timeoutMs, onEvent = null) {
+        return new Promise((resolve, reject) => {
+            const timer = setTimeout(() => {
+                this.pending.delete(id);
+                reject(new Error(`Python worker request '${op}' timed out after ${timeoutMs}ms`));
+            }, timeoutMs);
+
+            this.pending.set(id, { resolve, reject, timer, onEvent });
+            const line = JSON.stringify({ id, op, params }) + '\n';
+            // While starting or restarting, hold the request until 'ready' (or fail it on exit)
+            if (this.ready) {
+                this.process.stdin.write(line);
+            } else {
+                this.queued.push({ id, line });
+            }
+        });
+    }
+
+    failAll(err) {
+        for (const entry of this.pending.values()) {
+            clearTimeout(entry.timer);
+            entry.reject(err);
+        }
+        this.pending.clear();
+        this.queued = [];
+    }
+
+    stop() {
+        this.stopped = true;
+        if (this.process) this.process.kill();
+    }
+}
+
+class PythonWorkerPool {
+    constructor(options = {}) {
+        this.options = {
+            size: parseInt(process.env.PYTHON_WORKER_POOL_SIZE || '1', 10),
+            pythonCommand: process.env.PYTHON_EXECUTABLE || 'python',
+            scriptPath: WORKER_SCRIPT,
+            preload: process.env.PYTHON_WORKER_PRELOAD || '',
+            timeoutMs: parseInt(process.env.PYTHON_WORKER_TIMEOUT_MS || '300000', 10),
+            ...options
+        };
+        this.nextId = 1;
+        this.workers = [];
+        for (let i = 0; i < Math.max(1, this.options.size); i++) {
+            this.workers.push(new PythonWorker(i, this.options));
+        }
+    }
+
+    // Route to the least-busy worker so a slow STT job does not block summaries;
+    // workers that are (re)starting only get requests when none is ready
+    pickWorker() {
+        const ready = this.workers.filter(w => w.ready);
+        const candidates = ready.length ? ready : this.workers;
+        return candidates.reduce((best, w) => (w.pending.size < best.pending.size ? w : best));
+    }
+
+    request(op, params, timeoutMs = this.options.timeoutMs) {
+        const id = String(this.nextId++);
+        return this.pickWorker().send(id, op, params, timeoutMs);
+    }
+
+    // Like request(), but onEvent(event) is called for each streamed frame
+    // before the promise resolves with the final result
+    stream(op, params, onEvent, timeoutMs = this.options.timeoutMs) {
+        const id = String(this.nextId++);
+        return this.pickWorker().send(id, op, { ...params, stream: true }, timeoutMs, onEvent);
+    }
+
+    stop() {
+        this.workers.forEach(w => w.stop());
+    }
+}
+
+let sharedPool = null;
+
+function getWorkerPool() {
+    if (!sharedPool) sharedPool = new PythonWorkerPool();
+    return sharedPool;
+}
+
+function stopWorkerPool() {
+    if (sharedPool) sharedPool.stop();
+    sharedPool = null;
+}
+
+module.exports = { PythonWorkerPool, getWorkerPool, stopWorkerPool };
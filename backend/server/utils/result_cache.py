@@ -0,0 +1,213 @@
+"""
+Content-addressed cache for summarize, simplify, OCR and STT results.
+
+Keys are a SHA-256 of the namespace, the engine/model/parameters and the
+input (text, or the bytes of an uploaded file), so the same worksheet or clip
+is only processed once no matter how many students open it. Lookups never load
+a model: callers build the key from configuration only.
+
+Two tiers:
+    memory  LRU of recent results, kept serialized so callers cannot
+            mutate cached entries (RESULT_CACHE_MEMORY_ITEMS)
+    disk    one JSON file per key under RESULT_CACHE_DIR, trimmed to
+            RESULT_CACHE_DISK_MB (oldest first)
+
+Environment:
+    RESULT_CACHE               0 disables the cache (default: 1)
+    RESULT_CACHE_DIR           disk tier location (default: backend/server/cache/results)
+    RESULT_CACHE_MEMORY_ITEMS  default: 512
+    RESULT_CACHE_DISK_MB       default: 512 (0 keeps the cache in memory only)
+"""
+
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+
+try:
+    from .telemetry import metrics
+except ImportError:
+    from telemetry import metrics
+
+DEFAULT_CACHE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'cache', 'results'))
+
+# How many disk writes between size-based eviction passes
+EVICT_EVERY = 64
+
+
+def file_digest(path, chunk_size=1 << 20):
+    """SHA-256 of a file's contents, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def text_digest(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class ResultCache:
+    def __init__(self, directory=DEFAULT_CACHE_DIR, memory_items=512, disk_bytes=512 << 20):
+        self.directory = directory
+        self.memory_items = memory_items
+        self.disk_bytes = disk_bytes
+
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes = 0
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+
+    @staticmethod
+    def make_key(namespace, digest, **params):
+        """Key for one input digest under an engine/model/parameter combination"""
+        spec = json.dumps(params, sort_keys=True, default=str)
+        return hashlib.sha256(f"{namespace}\0{spec}\0{digest}".encode('utf-8')).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key + '.json')
+
+    # ---------- Lookup ----------
+
+    def get(self, key, input_bytes=0):
+        """Return the cached value or None; input_bytes counts toward bytes_saved on a hit"""
+        with self._lock:
+            encoded = self._memory.get(key)
+            if encoded is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                self.bytes_saved += input_bytes
+        if encoded is not None:
+            metrics.inc("result_cache_lookups_total", result="memory_hit")
+            return json.loads(encoded)
+
+        if self.disk_bytes:
+            with metrics.span("result_cache.disk_read"):
+                try:
+                    with open(self._path(key), 'r', encoding='utf-8') as f:
+                        encoded = f.read()
+                except OSError:
+                    encoded = None
+
+        with self._lock:
+            if encoded is None:
+                self.misses += 1
+            else:
+                self.disk_hits += 1
+                self.bytes_saved += input_bytes
+                self._remember(key, encoded)
+        metrics.inc("result_cache_lookups_total", result="miss" if encoded is None else "disk_hit")
+        return None if encoded is None else json.loads(encoded)
+
+    def set(self, key, value):
+        encoded = json.dumps(value)
+        with self._lock:
+            self._remember(key, encoded)
+            self._writes += 1
+            evict = self._writes % EVICT_EVERY == 0
+
+        if not self.disk_bytes:
+            return
+        path = self._path(key)
+        try:
+            with metrics.span("result_cache.disk_write"):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    f.write(encoded)
+                os.replace(tmp_path, path)  # atomic: readers never see a partial file
+        except OSError:
+            return
+        if evict:
+            self._evict_disk()
+
+    def _remember(self, key, encoded):
+        self._memory[key] = encoded
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def _evict_disk(self):
+        entries = []
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.disk_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+    # ---------- Helpers ----------
+
+    def memoize(self, key, compute, input_bytes=0, cacheable=None):
+        """
+        Return the cached value for key, or compute(), store and return it.
+        Results for which cacheable(result) is false (errors) are not stored.
+        """
+        value = self.get(key, input_bytes)
+        if value is not None:
+            return value
+        value = compute()
+        if value is not None and (cacheable is None or cacheable(value)):
+            self.set(key, value)
+        return value
+
+    def stats(self):
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                "hits": hits,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+                "bytes_saved": self.bytes_saved,
+                "memory_entries": len(self._memory),
+            }
+
+
+class _DisabledCache(ResultCache):
+    def get(self, key, input_bytes=0):
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, key, value):
+        pass
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_cache():
+    """Process-wide ResultCache configured from the environment"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            if os.environ.get('RESULT_CACHE', '1') == '0':
+                _cache = _DisabledCache(memory_items=0, disk_bytes=0)
+            else:
+                _cache = ResultCache(
+                    os.environ.get('RESULT_CACHE_DIR', DEFAULT_CACHE_DIR),
+                    memory_items=int(os.environ.get('RESULT_CACHE_MEMORY_ITEMS', '512')),
+                    disk_bytes=int(float(os.environ.get('RESULT_CACHE_DISK_MB', '512')) * (1 << 20)),
+                )
+        return _cache
@@ -2,16 +2,24 @@
 import sys
 import json
 import os
+from contextlib import redirect_stdout
+
+try:
+    from .result_cache import get_cache, text_digest
+    from .telemetry import metrics
+except ImportError:
+    from result_cache import get_cache, text_digest
+    from telemetry import metrics
 
 # Import from Dyslexia folder
 try:
     current_dir = os.path.dirname(os.path.abspath(__file__))
-    dyslexia_path = os.path.abspath(os.path.join(current_dir, '../../../Dyslexia'))
+    dyslexia_path = os.path.abspath(os.path.join(current_dir, '../../../cognitive_disability/dyslexia'))
     sys.path.append(dyslexia_path)
     
     # Import the advanced simplification script
     try:
-        from text_simplification_advanced import simplify_text as advanced_simplify
+        from text_simplification_advanced import get_simplifier, cache_version, ONLINE_FALLBACK
         USING_ADVANCED_MODEL = True
     except ImportError:
         USING_ADVANCED_MODEL = False
@@ -21,7 +29,23 @@ except Exception:
 def simplify_logic(text):
     if USING_ADVANCED_MODEL:
          try:
-             return advanced_simplify(text)
+             cache = get_cache()
+             key = cache.make_key("simplify", text_digest(text), engine="advanced", online=ONLINE_FALLBACK,
+                                  version=cache_version())
+             cached = cache.get(key, input_bytes=len(text.encode('utf-8')))
+             if cached is not None:
+                 return cached
+
+             # Shared simplifier: lexicons and cache are loaded once per process.
+             # Its progress prints must not end up in our JSON on stdout.
+             missed = []
+             with redirect_stdout(sys.stderr), metrics.span("simplify.total"):
+                 simplified = get_simplifier().simplify(text, missed=missed)
+             # Words still waiting on Datamuse were kept as-is; a later call
+             # does better from the word cache, so do not pin this result
+             if not missed:
+                 cache.set(key, simplified)
+             return simplified
          except:
              pass
     
@@ -1,63 +1,315 @@
 """
 Simple STT module using OpenAI Whisper
 This is a basic implementation for speech-to-text transcription
+
+Models are kept in a process-wide registry so repeated transcriptions reuse
+the loaded weights instead of calling whisper.load_model() every time.
+
+The inference library is pluggable (see utils/stt_backends.py).
+
+Environment:
+    STT_BACKEND           openai (openai-whisper) or faster (faster-whisper int8) (default: openai)
+    WHISPER_MODEL         model size to use (default: small)
+    WHISPER_DEVICE        cpu or cuda (default: cpu)
+    WHISPER_COMPUTE_TYPE  float32/float16 for openai, int8/int8_float16/float16/float32
+                          for faster (default: float32 / int8)
+    WHISPER_MAX_MODELS    how many models to keep resident (default: 1)
+    WHISPER_PRELOAD       comma-separated model sizes to load at startup
+    STT_SEGMENT_WORKERS   processes used to transcribe speech segments (default: 1)
 """
 
+import os
+import time
+import threading
+from collections import OrderedDict
+
+try:
+    from .stt_backends import get_backend
+    from .telemetry import metrics
+except ImportError:
+    from stt_backends import get_backend
+    from telemetry import metrics
+
+# -------------------------------
+# Model Registry
+# -------------------------------
+
+_models = OrderedDict()
+_registry_lock = threading.Lock()
+
+_stats = {
+    "model_loads": 0,
+    "model_load_seconds": 0.0,
+    "cache_hits": 0,
+    "transcriptions": 0,
+    "inference_seconds": 0.0,
+}
+
+
+def _model_key(model_name=None, device=None, compute_type=None, backend=None):
+    backend = get_backend(backend)
+    return (
+        backend.name,
+        model_name or os.environ.get('WHISPER_MODEL', 'small'),
+        device or os.environ.get('WHISPER_DEVICE', 'cpu'),
+        compute_type or os.environ.get('WHISPER_COMPUTE_TYPE', backend.default_compute_type),
+    )
+
+
+def get_model(model_name=None, device=None, compute_type=None, backend=None):
+    """
+    Return a loaded Whisper model, loading it on first use.
+
+    Models are keyed by (backend, name, device, compute type). When more than
+    WHISPER_MAX_MODELS are configured the least recently used one is evicted.
+    """
+    key = _model_key(model_name, device, compute_type, backend)
+
+    with _registry_lock:
+        if key in _models:
+            _models.move_to_end(key)
+            _stats["cache_hits"] += 1
+            return _models[key]
+
+        backend_name, name, device, compute_type = key
+        start = time.perf_counter()
+        with metrics.span("stt.model_load", backend=backend_name, model=name):
+            model = get_backend(backend_name).load(name, device, compute_type)
+        _stats["model_loads"] += 1
+        _stats["model_load_seconds"] += time.perf_counter() - start
+
+        _models[key] = model
+        max_models = max(1, int(os.environ.get('WHISPER_MAX_MODELS', '1')))
+        while len(_models) > max_models:
+            _models.popitem(last=False)
+
+        return model
+
+
+def preload_models(model_names=None):
+    """Load models ahead of the first request (defaults to WHISPER_PRELOAD)"""
+    if model_names is None:
+        model_names = [m.strip() for m in os.environ.get('WHISPER_PRELOAD', '').split(',') if m.strip()]
+    for name in model_names:
+        get_model(name)
+    return list(_models)
+
+
+def get_stats():
+    """Model load time versus inference time, to verify loads stay off the hot path"""
+    with _registry_lock:
+        stats = dict(_stats)
+        stats["resident_models"] = ["/".join(key) for key in _models]
+    return stats
+
+
+# -------------------------------
+# Voice Activity Detection
+# -------------------------------
+
+SAMPLE_RATE = 16000
+
+def detect_speech(audio, frame_ms=30, margin_db=10.0, min_db=-45.0, pad_ms=200,
+                  min_speech_ms=250, min_gap_ms=300, max_segment_s=30.0):
+    """
+    Energy-based voice activity detection.
+
+    Frames louder than the clip's noise floor (10th percentile energy) plus
+    margin_db are treated as speech; clips with no dynamic range at all count
+    as silence. Speech runs are merged across gaps shorter than min_gap_ms,
+    runs shorter than min_speech_ms (before padding) are dropped as clicks,
+    and the rest are padded by pad_ms on both sides.
+
+    Whisper pads every input to a 30 s window, so each pass costs the same
+    however short the segment is: neighbouring segments are packed into
+    windows of up to max_segment_s (keeping the short pauses between them),
+    and only longer stretches of silence are cut out.
+
+    Returns a list of (start_sample, end_sample) tuples.
+    """
+    import numpy as np
+
+    frame = int(SAMPLE_RATE * frame_ms / 1000)
+    n_frames = len(audio) // frame
+    if n_frames == 0:
+        return []
+
+    frames = np.asarray(audio[:n_frames * frame], dtype=np.float32).reshape(n_frames, frame)
+    energy_db = 10 * np.log10(np.mean(frames ** 2, axis=1) + 1e-12)
+
+    floor = np.percentile(energy_db, 10)
+    # Speech is bursty; a clip with almost no dynamic range is silence or steady noise
+    if energy_db.max() - floor < 6.0:
+        return []
+    threshold = max(min(floor + margin_db, energy_db.max() - 25), min_db)
+    speech = energy_db > threshold
+
+    edges = np.diff(np.concatenate(([0], speech.astype(np.int8), [0])))
+    runs = zip(np.where(edges == 1)[0], np.where(edges == -1)[0])
+
+    merged = []
+    for start, end in runs:
+        if merged and (start - merged[-1][1]) * frame_ms < min_gap_ms:
+            merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+
+    pad = pad_ms // frame_ms
+    max_frames = int(max_segment_s * 1000 / frame_ms)
+    windows = []
+    for start, end in merged:
+        if (end - start) * frame_ms < min_speech_ms:
+            continue
+        start, end = max(start - pad, 0), min(end + pad, n_frames)
+        if windows and end - windows[-1][0] <= max_frames:
+            windows[-1] = (windows[-1][0], end)
+        elif windows and start < windows[-1][1]:
+            # Padding overlaps a full window: start right after it
+            windows.append((windows[-1][1], end))
+        else:
+            windows.append((start, end))
+
+    segments = []
+    for start, end in windows:
+        for chunk_start in range(start, end, max_frames):
+            chunk_end = min(chunk_start + max_frames, end)
+            segments.append((int(chunk_start * frame), int(min(chunk_end * frame, len(audio)))))
+    return segments
+
+
+# -------------------------------
+# Transcription
+# -------------------------------
+
+# Decoding options shared by every transcription:
+# - task="transcribe": keep original language
+# - temperature=0: deterministic decoding (reduces random errors)
+# - no_speech_threshold=0.8: strictly ignore silence/static
+# - compression_ratio_threshold=2.4: ignore repetitive nonsensical output
+# - logprob_threshold=-1.0: fallback if probability is low
+# - condition_on_previous_text=False: prevent loops
+# - initial_prompt: a neutral guide to stabilize the model
+TRANSCRIBE_OPTIONS = {
+    "task": "transcribe",
+    "temperature": 0,
+    "condition_on_previous_text": False,
+    "no_speech_threshold": 0.8,
+    "compression_ratio_threshold": 2.4,
+    "logprob_threshold": -1.0,
+    "initial_prompt": "Transcribe the following educational assessment response clearly.",
+}
+
+# Part of the result cache key: bump when transcripts change for the same model
+# and options (VAD segmentation, stitching, text cleanup), so the disk tier
+# drops stale ones
+STT_VERSION = 1
+
+
+def _transcribe(audio):
+    """Run Whisper on one clip or segment with the shared decoding options"""
+    # 'small' is significantly more accurate than 'base' while remaining performant on CPUs.
+    # 'base' can be set via WHISPER_MODEL env var if resources are extremely limited.
+    model = get_model()
+    backend_name, _, _, compute_type = _model_key()
+
+    start = time.perf_counter()
+    with metrics.span("stt.inference", backend=backend_name):
+        result = get_backend(backend_name).transcribe(model, audio, compute_type, TRANSCRIBE_OPTIONS)
+    with _registry_lock:
+        _stats["transcriptions"] += 1
+        _stats["inference_seconds"] += time.perf_counter() - start
+
+    return result
+
+
+def _transcribe_segment(segment):
+    # Runs inside a segment worker process; each worker keeps its own model
+    return _transcribe(segment)
+
+
+_segment_pool = None
+_segment_pool_lock = threading.Lock()
+
+def _get_segment_pool(workers):
+    """Process pool for segment-parallel transcription (one model per process)"""
+    global _segment_pool
+    with _segment_pool_lock:
+        if _segment_pool is None:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            # spawn, not fork: forking a process that already holds torch threads can deadlock
+            _segment_pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _segment_pool
+
+
+def load_audio(audio):
+    """Accept a path or an already decoded 16 kHz mono float32 array"""
+    if isinstance(audio, str):
+        return get_backend().load_audio(audio)
+    return audio
+
+
+SEGMENT_BUCKETS = (0, 1, 2, 4, 8, 16, 32, 64)
+
+def iter_transcription(audio, workers=None):
+    """
+    Transcribe speech segments one by one, yielding partial results as they finish:
+        {"start": seconds, "end": seconds, "text": "...", "language": "en"}
+
+    Silent regions are dropped by detect_speech() before Whisper sees them.
+    With STT_SEGMENT_WORKERS > 1, segments are transcribed in parallel worker
+    processes and still yielded in order.
+    """
+    audio = load_audio(audio)
+    with metrics.span("stt.vad"):
+        segments = detect_speech(audio)
+    metrics.observe("stt_speech_segments", len(segments), buckets=SEGMENT_BUCKETS)
+    workers = workers or int(os.environ.get('STT_SEGMENT_WORKERS', '1'))
+
+    clips = (audio[start:end] for start, end in segments)
+    if workers > 1 and len(segments) > 1:
+        results = _get_segment_pool(workers).map(_transcribe_segment, clips)
+    else:
+        results = map(_transcribe, clips)
+
+    for (start, end), result in zip(segments, results):
+        yield {
+            "start": round(start / SAMPLE_RATE, 2),
+            "end": round(end / SAMPLE_RATE, 2),
+            "text": result["text"],
+            "language": result["language"]
+        }
+
+
 def speech_to_text(audio_path):
     """
     Transcribe audio file to text using Whisper
-    
+
     Args:
-        audio_path: Path to the audio file
-        
+        audio_path: Path to the audio file, or a 16 kHz mono float32 NumPy array
+
     Returns:
         dict: {"text": transcribed_text, "language": detected_language}
     """
     try:
-        import whisper
-        import os
-        
-        # Load the Whisper model
-        # 'small' is significantly more accurate than 'base' while remaining performant on CPUs.
-        # 'base' can be set via WHISPER_MODEL env var if resources are extremely limited.
-        model_name = os.environ.get('WHISPER_MODEL', 'small')
-        model = whisper.load_model(model_name)
-        
-        # Transcribe with aggressive parameters to eliminate hallucinations:
-        # - task="transcribe": keep original language
-        # - temperature=0: deterministic decoding (reduces random errors)
-        # - no_speech_threshold=0.8: strictly ignore silence/static
-        # - compression_ratio_threshold=2.4: ignore repetitive nonsensical output
-        # - logprob_threshold=-1.0: fallback if probability is low
-        # - condition_on_previous_text=False: prevent loops
-        # - initial_prompt: a neutral guide to stabilize the model
-        result = model.transcribe(
-            audio_path,
-            task="transcribe",
-            temperature=0,
-            condition_on_previous_text=False,
-            fp16=False,
-            no_speech_threshold=0.8,
-            compression_ratio_threshold=2.4,
-            logprob_threshold=-1.0,
-            initial_prompt="Transcribe the following educational assessment response clearly."
-        )
-        
-        # Post-process: If Whisper still returns something like "Thank you." 
-        # or common hallucination markers for very short clips, we can filter them here.
-        text = result["text"].strip()
-        hallucination_markers = ["Thank you.", "Thanks for watching.", "Subtitles by", "Please subscribe"]
-        if len(text) < 20 and any(marker in text for marker in hallucination_markers):
-            return {"text": "", "language": result.get("language", "en"), "warning": "filtered_hallucination"}
+        parts = [part for part in iter_transcription(audio_path) if part["text"]]
+
+        # Nothing but silence/static: return empty text instead of letting
+        # Whisper hallucinate "Thank you." on an empty clip
+        if not parts:
+            return {"text": "", "language": "unknown", "warning": "no_speech"}
 
         return {
-            "text": text,
-            "language": result.get("language", "en")
+            "text": " ".join(part["text"] for part in parts),
+            "language": parts[0]["language"]
         }
-        
+
     except ImportError:
         return {
-            "error": "Whisper not installed. Install with: pip install openai-whisper",
+            "error": "Whisper not installed. Install with: pip install openai-whisper (or faster-whisper for STT_BACKEND=faster)",
             "text": "",
             "language": "unknown"
         }
@@ -72,8 +324,13 @@ def speech_to_text(audio_path):
 if __name__ == "__main__":
     # Test the function
     import sys
-    if len(sys.argv) > 1:
+    import json
+    if len(sys.argv) > 2 and sys.argv[1] == "--stream":
+        for part in iter_transcription(sys.argv[2]):
+            print(json.dumps(part), flush=True)
+    elif len(sys.argv) > 1:
         result = speech_to_text(sys.argv[1])
         print(result)
+        print(get_stats())
     else:
-        print("Usage: python stt.py <audio_file_path>")
+        print("Usage: python stt.py [--stream] <audio_file_path>")
@@ -0,0 +1,68 @@
+"""
+Pluggable speech-to-text backends behind utils/stt.speech_to_text.
+
+STT_BACKEND selects the implementation:
+    openai  - openai-whisper (PyTorch), the original path (default)
+    faster  - faster-whisper / CTranslate2, int8 by default on CPU
+
+Both take the same decoding options and return {"text", "language"}.
+"""
+
+import os
+
+SAMPLE_RATE = 16000
+
+
+class OpenAIWhisperBackend:
+    name = "openai"
+    default_compute_type = "float32"
+
+    def load(self, model_name, device, compute_type):
+        import whisper
+        return whisper.load_model(model_name, device=device)
+
+    def load_audio(self, path):
+        import whisper
+        return whisper.load_audio(path, sr=SAMPLE_RATE)
+
+    def transcribe(self, model, audio, compute_type, options):
+        result = model.transcribe(audio, fp16=(compute_type == 'float16'), **options)
+        return {"text": result["text"].strip(), "language": result.get("language", "en")}
+
+
+class FasterWhisperBackend:
+    name = "faster"
+    default_compute_type = "int8"
+
+    # openai-whisper option names that are spelled differently in faster-whisper
+    OPTION_NAMES = {"logprob_threshold": "log_prob_threshold"}
+
+    def load(self, model_name, device, compute_type):
+        from faster_whisper import WhisperModel
+        return WhisperModel(model_name, device=device, compute_type=compute_type)
+
+    def load_audio(self, path):
+        from faster_whisper import decode_audio
+        return decode_audio(path, sampling_rate=SAMPLE_RATE)
+
+    def transcribe(self, model, audio, compute_type, options):
+        options = {self.OPTION_NAMES.get(k, k): v for k, v in options.items()}
+        # openai-whisper decodes greedily at temperature 0; match it
+        options.setdefault("beam_size", 1)
+        segments, info = model.transcribe(audio, **options)
+        # segments is a lazy generator; joining it runs the decoding
+        text = "".join(segment.text for segment in segments).strip()
+        return {"text": text, "language": info.language}
+
+
+BACKENDS = {
+    OpenAIWhisperBackend.name: OpenAIWhisperBackend(),
+    FasterWhisperBackend.name: FasterWhisperBackend(),
+}
+
+
+def get_backend(name=None):
+    name = name or os.environ.get('STT_BACKEND', 'openai')
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown STT backend '{name}', expected one of {sorted(BACKENDS)}")
+    return BACKENDS[name]
@@ -2,61 +2,161 @@
 import sys
 import json
 import os
+import time
+
+try:
+    from .result_cache import get_cache, text_digest
+    from .engine_router import get_router, bart_profile
+    from . import extractive
+    from .telemetry import metrics
+except ImportError:
+    from result_cache import get_cache, text_digest
+    from engine_router import get_router, bart_profile
+    import extractive
+    from telemetry import metrics
 
 # Import from Dyslexia folder if possible, otherwise use fallback
 try:
-    # Add Dyslexia folder to path (assuming 3 levels up from here based on structure)
-    # d:\student_backend2\CodeNeticz-KHacks-3.0\Dyslexia
     current_dir = os.path.dirname(os.path.abspath(__file__))
-    dyslexia_path = os.path.abspath(os.path.join(current_dir, '../../../Dyslexia'))
+    dyslexia_path = os.path.abspath(os.path.join(current_dir, '../../../cognitive_disability/dyslexia'))
     sys.path.append(dyslexia_path)
     
     # Try importing the specific summarization script provided in that folder
+    # (cheap: BART itself is only loaded on the first summary)
     try:
-        from bart_summarization import summarize_text as bart_summarize
+        import bart_summarization
         USING_ADVANCED_MODEL = True
     except ImportError:
         USING_ADVANCED_MODEL = False
 except Exception:
     USING_ADVANCED_MODEL = False
 
-def summarize_text(text, sentence_count=3):
-    if USING_ADVANCED_MODEL:
+# Part of the result cache key: bump when summaries change for the same engine
+# and settings (chunking, post-processing), so the disk tier drops stale ones
+SUMMARY_VERSION = 2
+
+def summarize_text(text, sentence_count=3, max_length=130, min_length=40, deadline_ms=None, on_event=None,
+                   sentences=None):
+    """
+    Summarize with the engine the router picks for this request (input length,
+    deadline_ms, summaries in flight, measured latency). The response reports
+    the engine that ran and a "route" dict saying why and with which settings.
+    A full-quality BART summary already in the result cache is returned
+    before routing, whatever the load or deadline.
+
+    With on_event, BART decodes greedily and on_event(event) receives the text
+    as it is generated ("delta" / "partial" events of iter_summarize_stream,
+    or "reset" if BART fails part-way and the extractive fallback is returned).
+    The returned response is still the complete, authoritative summary.
+
+    sentences: optional precomputed split_sentences(text), reused by BART's
+    chunking of long inputs (e.g. from the study aid pipeline).
+    """
+    router = get_router()
+    cache = get_cache()
+    input_bytes = len(text.encode('utf-8'))
+
+    # Routing may degrade to fewer beams, a shorter summary or extractive,
+    # which would miss (and recompute below) a better summary already cached
+    best_key = None
+    if USING_ADVANCED_MODEL and len(text.split()) >= router.min_words_bart:
+        best_key = _cache_key(text, "BART", _bart_params(max_length, min_length, num_beams=4))
+        cached = cache.get(best_key, input_bytes)
+        if cached is not None:
+            route = dict(router.cached_route(deadline_ms, 4, max_length), cached=True)
+            metrics.inc("summarize_requests_total", engine="BART", reason=route["reason"], cached=True)
+            return dict(cached, route=route)
+
+    with metrics.span("summarize.route"):
+        route = router.choose(text, deadline_ms=deadline_ms, max_length=max_length,
+                              bart_available=USING_ADVANCED_MODEL, max_beams=1 if on_event else 4)
+
+    # Identical text with the same engine and settings is served from the result cache
+    if route["engine"] == "BART":
+        engine = "BART"
+        params = _bart_params(route["max_length"], min_length, route["num_beams"])
+    else:
+        method = os.environ.get('EXTRACTIVE_METHOD', 'lsa')
+        engine = extractive.ENGINES.get(method, method)
+        params = {"sentence_count": sentence_count}
+
+    key = _cache_key(text, engine, params)
+    # The full-quality key was just looked up; do not count a second miss
+    result = cache.get(key, input_bytes) if key != best_key else None
+    route["cached"] = result is not None
+
+    if result is None:
+        start = time.perf_counter()
+        with router.track(), metrics.span("summarize.compute", engine=engine):
+            result = _summarize(text, sentence_count, params, use_bart=engine == "BART", on_event=on_event,
+                                sentences=sentences)
+        # Only cache output of the engine the key was built for, never a fallback or error;
+        # a BART failure that fell back to extractive would also skew both estimates
+        if result.get("success") and result.get("engine") == engine:
+            profile = bart_profile(params["num_beams"]) if engine == "BART" else "extractive"
+            router.observe(profile, text, time.perf_counter() - start)
+            cache.set(key, result)
+
+    if engine == "BART" and result.get("engine") != "BART":
+        route.update(engine="extractive", reason="bart_failed")
+    metrics.inc("summarize_requests_total", engine=route["engine"], reason=route["reason"], cached=route["cached"])
+    return dict(result, route=route)
+
+
+def _bart_params(max_length, min_length, num_beams):
+    return {"model": bart_summarization.model_name, "backend": bart_summarization.BACKEND,
+            "max_length": max_length, "min_length": min(min_length, max_length), "num_beams": num_beams}
+
+
+def _cache_key(text, engine, params):
+    return get_cache().make_key("summarize", text_digest(text), engine=engine, version=SUMMARY_VERSION, **params)
+
+
+def _summarize(text, sentence_count, params, use_bart, on_event=None, sentences=None):
+    if use_bart and on_event is not None:
+        streamed = False
         try:
-             # Use the advanced model from Dyslexia folder
-             summary = bart_summarize(text) 
+            summary = ""
+            for event in bart_summarization.iter_summarize_stream(
+                    text, max_length=params["max_length"], min_length=params["min_length"],
+                    sentences=sentences):
+                if event["type"] == "final":
+                    summary = event["summary"]
+                else:
+                    on_event(event)
+                    streamed = True
+            return {"summary": summary, "success": True, "engine": "BART"}
+        except Exception:
+            # The client already shows part of a BART summary; tell it to
+            # drop that before the extractive fallback arrives as the result
+            if streamed:
+                on_event({"type": "reset", "reason": "bart_failed"})
+    elif use_bart:
+        try:
+             # Use the advanced model from Dyslexia folder; concurrent callers share a batch
+             summary = bart_summarization.summarize_text_batched(
+                 text, max_length=params["max_length"], min_length=params["min_length"],
+                 sentences=sentences, num_beams=params["num_beams"]
+             )
              return {"summary": summary, "success": True, "engine": "BART"}
         except Exception as e:
             # Fallback if integration fails
             pass
 
     try:
-        # Try importing sumy for lightweight extractive summarization as fallback
+        # Built-in sparse TF-IDF extractive engine (LSA or TextRank)
         try:
-            from sumy.parsers.plaintext import PlaintextParser
-            from sumy.nlp.tokenizers import Tokenizer
-            from sumy.summarizers.lsa import LsaSummarizer
-            from sumy.nlp.stemmers import Stemmer
-            from sumy.utils import get_stop_words
+            summary, engine = extractive.summarize(text, sentence_count)
         except ImportError:
              return {
-                 "summary": "Summarization requires 'sumy' package. (pip install sumy numpy nltk)", 
+                 "summary": "Summarization requires 'numpy' and 'scipy'. (pip install numpy scipy)", 
                  "error": "Missing dependencies"
              }
 
-        parser = PlaintextParser.from_string(text, Tokenizer("english"))
-        stemmer = Stemmer("english")
-        summarizer = LsaSummarizer(stemmer)
-        summarizer.stop_words = get_stop_words("english")
-
-        summary_sentences = summarizer(parser.document, sentence_count)
-        
-        summary = " ".join([str(sentence) for sentence in summary_sentences])
-        
         if not summary:
             return {"summary": text, "note": "Text too short to summarize"}
 
-        return {"summary": summary, "success": True, "engine": "LSA"}
+        return {"summary": summary, "success": True, "engine": engine}
 
     except Exception as e:
         return {"error": str(e), "success": False}
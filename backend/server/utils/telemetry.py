@@ -0,0 +1,20 @@
+"""
+Backend access to the shared metrics registry.
+
+The registry lives in cognitive_disability/dyslexia/metrics.py so that the
+backend utils and the dyslexia modules they call record into the same one;
+this module only puts that directory on sys.path:
+
+    from .telemetry import metrics
+    with metrics.span("ocr.recognize"):
+        ...
+"""
+
+import os
+import sys
+
+DYSLEXIA_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../cognitive_disability/dyslexia'))
+if DYSLEXIA_DIR not in sys.path:
+    sys.path.append(DYSLEXIA_DIR)
+
+import metrics  # noqa: E402
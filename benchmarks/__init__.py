@@ -0,0 +1,22 @@
+"""
+Offline benchmark suite for the Python processing paths.
+
+Times simplify_words, split_sentences, extract_keywords, summarize_text,
+extract_text (OCR) and run_transcription (STT) separately on fixed corpora,
+each in its own process, and records throughput, p50/p95 latency and peak
+RSS as JSON. Runs without network or GPU: by default the heavy models are
+replaced by stand-ins (see stubs.py).
+
+Usage (from the repository root):
+    python -m benchmarks list
+    python -m benchmarks run [--case summarize_text] [--models stub|real] [--output FILE]
+    python -m benchmarks run --output benchmarks/results/baseline.json
+    python -m benchmarks run --baseline benchmarks/results/baseline.json
+    python -m benchmarks compare BASELINE [CURRENT] [--tolerance 0.2]
+
+Timings only compare on the same machine, so baselines are recorded locally
+(benchmarks/results/ is not versioned). CURRENT defaults to the newest run
+other than baseline.json. compare (and run --baseline) exit with status 1
+when any case got slower, lost throughput or used more memory than the
+tolerance allows.
+"""
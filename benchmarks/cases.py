@@ -0,0 +1,118 @@
+"""
+Benchmark cases: one Python processing path each, on a fixed corpus.
+
+A case's setup() returns (fn, items, units): fn is called once per item and
+timed per call; units is the amount of work in one pass over the items
+(words, pages or audio seconds) for the throughput figure.
+"""
+
+import os
+import sys
+import wave
+import tempfile
+
+from . import corpora
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SERVER_DIR = os.path.join(ROOT_DIR, "backend", "server")
+DYSLEXIA_DIR = os.path.join(ROOT_DIR, "cognitive_disability", "dyslexia")
+
+for _path in (SERVER_DIR, DYSLEXIA_DIR):
+    if _path not in sys.path:
+        sys.path.append(_path)
+
+
+class Skip(Exception):
+    """The case cannot run here (missing data or dependency)"""
+
+
+def _words(items):
+    return sum(len(item.split()) for item in items)
+
+
+def _checked(fn):
+    # Several entry points report failure as {"error": ...} instead of raising
+    def call(item):
+        result = fn(item)
+        if isinstance(result, dict) and result.get("error"):
+            raise RuntimeError(result["error"])
+        return result
+    return call
+
+
+# -------------------------------
+# Text Cases
+# -------------------------------
+
+def simplify_words(size):
+    from text_simplification_advanced import get_simplifier
+    items = corpora.texts(size)
+    return get_simplifier().simplify_words, items, _words(items)
+
+
+def split_sentences(size):
+    from text_simplification_advanced import get_simplifier
+    items = corpora.texts(size)
+    return get_simplifier().split_sentences, items, _words(items)
+
+
+def extract_keywords(size):
+    import keyword_extraction_minilm as keywords
+    # Never download in a benchmark: fail fast when the NLTK data is missing
+    keywords._nltk_ready = True
+    try:
+        keywords.get_stop_words()
+        keywords.tokenize("Check the tokenizer.")
+    except LookupError:
+        raise Skip("NLTK data missing (python -m nltk.downloader punkt punkt_tab stopwords)")
+    items = corpora.texts(size)
+    return keywords.extract_keywords, items, _words(items)
+
+
+def summarize_text(size):
+    from utils.summarizer import summarize_text
+    items = corpora.texts(size)
+    return _checked(summarize_text), items, _words(items)
+
+
+# -------------------------------
+# File Cases
+# -------------------------------
+
+def extract_text(_):
+    try:
+        import PIL  # noqa: F401
+    except ImportError:
+        raise Skip("Pillow not installed")
+    from utils.ocr import extract_text
+    items = corpora.make_images(tempfile.mkdtemp(prefix="bench_ocr_"))
+    return _checked(extract_text), items, len(items)
+
+
+def run_transcription(_):
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        raise Skip("NumPy not installed")
+    from bridge_stt import run_transcription
+    items = corpora.make_clips(tempfile.mkdtemp(prefix="bench_stt_"))
+    seconds = 0.0
+    for path in items:
+        with wave.open(path, "rb") as wav:
+            seconds += wav.getnframes() / wav.getframerate()
+    return _checked(run_transcription), items, seconds
+
+
+# name -> (function benchmarked, setup, corpus, throughput unit)
+CASES = {
+    "simplify_words/short": ("simplify_words", simplify_words, "short", "words"),
+    "simplify_words/long": ("simplify_words", simplify_words, "long", "words"),
+    "split_sentences/short": ("split_sentences", split_sentences, "short", "words"),
+    "split_sentences/long": ("split_sentences", split_sentences, "long", "words"),
+    "extract_keywords/short": ("extract_keywords", extract_keywords, "short", "words"),
+    "extract_keywords/long": ("extract_keywords", extract_keywords, "long", "words"),
+    "summarize_text/short": ("summarize_text", summarize_text, "short", "words"),
+    "summarize_text/long": ("summarize_text", summarize_text, "long", "words"),
+    "extract_text/pages": ("extract_text", extract_text, "pages", "pages"),
+    "run_transcription/clips": ("run_transcription", run_transcription, "clips", "audio_seconds"),
+}
@@ -0,0 +1,110 @@
+"""
+Fixed benchmark inputs.
+
+Texts come from corpora/passages.txt (one passage per blank-line separated
+paragraph). Images and audio are generated deterministically from them into
+a scratch directory, so no binary fixtures live in the repository and every
+run sees byte-identical files.
+"""
+
+import os
+import math
+import wave
+import random
+
+CORPORA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpora")
+
+SAMPLE_RATE = 16000
+LONG_TEXT_REPEATS = 4  # about 2,300 words: several BART windows
+
+
+def passages():
+    """The short texts: one educational passage each (60-90 words)"""
+    with open(os.path.join(CORPORA_DIR, "passages.txt"), "r", encoding="utf-8") as f:
+        return [" ".join(block.split()) for block in f.read().split("\n\n") if block.strip()]
+
+
+def long_text():
+    """All passages joined and repeated: one long reading assignment"""
+    return " ".join(passages() * LONG_TEXT_REPEATS)
+
+
+def texts(size):
+    if size == "short":
+        return passages()
+    if size == "long":
+        return [long_text()]
+    raise ValueError(f"Unknown corpus size '{size}', expected short or long")
+
+
+# -------------------------------
+# Scanned Pages
+# -------------------------------
+
+def make_page(text, path, width=1240, height=1754, skew_degrees=1.5):
+    """Render text as a slightly rotated A4 page at 150 dpi, like a phone scan"""
+    from PIL import Image, ImageDraw, ImageFont
+
+    page = Image.new("L", (width, height), 255)
+    draw = ImageDraw.Draw(page)
+    try:
+        font = ImageFont.load_default(size=28)
+    except TypeError:
+        font = ImageFont.load_default()
+
+    words, line, y = text.split(), "", 120
+    for word in words:
+        candidate = f"{line} {word}".strip()
+        if draw.textlength(candidate, font=font) > width - 240:
+            draw.text((120, y), line, fill=0, font=font)
+            line, y = word, y + 42
+        else:
+            line = candidate
+    draw.text((120, y), line, fill=0, font=font)
+
+    page.rotate(skew_degrees, fillcolor=255, resample=Image.BICUBIC).convert("RGB").save(path)
+    return path
+
+
+def make_images(directory, count=4):
+    return [make_page(text, os.path.join(directory, f"page_{i}.png"))
+            for i, text in enumerate(passages()[:count])]
+
+
+# -------------------------------
+# Spoken Answers
+# -------------------------------
+
+def make_clip(path, seconds=8.0, seed=0):
+    """
+    16 kHz mono 16-bit WAV with speech-like bursts (voiced harmonics under a
+    syllable-rate envelope) separated by pauses, so voice activity detection
+    finds several segments.
+    """
+    rng = random.Random(seed)
+    n = int(seconds * SAMPLE_RATE)
+    samples = [0] * n
+
+    t = int(0.3 * SAMPLE_RATE)
+    while t < n:
+        burst = int(rng.uniform(0.8, 1.6) * SAMPLE_RATE)
+        pitch = rng.uniform(110, 220)
+        for i in range(min(burst, n - t)):
+            at = i / SAMPLE_RATE
+            envelope = 0.5 * (1 - math.cos(2 * math.pi * 4 * at))  # ~4 syllables/s
+            voiced = sum(math.sin(2 * math.pi * pitch * k * at) / k for k in (1, 2, 3))
+            samples[t + i] = int(9000 * envelope * voiced / 1.8)
+        t += burst + int(rng.uniform(0.4, 0.9) * SAMPLE_RATE)
+
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes(b"".join(max(-32768, min(32767, s)).to_bytes(2, "little", signed=True)
+                                 for s in samples))
+    return path
+
+
+def make_clips(directory, count=3):
+    return [make_clip(os.path.join(directory, f"answer_{i}.wav"), seconds=6.0 + 2 * i, seed=i)
+            for i in range(count)]
@@ -0,0 +1,300 @@
+"""
+Runs benchmark cases and compares result files.
+
+Every case runs in a fresh interpreter (python -m benchmarks --child CASE), so
+imports, model loads and peak RSS of one case do not leak into the next.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import subprocess
+from datetime import datetime, timezone
+
+from .cases import CASES, ROOT_DIR, Skip
+from metrics import peak_rss_mb  # cognitive_disability/dyslexia, on sys.path via .cases
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+BASELINE_NAME = "baseline.json"
+
+# Latency and memory may grow, and throughput may drop, by this fraction
+# before compare reports a regression
+DEFAULT_TOLERANCE = 0.2
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    rank = fraction * (len(ordered) - 1)
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+# -------------------------------
+# One Case (child process)
+# -------------------------------
+
+def child_environment(models):
+    """Settings that keep a run offline, uncached and reproducible"""
+    scratch = tempfile.mkdtemp(prefix="bench_")
+    env = dict(os.environ)
+    env.update({
+        "RESULT_CACHE": "0",
+        "SIMPLIFIER_ONLINE_FALLBACK": "0",
+        "SIMPLIFIER_CACHE_PATH": os.path.join(scratch, "word_cache.sqlite3"),
+        "HF_HUB_OFFLINE": "1",
+        "TRANSFORMERS_OFFLINE": "1",
+        "PYTHONIOENCODING": "utf-8",
+    })
+    if models == "stub":
+        env["KEYWORD_VOCAB_DIR"] = os.path.join(scratch, "vocab_embeddings")
+    return env
+
+
+def run_case(name, models="stub", iterations=5, warmup=1):
+    function, setup, corpus, unit = CASES[name]
+    result = {"case": name, "function": function, "models": models, "unit": unit}
+
+    if models == "stub":
+        from . import stubs
+        stubs.install(function)
+
+    try:
+        fn, items, units = setup(corpus)
+        for item in items[:warmup]:
+            fn(item)
+    except Skip as e:
+        return dict(result, skipped=str(e))
+    except ImportError as e:
+        return dict(result, skipped=f"missing dependency: {e}")
+
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for item in items:
+            call_start = time.perf_counter()
+            fn(item)
+            latencies.append(time.perf_counter() - call_start)
+    total = time.perf_counter() - start
+
+    return dict(
+        result,
+        calls=len(latencies),
+        total_seconds=round(total, 4),
+        throughput=round(len(latencies) / total, 3),
+        units_per_second=round(units * iterations / total, 3),
+        p50_ms=round(percentile(latencies, 0.50) * 1000, 3),
+        p95_ms=round(percentile(latencies, 0.95) * 1000, 3),
+        mean_ms=round(sum(latencies) / len(latencies) * 1000, 3),
+        peak_rss_mb=peak_rss_mb(),
+    )
+
+
+def child_main(name, models, iterations, warmup):
+    # The real stdout carries the result line only; library prints go to stderr
+    protocol_out = sys.stdout
+    sys.stdout = sys.stderr
+    try:
+        result = run_case(name, models, iterations, warmup)
+    except Exception as e:
+        result = {"case": name, "models": models, "error": f"{type(e).__name__}: {e}"}
+    protocol_out.write(json.dumps(result) + "\n")
+    protocol_out.flush()
+    return 0
+
+
+# -------------------------------
+# Suite (parent process)
+# -------------------------------
+
+def run_suite(names, models, iterations, warmup, timeout):
+    env = child_environment(models)
+    results = {}
+    for name in names:
+        print(f"  {name} ...", end="", flush=True, file=sys.stderr)
+        command = [sys.executable, "-m", "benchmarks", "--child", name, "--models", models,
+                   "--iterations", str(iterations), "--warmup", str(warmup)]
+        try:
+            completed = subprocess.run(command, cwd=ROOT_DIR, env=env, capture_output=True,
+                                       text=True, timeout=timeout)
+            lines = completed.stdout.strip().splitlines()
+            stderr = completed.stderr.strip().splitlines()
+            result = json.loads(lines[-1]) if lines else {
+                "case": name, "models": models, "error": stderr[-1] if stderr else "no output"
+            }
+        except subprocess.TimeoutExpired:
+            result = {"case": name, "models": models, "error": f"timed out after {timeout}s"}
+        results[name] = result
+        print(" " + _status(result), file=sys.stderr)
+    return results
+
+
+def _status(result):
+    if "skipped" in result:
+        return f"skipped ({result['skipped']})"
+    if "error" in result:
+        return f"error ({result['error']})"
+    return f"p50 {result['p50_ms']:.1f} ms, p95 {result['p95_ms']:.1f} ms"
+
+
+def metadata(models, iterations):
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR,
+                                capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "models": models,
+        "iterations": iterations,
+    }
+
+
+def print_table(results):
+    print(f"{'Case':<26} {'calls/s':>9} {'units/s':>11} {'p50 ms':>9} {'p95 ms':>9} {'RSS MB':>8}")
+    print("-" * 77)
+    for name, r in results.items():
+        if "p50_ms" not in r:
+            print(f"{name:<26} {_status(r)}")
+            continue
+        print(f"{name:<26} {r['throughput']:>9.2f} {r['units_per_second']:>11.1f} "
+              f"{r['p50_ms']:>9.2f} {r['p95_ms']:>9.2f} {r['peak_rss_mb'] or 0:>8.1f}")
+
+
+# -------------------------------
+# Compare
+# -------------------------------
+
+# metric -> True when higher is better
+METRICS = {"throughput": True, "p50_ms": False, "p95_ms": False, "peak_rss_mb": False}
+
+
+def compare(baseline, current, tolerance=DEFAULT_TOLERANCE, cases=None):
+    """
+    Return [(case, metric, baseline, current, change)] for every regression.
+    A case with results in the baseline that is missing, skipped or errored in
+    the current run is a regression too: (case, "result", None, None, status).
+    cases limits the check to those names (e.g. the ones a run selected).
+    """
+    regressions = []
+    for name, before in baseline["results"].items():
+        if "p50_ms" not in before or (cases is not None and name not in cases):
+            continue
+        now = current["results"].get(name)
+        if now is None or "p50_ms" not in now:
+            status = "missing" if now is None else "skipped" if "skipped" in now else "error"
+            regressions.append((name, "result", None, None, status))
+            continue
+        for metric, higher_is_better in METRICS.items():
+            old, new = before.get(metric), now.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if (change < -tolerance) if higher_is_better else (change > tolerance):
+                regressions.append((name, metric, old, new, change))
+    return regressions
+
+
+def print_comparison(baseline, current, regressions):
+    if baseline["meta"].get("models") != current["meta"].get("models"):
+        print(f"warning: comparing {baseline['meta'].get('models')} models against "
+              f"{current['meta'].get('models')} models", file=sys.stderr)
+    if not regressions:
+        print("No regressions.")
+        return
+    print(f"{'Case':<26} {'Metric':<12} {'Baseline':>10} {'Current':>10} {'Change':>8}")
+    print("-" * 70)
+    for name, metric, old, new, change in regressions:
+        if old is None:
+            print(f"{name:<26} {metric:<12} {'ok':>10} {change:>10}")
+        else:
+            print(f"{name:<26} {metric:<12} {old:>10.2f} {new:>10.2f} {change:>+8.0%}")
+
+
+def load(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+# -------------------------------
+# CLI
+# -------------------------------
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Offline benchmarks for the Python processing paths."
+    )
+    parser.add_argument("command", nargs="?", default="run", choices=["run", "compare", "list"])
+    parser.add_argument("files", nargs="*", help="compare: BASELINE [CURRENT]")
+    parser.add_argument("--case", action="append", help="case name or prefix (repeatable; default: all)")
+    parser.add_argument("--models", choices=["stub", "real"], default="stub",
+                        help="stand-in models (offline, default) or the installed ones")
+    parser.add_argument("--iterations", type=int, default=5, help="passes over each corpus")
+    parser.add_argument("--warmup", type=int, default=1, help="untimed calls before measuring")
+    parser.add_argument("--timeout", type=int, default=900, help="seconds per case")
+    parser.add_argument("--output", help="result file (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--baseline", help="run: compare against this result file afterwards")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        return child_main(args.child, args.models, args.iterations, args.warmup)
+
+    if args.command == "list":
+        for name, (function, _, corpus, unit) in CASES.items():
+            print(f"{name:<26} {function}() on the {corpus} corpus, throughput in {unit}")
+        return 0
+
+    if args.command == "compare":
+        if not args.files or len(args.files) > 2:
+            parser.error("compare takes BASELINE [CURRENT] (CURRENT defaults to the newest result)")
+        current_path = args.files[1] if len(args.files) > 1 else _latest_result()
+        baseline, current = load(args.files[0]), load(current_path)
+        regressions = compare(baseline, current, args.tolerance)
+        print_comparison(baseline, current, regressions)
+        return 1 if regressions else 0
+
+    names = [name for name in CASES
+             if not args.case or any(name == c or name.startswith(c.rstrip("/") + "/") for c in args.case)]
+    if not names:
+        parser.error(f"no case matches {args.case}; see python -m benchmarks list")
+
+    print(f"Running {len(names)} case(s) with {args.models} models:", file=sys.stderr)
+    report = {"meta": metadata(args.models, args.iterations),
+              "results": run_suite(names, args.models, args.iterations, args.warmup, args.timeout)}
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, datetime.now().strftime("%Y%m%d-%H%M%S") + f"-{args.models}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    print()
+    print_table(report["results"])
+    print(f"\nSaved {output}")
+
+    if args.baseline:
+        regressions = compare(load(args.baseline), report, args.tolerance, cases=names)
+        print()
+        print_comparison(load(args.baseline), report, regressions)
+        return 1 if regressions else 0
+    return 0
+
+
+def _latest_result():
+    """Newest run in benchmarks/results, never the baseline itself"""
+    paths = [os.path.join(RESULTS_DIR, f) for f in os.listdir(RESULTS_DIR)
+             if f.endswith(".json") and f != BASELINE_NAME] if os.path.isdir(RESULTS_DIR) else []
+    if not paths:
+        sys.exit("No results in benchmarks/results; run python -m benchmarks first")
+    return max(paths, key=os.path.getmtime)
@@ -1,58 +1,397 @@
-from transformers import BartTokenizer, BartForConditionalGeneration
 import sys
 import os
+import re
+import json
+import time
+import threading
 import warnings
+from itertools import islice
+
+import metrics
+from micro_batcher import MicroBatcher
 
 # Suppress tokenization warning
 warnings.filterwarnings("ignore", category=FutureWarning)
 
-# Set cache directory to use existing model
-os.environ['HF_HOME'] = r'C:\Users\Saravana Perumal\.cache\huggingface'
-os.environ['TRANSFORMERS_CACHE'] = r'C:\Users\Saravana Perumal\.cache\huggingface\hub'
+# Use the existing local model cache when it is present and nothing else is configured
+_LOCAL_HF_HOME = r'C:\Users\Saravana Perumal\.cache\huggingface'
+if os.path.isdir(_LOCAL_HF_HOME):
+    os.environ.setdefault('HF_HOME', _LOCAL_HF_HOME)
+    os.environ.setdefault('TRANSFORMERS_CACHE', os.path.join(_LOCAL_HF_HOME, 'hub'))
 
-# Load tokenizer and model (will use cache if available, download if needed)
 model_name = "facebook/bart-large-cnn"
-print("Loading BART model...", file=sys.stderr)
-tokenizer = BartTokenizer.from_pretrained(model_name)
-model = BartForConditionalGeneration.from_pretrained(model_name)
-print("Model loaded successfully!", file=sys.stderr)
+
+# -------------------------------
+# Inference Backends
+# -------------------------------
+# BART_BACKEND selects how the model runs on CPU:
+#   torch - PyTorch fp32 eager (default)
+#   int8  - PyTorch with dynamic int8 quantization of the Linear layers
+#   onnx  - ONNX Runtime encoder/decoder export with KV-cache (needs optimum[onnxruntime])
+BACKENDS = ("torch", "int8", "onnx")
+BACKEND = os.environ.get("BART_BACKEND", "torch")
+ONNX_DIR = os.environ.get(
+    "BART_ONNX_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "onnx", "bart-large-cnn")
+)
+
+# -------------------------------
+# Lazy Model Loading
+# -------------------------------
+# Nothing heavy happens at import: transformers, the tokenizer and the model
+# are loaded on first use, so importing this module stays cheap.
+_models = {}
+_tokenizer = None
+_load_lock = threading.Lock()
+
+def get_tokenizer():
+    global _tokenizer
+    if _tokenizer is None:
+        with _load_lock:
+            if _tokenizer is None:
+                with metrics.span("bart.tokenizer_load"):
+                    from transformers import BartTokenizer
+                    _tokenizer = BartTokenizer.from_pretrained(model_name)
+    return _tokenizer
+
+
+def load_model(backend=BACKEND):
+    """Load (once) and return the summarization model for a backend"""
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown BART backend '{backend}', expected one of {BACKENDS}")
+    if backend in _models:
+        return _models[backend]
+
+    with _load_lock:
+        if backend not in _models:
+            print(f"Loading BART model ({backend} backend)...", file=sys.stderr)
+            with metrics.span("bart.model_load", backend=backend):
+                _models[backend] = _load_backend(backend)
+            print("Model loaded successfully!", file=sys.stderr)
+    return _models[backend]
+
+
+def get_model(backend=None):
+    return load_model(backend or BACKEND)
+
+
+def _load_backend(backend):
+    if backend == "onnx":
+        from optimum.onnxruntime import ORTModelForSeq2SeqLM
+        if os.path.exists(os.path.join(ONNX_DIR, "config.json")):
+            loaded = ORTModelForSeq2SeqLM.from_pretrained(ONNX_DIR, use_cache=True)
+        else:
+            # First run exports the encoder and the with/without-past decoders
+            loaded = ORTModelForSeq2SeqLM.from_pretrained(model_name, export=True, use_cache=True)
+            loaded.save_pretrained(ONNX_DIR)
+    else:
+        from transformers import BartForConditionalGeneration
+        loaded = BartForConditionalGeneration.from_pretrained(model_name)
+        loaded.eval()
+        if backend == "int8":
+            import torch
+            loaded = torch.quantization.quantize_dynamic(loaded, {torch.nn.Linear}, dtype=torch.qint8)
+    return loaded
 
 # -------------------------------
 # Summarization Function
 # -------------------------------
-def summarize_text(text, max_length=130, min_length=40):
-    inputs = tokenizer(
-        text,
-        return_tensors="pt",
-        max_length=1024,
-        truncation=True
-    )
+def summarize_text(text, max_length=130, min_length=40, sentences=None, num_beams=4):
+    # Inputs longer than BART's window go through chunked map-reduce
+    # instead of being silently truncated to the first page.
+    # sentences: optional precomputed split_sentences(text), e.g. from a pipeline
+    if not fits_in_window(text):
+        return summarize_long_text(text, max_length=max_length, min_length=min_length, sentences=sentences,
+                                   num_beams=num_beams)
+    return summarize_batch([text], max_length=max_length, min_length=min_length, num_beams=num_beams)[0]
+
+
+# -------------------------------
+# Batched Summarization
+# -------------------------------
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32)
+
+def summarize_batch(texts, max_length=130, min_length=40, batch_size=8, backend=None, num_beams=4):
+    """
+    Summarize many texts with padded batches, one generate() call per batch.
+    Texts are grouped by length to keep padding small; results keep input order.
+    Pass backend to run on a specific inference backend instead of BART_BACKEND.
+    Fewer num_beams trades some quality for speed (1 = greedy decoding).
+    """
+    active_model = get_model(backend)
+    tokenizer = get_tokenizer()
+    order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+    summaries = [None] * len(texts)
+
+    for start in range(0, len(order), batch_size):
+        indices = order[start:start + batch_size]
+        inputs = tokenizer(
+            [texts[i] for i in indices],
+            return_tensors="pt",
+            max_length=1024,
+            truncation=True,
+            padding=True
+        )
+
+        with metrics.span("bart.generate", num_beams=num_beams):
+            summary_ids = active_model.generate(
+                inputs["input_ids"],
+                attention_mask=inputs["attention_mask"],
+                max_length=max_length,
+                min_length=min_length,
+                length_penalty=2.0,
+                num_beams=num_beams,
+                early_stopping=num_beams > 1
+            )
+        metrics.observe("bart_batch_size", len(indices), buckets=BATCH_SIZE_BUCKETS)
+
+        decoded = tokenizer.batch_decode(
+            summary_ids,
+            skip_special_tokens=True
+        )
+        for i, summary in zip(indices, decoded):
+            summaries[i] = summary
+
+    return summaries
+
+
+# -------------------------------
+# Micro-batching (concurrent callers)
+# -------------------------------
+_batcher = None
+_batcher_lock = threading.Lock()
+
+def get_batcher():
+    """
+    Shared MicroBatcher in front of summarize_batch. Concurrent callers that
+    arrive within BART_BATCH_WAIT_MS are summarized in a single forward pass.
+    """
+    global _batcher
+    with _batcher_lock:
+        if _batcher is None:
+            _batcher = MicroBatcher(
+                summarize_batch,
+                max_batch_size=int(os.environ.get("BART_MAX_BATCH_SIZE", "8")),
+                max_wait_ms=float(os.environ.get("BART_BATCH_WAIT_MS", "10"))
+            )
+        return _batcher
+
+
+def summarize_text_batched(text, max_length=130, min_length=40, sentences=None, num_beams=4):
+    """Drop-in for summarize_text that goes through the shared micro-batcher"""
+    if not fits_in_window(text):
+        return summarize_long_text(text, max_length=max_length, min_length=min_length, sentences=sentences,
+                                   num_beams=num_beams)
+    return get_batcher()(text, max_length=max_length, min_length=min_length, num_beams=num_beams)
+
+
+# -------------------------------
+# Long Documents (chunked map-reduce)
+# -------------------------------
+MAX_INPUT_TOKENS = 1024
+CHUNK_TOKENS = MAX_INPUT_TOKENS - 24  # room for special tokens
+SENTENCE_PATTERN = re.compile(r'[^.!?]+(?:[.!?]+|$)')
+
+def count_tokens(text):
+    return len(get_tokenizer().encode(text, add_special_tokens=False))
+
+
+def fits_in_window(text):
+    # BART averages well over 2 characters per token, so short texts skip tokenization
+    if len(text) < MAX_INPUT_TOKENS * 2:
+        return True
+    return count_tokens(text) <= CHUNK_TOKENS
+
+
+def split_sentences(text):
+    """Lazily yield sentences so long documents are never copied in full"""
+    for match in SENTENCE_PATTERN.finditer(text):
+        sentence = match.group(0).strip()
+        if sentence:
+            yield sentence
+
+
+def _split_oversized(sentence, max_tokens):
+    """Hard-split a single sentence that is longer than the window"""
+    tokenizer = get_tokenizer()
+    ids = tokenizer.encode(sentence, add_special_tokens=False)
+    for start in range(0, len(ids), max_tokens):
+        yield tokenizer.decode(ids[start:start + max_tokens]), min(max_tokens, len(ids) - start)
+
 
-    summary_ids = model.generate(
-        inputs["input_ids"],
-        max_length=max_length,
-        min_length=min_length,
-        length_penalty=2.0,
-        num_beams=4,
-        early_stopping=True
-    )
+def iter_chunks(text, max_tokens=CHUNK_TOKENS, overlap_sentences=1, sentences=None):
+    """
+    Yield overlapping windows of whole sentences that fit under max_tokens.
+    The last overlap_sentences of each window are repeated at the start of the
+    next one so context is not lost at the boundary.
+    """
+    window, window_tokens = [], 0
 
-    summary = tokenizer.decode(
-        summary_ids[0],
-        skip_special_tokens=True
-    )
+    for sentence in (split_sentences(text) if sentences is None else sentences):
+        n_tokens = count_tokens(sentence)
+        pieces = [(sentence, n_tokens)] if n_tokens <= max_tokens else _split_oversized(sentence, max_tokens)
+
+        for piece, piece_tokens in pieces:
+            if window and window_tokens + piece_tokens > max_tokens:
+                yield " ".join(s for s, _ in window)
+                window = window[-overlap_sentences:] if overlap_sentences else []
+                window_tokens = sum(t for _, t in window)
+                # Drop the overlap if it would not leave room for the new sentence
+                while window and window_tokens + piece_tokens > max_tokens:
+                    window_tokens -= window.pop(0)[1]
+            window.append((piece, piece_tokens))
+            window_tokens += piece_tokens
+
+    if window:
+        yield " ".join(s for s, _ in window)
+
+
+def iter_summarize_long(text, max_length=130, min_length=40, batch_size=8, overlap_sentences=1,
+                        sentences=None, num_beams=4):
+    """
+    Map-reduce summarization for documents longer than the model window.
+
+    Chunks are summarized batch_size at a time and yielded as they complete:
+        {"type": "partial", "index": i, "summary": "..."}
+    followed by one reduce step over the chunk summaries:
+        {"type": "final", "summary": "..."}
+
+    Only one batch of chunks is held in memory at a time, so peak memory is
+    bounded by batch_size rather than by document length.
+    """
+    chunks = iter_chunks(text, overlap_sentences=overlap_sentences, sentences=sentences)
+    partials = []
+
+    while True:
+        batch = list(islice(chunks, batch_size))
+        if not batch:
+            break
+        for summary in summarize_batch(batch, max_length=max_length, min_length=min_length, batch_size=batch_size,
+                                       num_beams=num_beams):
+            yield {"type": "partial", "index": len(partials), "summary": summary}
+            partials.append(summary)
+
+    if len(partials) <= 1:
+        final = partials[0] if partials else ""
+    else:
+        # Reduce: the chunk summaries may themselves exceed the window for
+        # very long inputs, in which case they are map-reduced again
+        combined = " ".join(partials)
+        if fits_in_window(combined):
+            final = summarize_batch([combined], max_length=max_length, min_length=min_length,
+                                    num_beams=num_beams)[0]
+        else:
+            final = summarize_long_text(combined, max_length=max_length, min_length=min_length,
+                                        batch_size=batch_size, overlap_sentences=0, num_beams=num_beams)
 
-    return summary
+    yield {"type": "final", "summary": final}
+
+
+def summarize_long_text(text, max_length=130, min_length=40, batch_size=8, overlap_sentences=1,
+                        sentences=None, num_beams=4):
+    final = ""
+    for event in iter_summarize_long(text, max_length, min_length, batch_size, overlap_sentences, sentences,
+                                     num_beams):
+        if event["type"] == "final":
+            final = event["summary"]
+    return final
+
+
+# -------------------------------
+# Streaming (token by token)
+# -------------------------------
+def _stream_generate(text, max_length, min_length, backend=None):
+    """Greedy generate() on a background thread, yielding text as it is decoded"""
+    from transformers import TextIteratorStreamer
+
+    tokenizer = get_tokenizer()
+    active_model = get_model(backend)
+    inputs = tokenizer([text], return_tensors="pt", max_length=1024, truncation=True)
+    streamer = TextIteratorStreamer(tokenizer, skip_special_tokens=True)
+    errors = []
+
+    def generate():
+        try:
+            active_model.generate(
+                inputs["input_ids"],
+                attention_mask=inputs["attention_mask"],
+                max_length=max_length,
+                min_length=min_length,
+                num_beams=1,
+                streamer=streamer
+            )
+        except Exception as e:
+            errors.append(e)
+            streamer.end()
+
+    start = time.perf_counter()
+    thread = threading.Thread(target=generate, daemon=True)
+    thread.start()
+
+    pieces = []
+    for piece in streamer:
+        if piece:
+            if not pieces:
+                metrics.observe("bart_stream_first_token_seconds", time.perf_counter() - start)
+            pieces.append(piece)
+            yield {"type": "delta", "text": piece}
+    thread.join()
+    if errors:
+        raise errors[0]
+
+    yield {"type": "final", "summary": "".join(pieces).strip()}
+
+
+def iter_summarize_stream(text, max_length=130, min_length=40, batch_size=8, backend=None, sentences=None):
+    """
+    Yield the summary while it is being generated:
+        {"type": "delta", "text": "..."}       newly decoded text, in order
+        {"type": "partial", "index": i, ...}   chunk summaries (long documents only)
+        {"type": "final", "summary": "..."}
+
+    Streaming decodes greedily (num_beams=1): beam search only knows its best
+    sequence once generation ends. Long documents summarize their chunks in
+    batches first and stream the reduce step.
+    """
+    if fits_in_window(text):
+        yield from _stream_generate(text, max_length, min_length, backend)
+        return
+
+    chunks = iter_chunks(text, sentences=sentences)
+    partials = []
+    while True:
+        batch = list(islice(chunks, batch_size))
+        if not batch:
+            break
+        for summary in summarize_batch(batch, max_length=max_length, min_length=min_length,
+                                       batch_size=batch_size, backend=backend, num_beams=1):
+            yield {"type": "partial", "index": len(partials), "summary": summary}
+            partials.append(summary)
+
+    combined = " ".join(partials)
+    if len(partials) <= 1:
+        yield {"type": "final", "summary": combined}
+    elif fits_in_window(combined):
+        yield from _stream_generate(combined, max_length, min_length, backend)
+    else:
+        yield {"type": "final", "summary": summarize_long_text(
+            combined, max_length=max_length, min_length=min_length, batch_size=batch_size,
+            overlap_sentences=0, num_beams=1
+        )}
 
 
 # -------------------------------
 # API Mode (for backend integration)
 # -------------------------------
+# --stream prints one JSON event per line (see iter_summarize_stream)
 if __name__ == "__main__":
     # Read from stdin
     input_text = sys.stdin.read().strip()
     
-    if input_text:
+    if input_text and "--stream" in sys.argv[1:]:
+        for event in iter_summarize_stream(input_text):
+            print(json.dumps(event), flush=True)
+    elif input_text:
         result = summarize_text(input_text)
         print(result)
     else:
@@ -0,0 +1,95 @@
+"""
+Cold-start guard: import time of the dyslexia and backend utility modules.
+
+Each module is imported in a fresh interpreter with `python -X importtime`.
+A module fails the check when its cumulative import time exceeds --max-ms
+(best of --repeat runs) or when importing it pulls in a heavy ML library
+(torch, transformers, sentence_transformers, whisper, ...). Those must only
+be loaded on first use, behind accessor functions.
+
+Usage:
+    python bench_import_time.py [--max-ms 500] [--repeat 3] [--modules a,b]
+"""
+
+import sys
+import os
+import argparse
+import subprocess
+
+MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+SERVER_DIR = os.path.abspath(os.path.join(MODULE_DIR, '../../backend/server'))
+
+# module -> working directory it is imported from
+MODULES = {
+    "bart_summarization": MODULE_DIR,
+    "keyword_extraction_minilm": MODULE_DIR,
+    "text_simplification_advanced": MODULE_DIR,
+    "main_pipeline": MODULE_DIR,
+    "utils.ocr": SERVER_DIR,
+    "utils.summarizer": SERVER_DIR,
+    "utils.simplify": SERVER_DIR,
+    "utils.stt": SERVER_DIR,
+}
+
+HEAVY_MODULES = (
+    "torch", "transformers", "sentence_transformers", "whisper", "faster_whisper",
+    "sklearn", "optimum", "onnxruntime", "nltk", "cv2", "pytesseract",
+)
+
+
+def import_profile(module, cwd):
+    """Return (cumulative_us, imported module names) for `import module`"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=cwd, capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+
+    cumulative = None
+    imported = set()
+    for line in proc.stderr.splitlines():
+        # "import time:   self [us] |  cumulative | imported package"
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, total, name = line[len("import time:"):].split("|")
+        name = name.strip()
+        if not total.strip().isdigit():
+            continue
+        imported.add(name)
+        if name == module:
+            cumulative = int(total)
+    return cumulative, imported
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--max-ms", type=float, default=500.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--modules", help="comma-separated subset of modules to check")
+    args = parser.parse_args()
+
+    names = [m.strip() for m in args.modules.split(",")] if args.modules else list(MODULES)
+
+    print(f"{'Module':<32} {'Import (ms)':>12}  Heavy imports")
+    print("-" * 70)
+    failed = False
+    for name in names:
+        try:
+            runs = [import_profile(name, MODULES.get(name, MODULE_DIR)) for _ in range(args.repeat)]
+        except RuntimeError as e:
+            print(f"{name:<32} {'ERROR':>12}  {e}")
+            failed = True
+            continue
+
+        best_ms = min(total for total, _ in runs) / 1000
+        heavy = sorted(h for h in HEAVY_MODULES if h in runs[0][1])
+        if best_ms > args.max_ms or heavy:
+            failed = True
+        print(f"{name:<32} {best_ms:>12.1f}  {', '.join(heavy) or '-'}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,55 @@
+"""
+Per-call construction cost of the text simplifier.
+
+Compares rebuilding the static lexicons (what every AccurateTextSimplifier()
+used to do, on top of reloading the JSON cache) with constructing a simplifier
+against the shared lexicon and with fetching the shared instance.
+
+Usage:
+    python bench_simplifier_construction.py [--calls 2000]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+os.environ.setdefault("SIMPLIFIER_ONLINE_FALLBACK", "0")
+os.environ.setdefault("SIMPLIFIER_CACHE_PATH", os.path.join(tempfile.mkdtemp(), "word_cache.sqlite3"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import text_simplification_advanced as tsa
+
+
+def per_call_us(fn, calls):
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=2000)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    tsa.AccurateTextSimplifier()
+    cold_us = (time.perf_counter() - start) * 1e6
+
+    rows = [
+        ("first construction (cold)", cold_us),
+        ("rebuild lexicons (old per-call cost)", per_call_us(tsa._build_lexicon, args.calls)),
+        ("AccurateTextSimplifier() (shared lexicon)", per_call_us(tsa.AccurateTextSimplifier, args.calls)),
+        ("get_simplifier()", per_call_us(tsa.get_simplifier, args.calls)),
+    ]
+
+    print(f"{'Operation':<45} {'us/call':>10}")
+    print("-" * 56)
+    for name, us in rows:
+        print(f"{name:<45} {us:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Scaling benchmark for AccurateTextSimplifier.simplify_words.
+
+Runs offline (SIMPLIFIER_ONLINE_FALLBACK=0) on synthetic texts of growing size
+and compares the single-pass matcher with the previous per-word regex rescan.
+Time per input word should stay roughly flat for the single-pass engine.
+
+Usage:
+    python bench_simplify_words.py [--sizes 1000,10000,100000] [--skip-legacy]
+"""
+
+import os
+import re
+import sys
+import time
+import random
+import argparse
+import tempfile
+
+os.environ.setdefault("SIMPLIFIER_ONLINE_FALLBACK", "0")
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from text_simplification_advanced import AccurateTextSimplifier
+
+FILLER = ("the students read a short chapter about plants and water before class "
+          "then the teacher asked them to write what they learned").split()
+
+
+def make_text(simplifier, n_words, seed=0):
+    """Mix of filler, dictionary words and multi-word phrases"""
+    rng = random.Random(seed)
+    vocabulary = list(simplifier.verified_replacements)
+    words = []
+    while len(words) < n_words:
+        if rng.random() < 0.15:
+            words.extend(rng.choice(vocabulary).split())
+        else:
+            words.append(rng.choice(FILLER))
+        if rng.random() < 0.08:
+            words[-1] += "."
+    return " ".join(words)
+
+
+def legacy_simplify_words(simplifier, text):
+    """The previous implementation: one regex compile and full rescan per word"""
+    words = re.findall(r'\b\w+\b', text)
+    replacements = {}
+    for word in set(words):
+        simpler = simplifier.find_best_synonym(word)
+        if simpler.lower() != word.lower():
+            replacements[word] = simpler
+
+    result = text
+    for original, simpler in replacements.items():
+        pattern = re.compile(r'\b' + re.escape(original) + r'\b', re.IGNORECASE)
+        result = pattern.sub(
+            lambda m: simpler.capitalize() if m.group(0)[0].isupper() else simpler, result
+        )
+    return result
+
+
+def time_call(fn, text, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,10000,100000")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--skip-legacy", action="store_true")
+    args = parser.parse_args()
+
+    # Keep the benchmark from reading or writing a real word cache
+    os.chdir(tempfile.mkdtemp())
+
+    simplifier = AccurateTextSimplifier()
+    sizes = [int(s) for s in args.sizes.split(",")]
+
+    print(f"{'Words':>10} {'Single-pass (s)':>16} {'us/word':>9} {'Legacy (s)':>12} {'us/word':>9}")
+    print("-" * 60)
+    for n_words in sizes:
+        text = make_text(simplifier, n_words)
+        # Warm the cache so both engines measure replacement, not lookup
+        simplifier.simplify_words(text)
+
+        new = time_call(simplifier.simplify_words, text, args.repeat)
+        line = f"{n_words:>10} {new:>16.4f} {new / n_words * 1e6:>9.2f}"
+        if not args.skip_legacy:
+            old = time_call(lambda t: legacy_simplify_words(simplifier, t), text, args.repeat)
+            line += f" {old:>12.4f} {old / n_words * 1e6:>9.2f}"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Parity check and benchmark for the BART summarization backends.
+
+Each backend runs in its own subprocess (BART_BACKEND=<name>) so that peak RSS
+is measured per backend rather than accumulated. Outputs are compared against
+the fp32 PyTorch reference.
+
+Usage:
+    python bench_summarization_backends.py [--backends torch,int8,onnx]
+                                           [--repeat 3] [--min-similarity 0.8]
+"""
+
+import sys
+import os
+import json
+import time
+import argparse
+import subprocess
+from difflib import SequenceMatcher
+
+from metrics import peak_rss_mb
+
+SAMPLE_TEXTS = [
+    "Photosynthesis is the process by which green plants and some other organisms use "
+    "sunlight to synthesize foods from carbon dioxide and water. Photosynthesis in plants "
+    "generally involves the green pigment chlorophyll and generates oxygen as a byproduct. "
+    "The process takes place mainly in the leaves, inside small structures called "
+    "chloroplasts. The glucose produced is used by the plant for energy and growth, and "
+    "the oxygen released into the air is essential for most living things on Earth.",
+
+    "The water cycle describes how water evaporates from the surface of the earth, rises "
+    "into the atmosphere, cools and condenses into clouds, and falls again to the surface "
+    "as precipitation. The water falling on land collects in rivers and lakes, soil, and "
+    "porous layers of rock, and much of it flows back into the oceans, where it will once "
+    "more evaporate. The cycling of water in and out of the atmosphere is a significant "
+    "aspect of the weather patterns on Earth.",
+
+    "Fractions represent parts of a whole. The top number, called the numerator, tells how "
+    "many parts are being considered, while the bottom number, called the denominator, "
+    "tells how many equal parts the whole is divided into. Fractions with the same "
+    "denominator can be added by adding their numerators. To add fractions with different "
+    "denominators, students first find a common denominator and rewrite each fraction "
+    "before adding. Visual models such as fraction bars and circles help learners see why "
+    "these rules work.",
+]
+
+
+def run_backend(repeat):
+    """Child mode: benchmark the backend selected by BART_BACKEND"""
+    import bart_summarization
+    load_start = time.perf_counter()
+    bart_summarization.get_tokenizer()
+    bart_summarization.get_model()
+    load_seconds = time.perf_counter() - load_start
+
+    # Warm-up so one-off allocation costs are not counted
+    bart_summarization.summarize_batch(SAMPLE_TEXTS[:1])
+
+    summaries = []
+    start = time.perf_counter()
+    for _ in range(repeat):
+        summaries = bart_summarization.summarize_batch(SAMPLE_TEXTS)
+    elapsed = time.perf_counter() - start
+
+    generated_tokens = sum(
+        len(bart_summarization.get_tokenizer().encode(s, add_special_tokens=False)) for s in summaries
+    ) * repeat
+
+    return {
+        "backend": bart_summarization.BACKEND,
+        "load_seconds": round(load_seconds, 2),
+        "seconds": round(elapsed, 3),
+        "tokens_per_sec": round(generated_tokens / elapsed, 2) if elapsed else None,
+        "peak_rss_mb": peak_rss_mb(),
+        "summaries": summaries,
+    }
+
+
+def benchmark(backend, repeat):
+    env = dict(os.environ, BART_BACKEND=backend)
+    proc = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", "--repeat", str(repeat)],
+        env=env, capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__))
+    )
+    if proc.returncode != 0:
+        return {"backend": backend, "error": proc.stderr.strip().splitlines()[-1:] or ["failed"]}
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", default="torch,int8,onnx")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--min-similarity", type=float, default=0.8,
+                        help="minimum mean similarity to the fp32 output for a backend to pass")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_backend(args.repeat)))
+        return 0
+
+    backends = [b.strip() for b in args.backends.split(",") if b.strip()]
+    if "torch" not in backends:
+        backends.insert(0, "torch")  # fp32 reference for the parity check
+
+    results = {b: benchmark(b, args.repeat) for b in backends}
+    reference = results["torch"].get("summaries")
+
+    print(f"{'Backend':<10} {'Load (s)':>10} {'Tokens/s':>10} {'Peak RSS MB':>12} {'Parity':>8}")
+    print("-" * 54)
+    failed = False
+    for backend, result in results.items():
+        if "error" in result:
+            print(f"{backend:<10} ERROR: {result['error'][0]}")
+            failed = True
+            continue
+
+        parity = None
+        if reference:
+            parity = sum(
+                SequenceMatcher(None, ref, out).ratio() for ref, out in zip(reference, result["summaries"])
+            ) / len(reference)
+            if parity < args.min_similarity:
+                failed = True
+
+        rss = f"{result['peak_rss_mb']:.0f}" if result["peak_rss_mb"] else "n/a"
+        similarity = f"{parity:.3f}" if parity is not None else "n/a"
+        print(f"{backend:<10} {result['load_seconds']:>10} {result['tokens_per_sec']:>10} "
+              f"{rss:>12} {similarity:>8}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
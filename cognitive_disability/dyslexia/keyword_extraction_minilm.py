@@ -1,54 +1,201 @@
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
-import nltk
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
+import threading
 
-# Download NLTK resources (run once)
-nltk.download('punkt', quiet=True)
-nltk.download('punkt_tab', quiet=True)
-nltk.download('stopwords', quiet=True)
+import metrics
 
-# Load MiniLM model
-model = SentenceTransformer("all-MiniLM-L6-v2")
+# -------------------------------
+# Lazy Resources
+# -------------------------------
+# Importing this module is cheap: the MiniLM model is loaded and NLTK data is
+# checked on first use, and data is only downloaded when it is actually missing.
+MODEL_NAME = "all-MiniLM-L6-v2"
+
+# nltk.data resource path -> downloader package
+NLTK_RESOURCES = {
+    "tokenizers/punkt": "punkt",
+    "tokenizers/punkt_tab": "punkt_tab",
+    "corpora/stopwords": "stopwords",
+}
+
+_model = None
+_nltk_ready = False
+_load_lock = threading.Lock()
+
+def ensure_nltk_data():
+    """Make sure the NLTK data we need is installed (downloads at most once)"""
+    global _nltk_ready
+    if _nltk_ready:
+        return
+    with _load_lock:
+        if _nltk_ready:
+            return
+        import nltk
+        for resource, package in NLTK_RESOURCES.items():
+            try:
+                nltk.data.find(resource)
+            except LookupError:
+                nltk.download(package, quiet=True)
+        _nltk_ready = True
+
+
+def get_model():
+    """Load MiniLM once, on first use"""
+    global _model
+    if _model is None:
+        with _load_lock:
+            if _model is None:
+                with metrics.span("keywords.model_load"):
+                    from sentence_transformers import SentenceTransformer
+                    _model = SentenceTransformer(MODEL_NAME)
+    return _model
 
 # -------------------------------
 # Preprocessing
 # -------------------------------
+_stop_words = None
+
+def get_stop_words():
+    """English stopwords, loaded once"""
+    global _stop_words
+    if _stop_words is None:
+        ensure_nltk_data()
+        from nltk.corpus import stopwords
+        _stop_words = frozenset(stopwords.words("english"))
+    return _stop_words
+
+
+def tokenize(text):
+    ensure_nltk_data()
+    from nltk.tokenize import word_tokenize
+    return word_tokenize(text.lower())
+
+
 def preprocess_text(text):
-    tokens = word_tokenize(text.lower())
-    stop_words = set(stopwords.words("english"))
+    stop_words = get_stop_words()
     words = [
-        word for word in tokens
+        word for word in tokenize(text)
         if word.isalpha() and word not in stop_words
     ]
     return list(set(words))  # unique candidates
 
 
+def ngram_candidates(tokens, ngram_range=(1, 1)):
+    """
+    Unique n-grams of alphabetic tokens, in first-seen order. Punctuation and
+    numbers break phrases, and a phrase may not start or end with a stopword
+    ("photosynthesis process" yes, "the process" no).
+    """
+    stop_words = get_stop_words()
+    low, high = ngram_range
+    candidates = {}
+
+    run = []
+    for token in tokens + [""]:
+        if token.isalpha():
+            run.append(token)
+            continue
+        for n in range(low, high + 1):
+            for i in range(len(run) - n + 1):
+                gram = run[i:i + n]
+                if gram[0] not in stop_words and gram[-1] not in stop_words:
+                    candidates.setdefault(" ".join(gram), None)
+        run = []
+    return list(candidates)
+
+
 # -------------------------------
-# Keyword Extraction
+# Ranking
 # -------------------------------
-def extract_keywords(text, top_n=5):
-    candidates = preprocess_text(text)
-
-    if not candidates:
-        return []
+def mmr(doc_embedding, candidate_embeddings, top_n, diversity):
+    """
+    Maximal Marginal Relevance over unit-length embeddings: each pick trades
+    relevance to the document against similarity to what was already picked.
+    diversity=0 is plain relevance ranking. Returns candidate indices.
+    """
+    import numpy as np
+
+    relevance = candidate_embeddings @ doc_embedding
+    top_n = min(top_n, len(relevance))
+    if diversity <= 0:
+        return list(np.argsort(-relevance, kind="stable")[:top_n])
+
+    pairwise = candidate_embeddings @ candidate_embeddings.T
+    selected = [int(np.argmax(relevance))]
+    redundancy = pairwise[selected[0]].copy()
+    available = np.ones(len(relevance), dtype=bool)
+    available[selected[0]] = False
+
+    while len(selected) < top_n:
+        scores = (1 - diversity) * relevance - diversity * redundancy
+        scores[~available] = -np.inf
+        best = int(np.argmax(scores))
+        selected.append(best)
+        available[best] = False
+        np.maximum(redundancy, pairwise[best], out=redundancy)
+    return selected
 
-    text_embedding = model.encode([text])
-    candidate_embeddings = model.encode(candidates)
 
-    similarities = cosine_similarity(
-        text_embedding,
-        candidate_embeddings
-    )[0]
+# -------------------------------
+# Keyword Extraction
+# -------------------------------
+def extract_keywords_batch(texts, top_n=5, ngram_range=(1, 2), diversity=0.5, max_candidates=None,
+                           tokens=None):
+    """
+    Keywords for many documents in one pass.
+
+    Candidates from all documents are deduplicated and embedded together
+    (dictionary words from the precomputed table, everything else in a single
+    batched model.encode call); documents are encoded in one call as well.
+    Each document's candidates are then ranked with MMR. Only the
+    max_candidates (default: 20 x top_n) most relevant candidates of a
+    document enter MMR. tokens may pass precomputed tokenize() output per
+    text. Returns one keyword list per text, in order.
+    """
+    import numpy as np
+    from vocab_embeddings import embed_words
+
+    with metrics.span("keywords.candidates"):
+        if tokens is None:
+            tokens = [tokenize(text) if text.strip() else [] for text in texts]
+        per_doc = [ngram_candidates(doc_tokens, ngram_range) for doc_tokens in tokens]
+
+    vocabulary = {}
+    for candidates in per_doc:
+        for candidate in candidates:
+            vocabulary.setdefault(candidate, len(vocabulary))
+    if not vocabulary:
+        return [[] for _ in texts]
+
+    model = get_model()
+    words = list(vocabulary)
+    # Unigrams come from the table; phrases and OOV words share one encode call
+    with metrics.span("keywords.embed_candidates"):
+        candidate_embeddings = embed_words(words, model.encode, MODEL_NAME)
+    with_candidates = [i for i, candidates in enumerate(per_doc) if candidates]
+    with metrics.span("keywords.embed_documents"):
+        doc_embeddings = dict(zip(with_candidates, np.asarray(
+            model.encode([texts[i] for i in with_candidates], normalize_embeddings=True), dtype=np.float32
+        )))
+
+    max_candidates = max_candidates or 20 * top_n
+    results = []
+    with metrics.span("keywords.rank"):
+        for i, candidates in enumerate(per_doc):
+            if not candidates:
+                results.append([])
+                continue
+            doc_embedding = doc_embeddings[i]
+            rows = candidate_embeddings[[vocabulary[c] for c in candidates]]
+            if len(candidates) > max_candidates:
+                keep = np.argsort(-(rows @ doc_embedding), kind="stable")[:max_candidates]
+                candidates = [candidates[i] for i in keep]
+                rows = rows[keep]
+            results.append([candidates[i] for i in mmr(doc_embedding, rows, top_n, diversity)])
+    return results
 
-    ranked_keywords = sorted(
-        zip(candidates, similarities),
-        key=lambda x: x[1],
-        reverse=True
-    )
 
-    return [word for word, score in ranked_keywords[:top_n]]
+def extract_keywords(text, top_n=5):
+    # Single words ranked purely by similarity to the text
+    return extract_keywords_batch([text], top_n=top_n, ngram_range=(1, 1), diversity=0)[0]
 
 
 # -------------------------------
@@ -1,7 +1,82 @@
-from keyword_extraction_minilm import get_keywords
-from bart_summarization import summarize_text
+import os
+import sys
+import threading
+
+from pipeline import Pipeline
+from keyword_extraction_minilm import tokenize, extract_keywords_batch
+from bart_summarization import split_sentences
 from text_simplification_advanced import simplify_text
 
+# The summary stage goes through the backend's summarizer (engine routing,
+# result cache, extractive fallback) rather than calling BART directly
+SERVER_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "../../backend/server"))
+if SERVER_DIR not in sys.path:
+    sys.path.append(SERVER_DIR)
+
+from utils import summarizer
+
+# -------------------------------
+# Study Aid Pipeline
+# -------------------------------
+#   tokens ──> keywords
+#   sentences ──> summary ──> simplified
+#
+# Keywords and the summary are independent and run concurrently; the shared
+# tokens and sentence splits are computed once per run.
+
+def _summarize(ctx):
+    result = summarizer.summarize_text(ctx["text"], sentences=ctx["sentences"])
+    if "summary" not in result:
+        raise RuntimeError(f"Summarization failed: {result.get('error', 'no summary')}")
+    return result["summary"]
+
+
+def build_study_aid_pipeline():
+    pipeline = Pipeline()
+    pipeline.add("tokens", lambda ctx: tokenize(ctx["text"]))
+    pipeline.add("sentences", lambda ctx: list(split_sentences(ctx["text"])))
+    pipeline.add(
+        "keywords",
+        lambda ctx: extract_keywords_batch(
+            [ctx["text"]], top_n=ctx.get("top_n", 6), ngram_range=(1, 1), diversity=0,
+            tokens=[ctx["tokens"]]
+        )[0],
+        deps=["tokens"]
+    )
+    pipeline.add("summary", _summarize, deps=["sentences"])
+    pipeline.add("simplified", lambda ctx: simplify_text(ctx["summary"]), deps=["summary"])
+    return pipeline
+
+
+_pipeline = None
+_pipeline_lock = threading.Lock()
+
+def get_study_aid_pipeline():
+    global _pipeline
+    with _pipeline_lock:
+        if _pipeline is None:
+            _pipeline = build_study_aid_pipeline()
+        return _pipeline
+
+
+def study_aid(text, top_n=6):
+    """
+    Keywords, summary and simplified summary for one text:
+        {"keywords": [...], "summary": "...", "simplified": "...",
+         "timings": {stage: seconds}, "total_seconds": ...}
+    """
+    result = get_study_aid_pipeline().run({"text": text, "top_n": top_n},
+                                          targets=["keywords", "simplified"])
+    report = result.to_dict()
+    return {
+        "keywords": result["keywords"],
+        "summary": result["summary"],
+        "simplified": result["simplified"],
+        "timings": report["timings"],
+        "total_seconds": report["total_seconds"],
+    }
+
+
 if __name__ == "__main__":
     print("🔹 Enter text (press Enter twice to finish):")
 
@@ -14,20 +89,17 @@ if __name__ == "__main__":
 
     user_text = " ".join(lines)
 
-    # 1️⃣ Keyword Extraction
-    keywords = get_keywords(user_text, top_n=6)
-
-    # 2️⃣ Summarization
-    summary = summarize_text(user_text)
-
-    # 3️⃣ Text Simplification
-    simplified_text = simplify_text(summary)
+    # 1️⃣ Keyword Extraction + 2️⃣ Summarization (concurrently) → 3️⃣ Text Simplification
+    aid = study_aid(user_text, top_n=6)
 
     print("\n🔑 Keywords:")
-    print(keywords)
+    print(aid["keywords"])
 
     print("\n📝 Summary:")
-    print(summary)
+    print(aid["summary"])
 
     print("\n📘 Simplified Text:")
-    print(simplified_text)
+    print(aid["simplified"])
+
+    print("\n⏱️ Stage timings (s):")
+    print(aid["timings"], "total:", aid["total_seconds"])
@@ -0,0 +1,290 @@
+import os
+import sys
+import time
+import threading
+from bisect import bisect_left
+from functools import wraps
+
+# --------------------------------------------------
+# IN-PROCESS METRICS
+# --------------------------------------------------
+# Span timers, counters, gauges and histograms for the Python services, kept
+# in one registry per process and exported as Prometheus text or JSON (the
+# inference worker serves both through its "metrics" op).
+#
+#     with span("stt.decode"):                 # stage_duration_seconds{stage="stt.decode"}
+#         audio = decode(path)
+#
+#     @timed("keywords.rank")                  # same, as a decorator
+#     def rank(...): ...
+#
+#     inc("datamuse_requests_total", status="ok")
+#     observe("ocr_page_pixels", w * h, buckets=PIXEL_BUCKETS)
+#
+# Spans finished on a thread inside trace() are also collected per request,
+# so one slow call can be broken down stage by stage.
+#
+# METRICS=0 disables everything: span() returns a shared no-op context
+# manager and inc/observe return immediately, so instrumented code costs a
+# function call and a flag check.
+
+ENABLED = os.environ.get("METRICS", "1") != "0"
+PREFIX = os.environ.get("METRICS_PREFIX", "aclc_")
+
+# Seconds: sub-millisecond cache lookups up to multi-minute transcriptions
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+
+def set_enabled(enabled):
+    global ENABLED
+    ENABLED = bool(enabled)
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "count", "sum")
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot: above every bucket
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-th observation"""
+        if not self.count:
+            return None
+        rank, seen = q * self.count, 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = {}
+        self.gauges = {}
+        self.histograms = {}
+
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted((k, str(v)) for k, v in labels.items())) if labels else ()
+
+    def inc(self, name, value=1, labels=None):
+        key = self._key(name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def set_gauge(self, name, value, labels=None):
+        key = self._key(name, labels)
+        with self._lock:
+            self.gauges[key] = value
+
+    def observe(self, name, value, labels=None, buckets=DEFAULT_BUCKETS):
+        key = self._key(name, labels)
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    def reset(self):
+        with self._lock:
+            self.counters.clear()
+            self.gauges.clear()
+            self.histograms.clear()
+
+    # ---------- Export ----------
+
+    def snapshot(self):
+        """JSON-friendly copy: counters and gauges by name, histograms with p50/p95"""
+        def label_text(labels):
+            return ",".join(f"{k}={v}" for k, v in labels)
+
+        with self._lock:
+            result = {"counters": {}, "gauges": {}, "histograms": {}}
+            for (name, labels), value in sorted(self.counters.items()):
+                result["counters"].setdefault(name, {})[label_text(labels)] = value
+            for (name, labels), value in sorted(self.gauges.items()):
+                result["gauges"].setdefault(name, {})[label_text(labels)] = value
+            for (name, labels), h in sorted(self.histograms.items()):
+                result["histograms"].setdefault(name, {})[label_text(labels)] = {
+                    "count": h.count,
+                    "sum": round(h.sum, 6),
+                    "p50": h.quantile(0.5),
+                    "p95": h.quantile(0.95),
+                }
+            return result
+
+    def render_prometheus(self, const_labels=None):
+        """Prometheus text exposition format (version 0.0.4)"""
+        const = tuple(sorted((const_labels or {}).items()))
+        lines = []
+
+        def fmt(name, labels, value, extra=()):
+            pairs = const + labels + tuple(extra)
+            label_str = "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}" if pairs else ""
+            lines.append(f"{PREFIX}{name}{label_str} {_number(value)}")
+
+        with self._lock:
+            for kind, series in (("counter", self.counters), ("gauge", self.gauges)):
+                for name in sorted({name for name, _ in series}):
+                    lines.append(f"# TYPE {PREFIX}{name} {kind}")
+                    for (n, labels), value in sorted(series.items()):
+                        if n == name:
+                            fmt(name, labels, value)
+
+            for name in sorted({name for name, _ in self.histograms}):
+                lines.append(f"# TYPE {PREFIX}{name} histogram")
+                for (n, labels), h in sorted(self.histograms.items()):
+                    if n != name:
+                        continue
+                    cumulative = 0
+                    for bound, count in zip(h.buckets, h.counts):
+                        cumulative += count
+                        fmt(f"{name}_bucket", labels, cumulative, [("le", _number(bound))])
+                    fmt(f"{name}_bucket", labels, h.count, [("le", "+Inf")])
+                    fmt(f"{name}_sum", labels, h.sum)
+                    fmt(f"{name}_count", labels, h.count)
+
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value):
+    if isinstance(value, float):
+        return repr(round(value, 9)) if value != float("inf") else "+Inf"
+    return str(value)
+
+
+registry = Registry()
+
+
+# --------------------------------------------------
+# RECORDING API
+# --------------------------------------------------
+
+def inc(name, value=1, **labels):
+    if ENABLED:
+        registry.inc(name, value, labels)
+
+
+def set_gauge(name, value, **labels):
+    if ENABLED:
+        registry.set_gauge(name, value, labels)
+
+
+def observe(name, value, buckets=DEFAULT_BUCKETS, **labels):
+    if ENABLED:
+        registry.observe(name, value, labels, buckets)
+
+
+_local = threading.local()
+
+
+class _Span:
+    __slots__ = ("stage", "labels", "start")
+
+    def __init__(self, stage, labels):
+        self.stage = stage
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self.start
+        registry.observe("stage_duration_seconds", elapsed, dict(self.labels, stage=self.stage))
+        if exc_type is not None:
+            registry.inc("stage_errors_total", 1, {"stage": self.stage})
+        spans = getattr(_local, "spans", None)
+        if spans is not None:
+            spans.append({"stage": self.stage, "seconds": round(elapsed, 6), **self.labels})
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(stage, **labels):
+    """Time a block as one stage (stage_duration_seconds{stage=...})"""
+    return _Span(stage, labels) if ENABLED else _NULL_SPAN
+
+
+def timed(stage, **labels):
+    """Decorator form of span()"""
+    def decorate(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not ENABLED:
+                return fn(*args, **kwargs)
+            with _Span(stage, labels):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+class trace:
+    """
+    Collect the spans finished on this thread while the block runs:
+        with trace() as spans:
+            handle(request)
+        spans  # [{"stage": "stt.decode", "seconds": 0.41}, ...]
+    Spans on other threads (page or segment pools) only reach the histograms.
+    """
+
+    def __enter__(self):
+        self.previous = getattr(_local, "spans", None)
+        self.spans = []
+        _local.spans = self.spans if ENABLED else None
+        return self.spans
+
+    def __exit__(self, exc_type, exc, tb):
+        _local.spans = self.previous
+        if self.previous is not None:
+            self.previous.extend(self.spans)
+        return False
+
+
+def snapshot():
+    return registry.snapshot()
+
+
+def peak_rss_mb():
+    """Peak resident memory of this process in MB, or None if unavailable"""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # kilobytes on Linux, bytes on macOS
+        return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+    except ImportError:
+        try:
+            import psutil
+            return round(psutil.Process().memory_info().peak_wset / (1024 * 1024), 1)
+        except (ImportError, AttributeError):
+            return None
+
+
+def render_prometheus(const_labels=None):
+    return registry.render_prometheus(const_labels)
@@ -0,0 +1,94 @@
+import threading
+import time
+from concurrent.futures import Future
+
+# --------------------------------------------------
+# DYNAMIC MICRO-BATCHER
+# --------------------------------------------------
+# Collects concurrent single-item requests for a few milliseconds and hands
+# them to a batch function in one call. Requests with different options
+# (e.g. max_length) are batched separately.
+#
+# If the batcher thread is ever killed (KeyboardInterrupt or SystemExit out of
+# batch_fn), queued requests fail and later ones run unbatched on the
+# caller's thread instead of waiting forever.
+
+class MicroBatcher:
+    def __init__(self, batch_fn, max_batch_size=8, max_wait_ms=10):
+        """
+        batch_fn(items, **options) must return one result per item, in order.
+        """
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+
+        self._queue = []
+        self._alive = True
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, item, **options):
+        """Queue one item and return a Future for its result"""
+        future = Future()
+        with self._cond:
+            if self._alive:
+                self._queue.append((item, options, future))
+                self._cond.notify()
+                return future
+
+        try:
+            future.set_result(self.batch_fn([item], **options)[0])
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def __call__(self, item, **options):
+        """Blocking convenience wrapper around submit()"""
+        return self.submit(item, **options).result()
+
+    def _next_batch(self):
+        with self._cond:
+            while not self._queue:
+                self._cond.wait()
+
+            # Wait briefly for more requests to arrive, unless the batch is full
+            deadline = time.monotonic() + self.max_wait
+            while len(self._queue) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+
+            # Take the oldest request plus every queued request with the same options
+            options = self._queue[0][1]
+            batch, rest = [], []
+            for entry in self._queue:
+                if entry[1] == options and len(batch) < self.max_batch_size:
+                    batch.append(entry)
+                else:
+                    rest.append(entry)
+            self._queue = rest
+            return batch, options
+
+    def _run(self):
+        try:
+            while True:
+                batch, options = self._next_batch()
+                items = [item for item, _, _ in batch]
+                try:
+                    results = self.batch_fn(items, **options)
+                    for (_, _, future), result in zip(batch, results):
+                        future.set_result(result)
+                except BaseException as e:
+                    for _, _, future in batch:
+                        future.set_exception(e)
+                    if not isinstance(e, Exception):
+                        raise
+        finally:
+            # Only reached when the thread dies: nothing will serve the queue
+            with self._cond:
+                self._alive = False
+                queued, self._queue = self._queue, []
+            for _, _, future in queued:
+                future.set_exception(RuntimeError("MicroBatcher thread stopped"))
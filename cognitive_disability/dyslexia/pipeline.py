@@ -0,0 +1,172 @@
+import os
+import time
+import threading
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+# --------------------------------------------------
+# PIPELINE ENGINE
+# --------------------------------------------------
+# A pipeline is a DAG of named stages. Each stage declares the stages it
+# depends on and is started as soon as all of them have finished, so
+# independent stages (keywords and summary, say) run at the same time.
+#
+# A stage function receives one dict: the pipeline inputs plus the outputs of
+# its dependencies, keyed by stage name. Cheap shared artifacts (sentence
+# splits, tokens) are just stages of their own that others depend on, so
+# they are computed once per run.
+#
+#     pipeline = Pipeline()
+#     pipeline.add("sentences", lambda ctx: split(ctx["text"]))
+#     pipeline.add("summary", summarize, deps=["sentences"])
+#     result = pipeline.run({"text": text})
+#     result["summary"], result.timings
+#
+# Stages run on a thread pool by default. executor="process" runs a stage in a
+# spawn-based process pool instead; its function and inputs must be picklable.
+
+
+class PipelineError(RuntimeError):
+    def __init__(self, stage, error):
+        super().__init__(f"Stage '{stage}' failed: {error}")
+        self.stage = stage
+        self.error = error
+
+
+class Stage:
+    def __init__(self, name, fn, deps=(), executor="thread"):
+        if executor not in ("thread", "process"):
+            raise ValueError(f"Unknown executor '{executor}' for stage '{name}'")
+        self.name = name
+        self.fn = fn
+        self.deps = tuple(deps)
+        self.executor = executor
+
+
+class PipelineResult:
+    """Stage outputs plus per-stage timings (seconds spent inside each stage)"""
+
+    def __init__(self, outputs, timings, total_seconds):
+        self.outputs = outputs
+        self.timings = timings
+        self.total_seconds = total_seconds
+
+    def __getitem__(self, name):
+        return self.outputs[name]
+
+    def __contains__(self, name):
+        return name in self.outputs
+
+    def to_dict(self):
+        return {
+            "outputs": self.outputs,
+            "timings": {name: round(seconds, 4) for name, seconds in self.timings.items()},
+            "total_seconds": round(self.total_seconds, 4),
+        }
+
+
+def _timed(fn, ctx):
+    # Module level so process-pool stages can pickle it
+    start = time.perf_counter()
+    result = fn(ctx)
+    return result, time.perf_counter() - start
+
+
+class Pipeline:
+    def __init__(self, max_threads=None, max_processes=None):
+        self.stages = {}
+        self.max_threads = max_threads or min(8, (os.cpu_count() or 1) + 2)
+        self.max_processes = max_processes or os.cpu_count() or 1
+        self._pools = {}
+        self._pools_lock = threading.Lock()
+
+    # ---------- Definition ----------
+
+    def add(self, name, fn, deps=(), executor="thread"):
+        if name in self.stages:
+            raise ValueError(f"Stage '{name}' is already defined")
+        missing = [dep for dep in deps if dep not in self.stages]
+        if missing:
+            # Dependencies must be added first, which also rules out cycles
+            raise ValueError(f"Stage '{name}' depends on undefined stages: {missing}")
+        self.stages[name] = Stage(name, fn, deps, executor)
+        return self
+
+    def stage(self, name, deps=(), executor="thread"):
+        """Decorator form of add()"""
+        def register(fn):
+            self.add(name, fn, deps, executor)
+            return fn
+        return register
+
+    # ---------- Execution ----------
+
+    def _pool(self, executor):
+        with self._pools_lock:
+            if executor not in self._pools:
+                if executor == "process":
+                    self._pools[executor] = ProcessPoolExecutor(
+                        max_workers=self.max_processes,
+                        mp_context=multiprocessing.get_context("spawn")
+                    )
+                else:
+                    self._pools[executor] = ThreadPoolExecutor(
+                        max_workers=self.max_threads, thread_name_prefix="pipeline"
+                    )
+            return self._pools[executor]
+
+    def run(self, inputs, targets=None):
+        """
+        Run the stages needed for targets (default: all) and return a
+        PipelineResult. Raises PipelineError for the first stage that fails.
+        """
+        needed = self._needed(targets or list(self.stages))
+        outputs, timings = {}, {}
+        running = {}
+        start = time.perf_counter()
+
+        def ready():
+            return [
+                name for name in needed
+                if name not in outputs and name not in running.values()
+                and all(dep in outputs for dep in self.stages[name].deps)
+            ]
+
+        try:
+            while len(outputs) < len(needed):
+                for name in ready():
+                    stage = self.stages[name]
+                    ctx = dict(inputs)
+                    ctx.update((dep, outputs[dep]) for dep in stage.deps)
+                    running[self._pool(stage.executor).submit(_timed, stage.fn, ctx)] = name
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        outputs[name], timings[name] = future.result()
+                    except Exception as e:
+                        raise PipelineError(name, e) from e
+        finally:
+            for future in running:
+                future.cancel()
+
+        return PipelineResult(outputs, timings, time.perf_counter() - start)
+
+    def _needed(self, targets):
+        needed, stack = [], list(targets)
+        while stack:
+            name = stack.pop()
+            if name not in self.stages:
+                raise ValueError(f"Unknown stage '{name}'")
+            if name not in needed:
+                needed.append(name)
+                stack.extend(self.stages[name].deps)
+        # Keep definition order so ready() submits stages deterministically
+        return [name for name in self.stages if name in needed]
+
+    def shutdown(self):
+        with self._pools_lock:
+            for pool in self._pools.values():
+                pool.shutdown(wait=True)
+            self._pools.clear()
@@ -20,9 +20,8 @@ if __name__ == "__main__":
         sys.stderr = io.StringIO()
         
         try:
-            from text_simplification_advanced import AccurateTextSimplifier
-            simplifier = AccurateTextSimplifier()
-            result = simplifier.simplify(input_text)
+            from text_simplification_advanced import get_simplifier
+            result = get_simplifier().simplify(input_text)
             
             # Restore stdout and print only the result
             sys.stdout = original_stdout
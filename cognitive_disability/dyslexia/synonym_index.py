@@ -0,0 +1,343 @@
+import mmap
+import os
+import hashlib
+import sys
+import argparse
+import threading
+
+# --------------------------------------------------
+# OFFLINE SYNONYM INDEX
+# --------------------------------------------------
+# A prebuilt, sorted TSV file that is memory-mapped and binary-searched, so a
+# lookup costs a handful of page reads and never touches the network.
+#
+# Line format (sorted by word, UTF-8):
+#     word<TAB>complexity<TAB>syn1:complexity,syn2:complexity,...
+#
+# Only words with synonyms that are meaningfully simpler are stored, synonyms
+# sorted simplest first. Words without a line are left to the other lookups.
+#
+# The bundled index is regenerated from WordNet 3.0 with:
+#     python synonym_index.py build [--nltk-data DIR] [--word-list FILE]
+
+DEFAULT_INDEX_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "synonym_index.tsv")
+
+# A synonym must be at least 20% simpler to be considered
+SIMPLER_RATIO = 0.8
+MAX_SYNONYMS = 5
+
+# A dominant sense needs this many sense-tagged uses, and this share of the
+# word's uses, to be trusted (see dominant_sense). Synonyms must be familiar:
+# used at least as often as the word and at least MIN_SYNONYM_USES times.
+MIN_SENSE_USES = 1
+MIN_SENSE_SHARE = 0.5
+MIN_SYNONYM_USES = 3
+
+# Adverb synsets swap meaning too often ("along" -> "on"); keep nouns, verbs
+# and adjectives (including satellites)
+POS_TAGS = frozenset({"n", "v", "a", "s"})
+
+# Two-letter synonyms are mostly clippings ("ma", "ad")
+MIN_SYNONYM_LENGTH = 3
+
+# Never offered as replacements: not suitable for the students this serves
+BLOCKLIST = frozenset({
+    "pimp", "whore", "bitch", "bastard", "damn", "goddamn", "bedamn", "hell", "ass", "arse",
+    "crap", "piss", "shit", "screw", "sod", "tit", "boob", "dick", "cock", "prick", "slut",
+    "hooker", "booze", "drunk", "kill", "murder", "goddam",
+})
+
+# Noun classes (WordNet lexicographer files) that are countable often enough
+# to pluralize; abstract and mass nouns ("zeal", "commerce") are left singular
+COUNTABLE_LEXNAMES = frozenset({
+    "noun.artifact", "noun.person", "noun.animal", "noun.body", "noun.object",
+    "noun.plant", "noun.location", "noun.communication",
+})
+
+# (word, synonym) pairs that share a WordNet sense but read wrong in a
+# student's text; plurals of these are skipped too
+BLOCKED_PAIRS = frozenset({
+    ("nutrient", "food"), ("integrity", "unity"), ("honorable", "honest"), ("populate", "live"),
+    ("manpower", "men"), ("engagement", "battle"), ("determination", "finding"), ("croak", "die"),
+    ("skunk", "bum"), ("goddamned", "darned"), ("pectoral", "pecs"), ("footing", "terms"),
+    ("discovered", "observed"), ("cardinal", "central"), ("incisive", "keen"), ("penetrating", "keen"),
+    ("pathetic", "poor"), ("enthrone", "vest"), ("expletive", "oath"), ("striving", "pains"),
+    ("gyrate", "coil"), ("falsify", "warp"), ("devotee", "buff"), ("foreclose", "prevent"),
+    ("cavity", "pit"), ("topnotch", "super"), ("screech", "creak"), ("endowment", "talent"),
+    ("hapless", "poor"), ("teensy", "wee"), ("puke", "bum"), ("dozens", "lots"), ("scores", "lots"),
+    ("merchandise", "product"), ("pectoralis", "pecs"), ("ferocious", "furious"), ("howling", "howl"),
+    ("signaling", "signal"), ("swearing", "oath"),
+})
+
+
+def count_syllables(word):
+    """Count syllables in a word"""
+    word = word.lower()
+    count = 0
+    vowels = 'aeiouy'
+    previous_was_vowel = False
+
+    for char in word:
+        is_vowel = char in vowels
+        if is_vowel and not previous_was_vowel:
+            count += 1
+        previous_was_vowel = is_vowel
+
+    if word.endswith('e'):
+        count -= 1
+
+    return max(1, count)
+
+
+def word_complexity(word):
+    """Calculate complexity score (higher = more complex)"""
+    return count_syllables(word) * 2 + len(word)
+
+
+def simpler_synonyms(word, synonyms):
+    """Return (synonym, complexity) pairs that are simpler than word, simplest first"""
+    limit = word_complexity(word) * SIMPLER_RATIO
+    scored = {}
+    for syn in synonyms:
+        if syn != word and syn not in scored:
+            complexity = word_complexity(syn)
+            if complexity < limit:
+                scored[syn] = complexity
+    return sorted(scored.items(), key=lambda item: (item[1], item[0]))
+
+
+class SynonymIndex:
+    def __init__(self, path=DEFAULT_INDEX_PATH):
+        self.path = path
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _find_line(self, key):
+        data = self._map
+        lo, hi = 0, len(data)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = data.rfind(b"\n", 0, mid) + 1
+            end = data.find(b"\n", start)
+            if end == -1:
+                end = len(data)
+            tab = data.find(b"\t", start, end)
+            line_key = data[start:tab if tab != -1 else end]
+
+            if line_key < key:
+                lo = end + 1
+            elif line_key > key:
+                hi = start
+            else:
+                return data[start:end]
+        return None
+
+    def lookup(self, word):
+        """
+        Return [(synonym, complexity), ...] for a word, simplest first.
+        Returns None if the word is not in the index at all.
+        """
+        line = self._find_line(word.lower().encode("utf-8"))
+        if line is None:
+            return None
+
+        parts = line.decode("utf-8").split("\t")
+        synonyms = []
+        if len(parts) > 2 and parts[2]:
+            for entry in parts[2].split(","):
+                syn, _, complexity = entry.rpartition(":")
+                synonyms.append((syn, int(complexity)))
+        return synonyms
+
+    def digest(self):
+        """Content hash, so caches of simplified text notice a rebuilt index"""
+        return hashlib.sha256(self._map).hexdigest()[:16]
+
+    def __contains__(self, word):
+        return self._find_line(word.lower().encode("utf-8")) is not None
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+
+_index = None
+_index_loaded = False
+_index_lock = threading.Lock()
+
+def get_index():
+    """Shared read-only index (SYNONYM_INDEX_PATH), or None if no index file exists"""
+    global _index, _index_loaded
+    if not _index_loaded:
+        with _index_lock:
+            if not _index_loaded:
+                path = os.environ.get("SYNONYM_INDEX_PATH", DEFAULT_INDEX_PATH)
+                if os.path.exists(path) and os.path.getsize(path) > 0:
+                    _index = SynonymIndex(path)
+                _index_loaded = True
+    return _index
+
+
+# --------------------------------------------------
+# INDEX BUILDER
+# --------------------------------------------------
+
+def _is_simple_token(name):
+    return name.isalpha() and name.islower()
+
+
+def _pluralize(noun):
+    if noun.endswith(("s", "x", "z", "ch", "sh")):
+        return noun + "es"
+    if noun.endswith("y") and noun[-2:-1] not in "aeiou":
+        return noun[:-1] + "ies"
+    return noun + "s"
+
+
+def irregular_nouns(wordnet):
+    """Every form in WordNet's noun exception list (noun.exc), inflected or base"""
+    forms = set()
+    with wordnet.open("noun.exc") as f:
+        for line in f:
+            forms.update(line.split())
+    return forms
+
+
+def _has_regular_plural(wordnet, noun, irregular):
+    """
+    Singular nouns whose plural _pluralize() gets right. Irregular nouns
+    ("child"), "-man" nouns and anything already ending in "s" ("athletics",
+    "authorities") are skipped rather than guessed.
+    """
+    return (not noun.endswith(("s", "man")) and noun not in irregular
+            and wordnet.morphy(_pluralize(noun), "n") == noun)
+
+
+def dominant_sense(wordnet, word, cache):
+    """
+    (synset, uses): the sense a word is used in most often in the sense-tagged
+    corpus and its total tagged uses. The synset is None when that sense has
+    fewer than MIN_SENSE_USES uses or less than MIN_SENSE_SHARE of them.
+    """
+    if word not in cache:
+        counts = [(sum(lemma.count() for lemma in synset.lemmas() if lemma.name().lower() == word), synset)
+                  for synset in wordnet.synsets(word)]
+        total = sum(count for count, _ in counts)
+        best = max(counts, key=lambda item: item[0], default=(0, None))  # first on ties: WordNet order
+        trusted = best[0] >= MIN_SENSE_USES and best[0] >= total * MIN_SENSE_SHARE
+        cache[word] = (best[1] if trusted else None, total)
+    return cache[word]
+
+
+def wordnet_entries(wordnet):
+    """
+    Yield (word, synonyms) from WordNet. A synonym is only kept when the word
+    and the synonym share their dominant sense (same synset, hence same part
+    of speech) and the synonym is used at least as often, so a replacement
+    keeps the meaning the word usually has and is a familiar word: "carry" ->
+    "take" is dropped because neither is mostly used in the other's sense.
+    Only nouns, verbs and adjectives are covered (POS_TAGS). Regular plurals
+    of countable nouns (COUNTABLE_LEXNAMES) are added for both the word and
+    its synonyms.
+    """
+    cache = {}
+    irregular = irregular_nouns(wordnet)
+    for word in wordnet.all_lemma_names():
+        if not _is_simple_token(word):
+            continue
+
+        synset, uses = dominant_sense(wordnet, word, cache)
+        if synset is None or synset.pos() not in POS_TAGS:
+            continue
+
+        synonyms = []
+        for lemma in synset.lemmas():
+            name = lemma.name()
+            if (_is_simple_token(name) and name != word and len(name) >= MIN_SYNONYM_LENGTH
+                    and name not in BLOCKLIST and (word, name) not in BLOCKED_PAIRS):
+                syn_synset, syn_uses = dominant_sense(wordnet, name, cache)
+                if syn_synset == synset and syn_uses >= max(uses, MIN_SYNONYM_USES):
+                    synonyms.append(name)
+        if not synonyms:
+            continue
+
+        yield word, synonyms
+
+        if synset.lexname() in COUNTABLE_LEXNAMES and _has_regular_plural(wordnet, word, irregular):
+            plurals = [_pluralize(syn) for syn in synonyms if _has_regular_plural(wordnet, syn, irregular)]
+            if plurals:
+                yield _pluralize(word), plurals
+
+
+def word_list_entries(path):
+    """Yield (word, synonyms) from a 'word<TAB>syn1,syn2' file"""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            word, _, synonyms = line.partition("\t")
+            yield word.lower(), [s.strip().lower() for s in synonyms.split(",") if s.strip()]
+
+
+def build_index(entries, out_path):
+    """Write the index; only words with at least one usable simpler synonym get a line"""
+    merged = {}
+    for word, synonyms in entries:
+        merged.setdefault(word, set()).update(syn for syn in synonyms if syn not in BLOCKLIST)
+
+    written = 0
+    with open(out_path, "w", encoding="utf-8", newline="\n") as f:
+        # Bytewise order so the mmap binary search matches
+        for word in sorted(merged, key=lambda w: w.encode("utf-8")):
+            candidates = simpler_synonyms(word, merged[word])[:MAX_SYNONYMS]
+            if not candidates:
+                continue
+            f.write(f"{word}\t{word_complexity(word)}\t"
+                    + ",".join(f"{syn}:{score}" for syn, score in candidates) + "\n")
+            written += 1
+
+    return written
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Build the offline synonym index")
+    parser.add_argument("command", choices=["build", "lookup"])
+    parser.add_argument("words", nargs="*", help="words to look up")
+    parser.add_argument("--out", default=DEFAULT_INDEX_PATH)
+    parser.add_argument("--nltk-data", help="extra NLTK data directory containing corpora/wordnet")
+    parser.add_argument("--word-list", action="append", default=[],
+                        help="extra 'word<TAB>syn1,syn2' file to merge in")
+    parser.add_argument("--no-wordnet", action="store_true")
+    args = parser.parse_intermixed_args(argv)
+
+    if args.command == "lookup":
+        index = SynonymIndex(args.out)
+        for word in args.words:
+            print(word, index.lookup(word))
+        return 0
+
+    sources = []
+    if not args.no_wordnet:
+        import nltk
+        if args.nltk_data:
+            nltk.data.path.insert(0, args.nltk_data)
+        try:
+            nltk.data.find("corpora/wordnet")
+        except LookupError:
+            nltk.download("wordnet", quiet=True)
+        from nltk.corpus import wordnet
+        sources.append(wordnet_entries(wordnet))
+    sources.extend(word_list_entries(path) for path in args.word_list)
+
+    def all_entries():
+        for source in sources:
+            yield from source
+
+    count = build_index(all_entries(), args.out)
+    print(f"Wrote {count} words to {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
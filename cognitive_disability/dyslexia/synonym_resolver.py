@@ -0,0 +1,97 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import metrics
+
+# --------------------------------------------------
+# CONCURRENT DATAMUSE RESOLVER
+# --------------------------------------------------
+# One process-wide client for online synonym lookups:
+#   - a pooled requests.Session (keep-alive connections to the API)
+#   - a fixed-size thread pool, which is the global concurrency limit
+#   - a per-request timeout (SIMPLIFIER_API_TIMEOUT seconds)
+#   - in-flight coalescing: concurrent lookups of the same word, from any
+#     number of simplifications, share a single HTTP request
+
+DATAMUSE_URL = "https://api.datamuse.com/words"
+
+
+class SynonymResolver:
+    def __init__(self, max_concurrency=8, timeout=3.0):
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_concurrency)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self._pool = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="datamuse")
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self.requests_sent = 0
+        self.requests_coalesced = 0
+
+    def fetch(self, word):
+        """
+        Blocking Datamuse lookup; returns a (possibly empty) list of synonyms,
+        or None when the request failed (timeout, non-200, network error) so
+        callers can tell "no synonyms" from "don't know"
+        """
+        status = "error"
+        try:
+            with metrics.span("simplify.datamuse_request"):
+                response = self.session.get(
+                    DATAMUSE_URL,
+                    params={"rel_syn": word, "max": 15},
+                    timeout=self.timeout
+                )
+            status = str(response.status_code)
+            if response.status_code == 200:
+                return [item['word'] for item in response.json() if 'word' in item]
+        except requests.Timeout:
+            status = "timeout"
+        except Exception:
+            pass
+        finally:
+            metrics.inc("datamuse_requests_total", status=status)
+        return None
+
+    def submit(self, word):
+        """Return a Future for the synonyms of word, sharing any in-flight lookup"""
+        with self._lock:
+            future = self._inflight.get(word)
+            if future is not None:
+                self.requests_coalesced += 1
+                metrics.inc("datamuse_requests_coalesced_total")
+                return future
+            future = self._pool.submit(self.fetch, word)
+            self._inflight[word] = future
+            self.requests_sent += 1
+
+        future.add_done_callback(lambda _: self._finish(word))
+        return future
+
+    def _finish(self, word):
+        with self._lock:
+            self._inflight.pop(word, None)
+
+    def submit_many(self, words):
+        """Start lookups for all words at once; returns {word: Future}"""
+        return {word: self.submit(word) for word in set(words)}
+
+
+_resolver = None
+_resolver_lock = threading.Lock()
+
+def get_resolver():
+    global _resolver
+    with _resolver_lock:
+        if _resolver is None:
+            _resolver = SynonymResolver(
+                max_concurrency=int(os.environ.get("SIMPLIFIER_API_CONCURRENCY", "8")),
+                timeout=float(os.environ.get("SIMPLIFIER_API_TIMEOUT", "3"))
+            )
+        return _resolver
@@ -1,7 +1,212 @@
-import requests
 import re
-import json
 import os
+import sys
+import json
+import hashlib
+import threading
+from collections import namedtuple
+from concurrent.futures import wait
+from types import MappingProxyType
+
+import metrics
+from synonym_index import get_index, simpler_synonyms, count_syllables, word_complexity
+from synonym_resolver import get_resolver
+from word_cache import get_word_cache
+
+# Datamuse is only used for words the offline index does not know. Lookups run
+# concurrently and simplify_words waits at most SIMPLIFIER_LOOKUP_DEADLINE
+# seconds for them; slower answers still fill the cache for the next call.
+# Set SIMPLIFIER_ONLINE_FALLBACK=0 to disable the API entirely.
+ONLINE_FALLBACK = os.environ.get("SIMPLIFIER_ONLINE_FALLBACK", "1") != "0"
+LOOKUP_DEADLINE = float(os.environ.get("SIMPLIFIER_LOOKUP_DEADLINE", "1.0"))
+
+# Bump when simplify() changes its output for the same input and resources
+VERSION = 2
+
+# --------------------------------------------------
+# STATIC LEXICONS (built once per process, read-only)
+# --------------------------------------------------
+
+Lexicon = namedtuple("Lexicon", ["verified_replacements", "keep_words", "matcher"])
+
+_lexicon = None
+_lexicon_lock = threading.Lock()
+
+def _build_lexicon():
+    # COMPREHENSIVE manual dictionary (high-quality replacements)
+    # These are VERIFIED accurate simplifications
+    verified_replacements = {
+        # Common academic/business words
+        "obfuscated": "hid", "obfuscate": "hide", "obfuscating": "hiding",
+        "ambiguous": "unclear", "ambiguity": "uncertainty",
+        "perplexed": "confused", "perplex": "confuse",
+        "uncertain": "unsure", "uncertainty": "doubt",
+        "convoluted": "complicated", "convolute": "complicate",
+        "impeded": "slowed down", "impede": "slow down", "impediment": "obstacle",
+        "eroded": "damaged", "erode": "damage", "erosion": "wearing away",
+        "frequently": "often", "frequent": "common",
+        "intentions": "plans", "intention": "plan", "intend": "plan",
+        "priorities": "goals", "priority": "main goal",
+        "productivity": "work output", "productive": "efficient",
+        "employees": "workers", "employee": "worker",
+        "communication": "talking", "communicate": "talk",
+        "statement": "claim", "statements": "claims",
+        
+        # Verbs - Action words
+        "utilize": "use", "utilization": "use", "utilizing": "using",
+        "commence": "start", "commencing": "starting", "commenced": "started",
+        "terminate": "end", "terminating": "ending", "terminated": "ended",
+        "acquire": "get", "acquiring": "getting", "acquired": "got",
+        "assist": "help", "assistance": "help", "assisting": "helping",
+        "demonstrate": "show", "demonstrating": "showing", "demonstrated": "showed",
+        "endeavor": "try", "endeavoring": "trying",
+        "establish": "set up", "establishing": "setting up", "established": "set up",
+        "facilitate": "help", "facilitating": "helping", "facilitated": "helped",
+        "implement": "carry out", "implementing": "carrying out", "implemented": "carried out",
+        "obtain": "get", "obtaining": "getting", "obtained": "got",
+        "ascertain": "find out", "ascertaining": "finding out",
+        "necessitate": "need", "necessitating": "needing",
+        "anticipate": "expect", "anticipating": "expecting", "anticipated": "expected",
+        "comprehend": "understand", "comprehending": "understanding",
+        "enumerate": "list", "enumerating": "listing",
+        "consolidate": "combine", "consolidating": "combining",
+        "deteriorate": "worsen", "deteriorating": "worsening",
+        "disseminate": "spread", "disseminating": "spreading",
+        "elucidate": "explain", "elucidating": "explaining",
+        "expedite": "speed up", "expediting": "speeding up",
+        "initiate": "start", "initiating": "starting", "initiated": "started",
+        "manifest": "show", "manifesting": "showing",
+        "optimize": "improve", "optimizing": "improving",
+        "perpetuate": "continue", "perpetuating": "continuing",
+        "substantiate": "prove", "substantiating": "proving",
+        "collaborate": "work together", "collaborating": "working together",
+        "compensate": "pay", "compensating": "paying",
+        "contemplate": "think about", "contemplating": "thinking about",
+        "emphasize": "stress", "emphasizing": "stressing",
+        "incorporate": "include", "incorporating": "including",
+        "mitigate": "reduce", "mitigating": "reducing",
+        "modify": "change", "modifying": "changing", "modified": "changed",
+        "retain": "keep", "retaining": "keeping", "retained": "kept",
+        "transmit": "send", "transmitting": "sending", "transmitted": "sent",
+        "articulate": "explain", "articulated": "explained", "articulating": "explaining",
+        "achieve": "reach", "achieving": "reaching", "achieved": "reached",
+        "appeared": "seemed", "appear": "seem", "appearing": "seeming",
+        "misinterpret": "misunderstand", "misinterpreted": "misunderstood",
+        "continued": "kept going", "continue": "keep going",
+        "mounted": "grew", "mount": "grow",
+        
+        # Adjectives
+        "adequate": "enough",
+        "beneficial": "helpful", "benefit": "help",
+        "considerable": "large", "considerably": "greatly",
+        "detrimental": "harmful",
+        "exceptional": "unusual", "exceptionally": "unusually",
+        "feasible": "possible",
+        "imperative": "necessary",
+        "inevitable": "certain", "inevitably": "certainly",
+        "indispensable": "necessary",
+        "negligible": "tiny", "negligibly": "very little",
+        "optimal": "best",
+        "paramount": "most important",
+        "pivotal": "key", "pivot": "turn",
+        "predominant": "main", "predominantly": "mainly",
+        "proficient": "skilled",
+        "prominent": "important", "prominently": "noticeably",
+        "rigorous": "strict", "rigorously": "strictly",
+        "substantial": "large", "substantially": "greatly",
+        "trivial": "small", "trivially": "slightly",
+        "ubiquitous": "everywhere",
+        "unprecedented": "never before seen",
+        "volatile": "unstable",
+        "underlying": "basic", "underlie": "form the basis",
+        "promising": "hopeful",
+        "inconsistent": "changing", "inconsistency": "conflict",
+        "intended": "planned",
+        
+        # Nouns
+        "approximately": "about",
+        "particulars": "details", "particular": "specific",
+        "indication": "sign", "indicate": "show",
+        "rationale": "reason", "rational": "logical",
+        "vicinity": "area",
+        "assumption": "belief", "assumptions": "beliefs", "assume": "believe",
+        "objective": "goal", "objectives": "goals",
+        "participant": "member", "participants": "members",
+        "resource": "supply", "resources": "supplies",
+        "discussion": "talk", "discussions": "talks", "discuss": "talk about",
+        "proposal": "plan", "propose": "suggest",
+        "stakeholder": "person involved", "stakeholders": "people involved",
+        "confusion": "uncertainty",
+        "frustration": "annoyance", "frustrations": "problems",
+        "absence": "lack",
+        "guidance": "direction", "guide": "lead",
+        "project": "task", "projects": "tasks",
+        "impact": "effect", "impacts": "effects",
+        "effort": "work", "efforts": "work",
+        
+        # Transitions
+        "therefore": "so",
+        "however": "but",
+        "nevertheless": "but",
+        "nonetheless": "but",
+        "consequently": "so",
+        "accordingly": "so",
+        "additionally": "also",
+        "furthermore": "also",
+        "moreover": "also",
+        "thus": "so",
+        "hence": "so",
+        "whereas": "while",
+        "notwithstanding": "despite",
+        "although": "though",
+        "ultimately": "in the end", "ultimate": "final",
+        
+        # Common phrases
+        "prior to": "before",
+        "subsequent to": "after",
+        "in order to": "to",
+        "due to the fact that": "because",
+        "at this point in time": "now",
+        "for the purpose of": "to",
+    }
+    
+    # Words to NEVER replace (already simple or no good alternative)
+    keep_words = {
+        'the', 'be', 'to', 'of', 'and', 'a', 'in', 'that', 'have', 'i',
+        'it', 'for', 'not', 'on', 'with', 'he', 'as', 'you', 'do', 'at',
+        'this', 'but', 'his', 'by', 'from', 'they', 'we', 'say', 'her', 'she',
+        'or', 'an', 'will', 'my', 'one', 'all', 'would', 'there', 'their', 'what',
+        'so', 'up', 'out', 'if', 'about', 'who', 'get', 'which', 'go', 'me',
+        'when', 'make', 'can', 'like', 'time', 'no', 'just', 'him', 'know', 'take',
+        'people', 'into', 'year', 'your', 'good', 'some', 'could', 'them', 'see', 'other',
+        'than', 'then', 'now', 'look', 'only', 'come', 'its', 'over', 'think', 'also',
+        'back', 'after', 'use', 'two', 'how', 'our', 'work', 'first', 'well', 'way',
+        'even', 'new', 'want', 'any', 'these', 'give', 'day', 'most', 'us', 'was',
+        'team', 'clear', 'among', 'style', 'trust', 'manager', 'poorly', 'caused',
+        'causing', 'led', 'wasted', 'due', 'failed'
+    }
+    
+    # One regex for the whole dictionary: every multi-word phrase (longest
+    # first), then any single word. A single scan finds all of them in order.
+    phrases = sorted((p for p in verified_replacements if ' ' in p), key=len, reverse=True)
+    alternatives = [r'\s+'.join(map(re.escape, p.split())) for p in phrases]
+    matcher = re.compile(
+        r'\b(?P<phrase>' + '|'.join(alternatives) + r')\b|\b\w+\b',
+        re.IGNORECASE
+    )
+    
+    return Lexicon(MappingProxyType(verified_replacements), frozenset(keep_words), matcher)
+
+
+def get_lexicon():
+    """Shared immutable lexicon; built on first use"""
+    global _lexicon
+    if _lexicon is None:
+        with _lexicon_lock:
+            if _lexicon is None:
+                _lexicon = _build_lexicon()
+    return _lexicon
+
 
 # --------------------------------------------------
 # ACCURATE TEXT SIMPLIFIER (ACCURACY > SIMPLIFICATION)
@@ -10,295 +215,179 @@ import os
 class AccurateTextSimplifier:
     def __init__(self):
         # Cache for API results
-        self.cache_file = "word_cache.json"
         self.word_cache = self.load_cache()
         
-        # COMPREHENSIVE manual dictionary (high-quality replacements)
-        # These are VERIFIED accurate simplifications
-        self.verified_replacements = {
-            # Common academic/business words
-            "obfuscated": "hid", "obfuscate": "hide", "obfuscating": "hiding",
-            "ambiguous": "unclear", "ambiguity": "uncertainty",
-            "perplexed": "confused", "perplex": "confuse",
-            "uncertain": "unsure", "uncertainty": "doubt",
-            "convoluted": "complicated", "convolute": "complicate",
-            "impeded": "slowed down", "impede": "slow down", "impediment": "obstacle",
-            "eroded": "damaged", "erode": "damage", "erosion": "wearing away",
-            "frequently": "often", "frequent": "common",
-            "intentions": "plans", "intention": "plan", "intend": "plan",
-            "priorities": "goals", "priority": "main goal",
-            "productivity": "work output", "productive": "efficient",
-            "employees": "workers", "employee": "worker",
-            "communication": "talking", "communicate": "talk",
-            "statement": "claim", "statements": "claims",
-            
-            # Verbs - Action words
-            "utilize": "use", "utilization": "use", "utilizing": "using",
-            "commence": "start", "commencing": "starting", "commenced": "started",
-            "terminate": "end", "terminating": "ending", "terminated": "ended",
-            "acquire": "get", "acquiring": "getting", "acquired": "got",
-            "assist": "help", "assistance": "help", "assisting": "helping",
-            "demonstrate": "show", "demonstrating": "showing", "demonstrated": "showed",
-            "endeavor": "try", "endeavoring": "trying",
-            "establish": "set up", "establishing": "setting up", "established": "set up",
-            "facilitate": "help", "facilitating": "helping", "facilitated": "helped",
-            "implement": "carry out", "implementing": "carrying out", "implemented": "carried out",
-            "obtain": "get", "obtaining": "getting", "obtained": "got",
-            "ascertain": "find out", "ascertaining": "finding out",
-            "necessitate": "need", "necessitating": "needing",
-            "anticipate": "expect", "anticipating": "expecting", "anticipated": "expected",
-            "comprehend": "understand", "comprehending": "understanding",
-            "enumerate": "list", "enumerating": "listing",
-            "consolidate": "combine", "consolidating": "combining",
-            "deteriorate": "worsen", "deteriorating": "worsening",
-            "disseminate": "spread", "disseminating": "spreading",
-            "elucidate": "explain", "elucidating": "explaining",
-            "expedite": "speed up", "expediting": "speeding up",
-            "initiate": "start", "initiating": "starting", "initiated": "started",
-            "manifest": "show", "manifesting": "showing",
-            "optimize": "improve", "optimizing": "improving",
-            "perpetuate": "continue", "perpetuating": "continuing",
-            "substantiate": "prove", "substantiating": "proving",
-            "collaborate": "work together", "collaborating": "working together",
-            "compensate": "pay", "compensating": "paying",
-            "contemplate": "think about", "contemplating": "thinking about",
-            "emphasize": "stress", "emphasizing": "stressing",
-            "incorporate": "include", "incorporating": "including",
-            "mitigate": "reduce", "mitigating": "reducing",
-            "modify": "change", "modifying": "changing", "modified": "changed",
-            "retain": "keep", "retaining": "keeping", "retained": "kept",
-            "transmit": "send", "transmitting": "sending", "transmitted": "sent",
-            "articulate": "explain", "articulated": "explained", "articulating": "explaining",
-            "achieve": "reach", "achieving": "reaching", "achieved": "reached",
-            "appeared": "seemed", "appear": "seem", "appearing": "seeming",
-            "misinterpret": "misunderstand", "misinterpreted": "misunderstood",
-            "continued": "kept going", "continue": "keep going",
-            "mounted": "grew", "mount": "grow",
-            
-            # Adjectives
-            "adequate": "enough",
-            "beneficial": "helpful", "benefit": "help",
-            "considerable": "large", "considerably": "greatly",
-            "detrimental": "harmful",
-            "exceptional": "unusual", "exceptionally": "unusually",
-            "feasible": "possible",
-            "imperative": "necessary",
-            "inevitable": "certain", "inevitably": "certainly",
-            "indispensable": "necessary",
-            "negligible": "tiny", "negligibly": "very little",
-            "optimal": "best",
-            "paramount": "most important",
-            "pivotal": "key", "pivot": "turn",
-            "predominant": "main", "predominantly": "mainly",
-            "proficient": "skilled",
-            "prominent": "important", "prominently": "noticeably",
-            "rigorous": "strict", "rigorously": "strictly",
-            "substantial": "large", "substantially": "greatly",
-            "trivial": "small", "trivially": "slightly",
-            "ubiquitous": "everywhere",
-            "unprecedented": "never before seen",
-            "volatile": "unstable",
-            "underlying": "basic", "underlie": "form the basis",
-            "promising": "hopeful",
-            "inconsistent": "changing", "inconsistency": "conflict",
-            "intended": "planned",
-            
-            # Nouns
-            "approximately": "about",
-            "particulars": "details", "particular": "specific",
-            "indication": "sign", "indicate": "show",
-            "rationale": "reason", "rational": "logical",
-            "vicinity": "area",
-            "assumption": "belief", "assumptions": "beliefs", "assume": "believe",
-            "objective": "goal", "objectives": "goals",
-            "participant": "member", "participants": "members",
-            "resource": "supply", "resources": "supplies",
-            "discussion": "talk", "discussions": "talks", "discuss": "talk about",
-            "proposal": "plan", "propose": "suggest",
-            "stakeholder": "person involved", "stakeholders": "people involved",
-            "confusion": "uncertainty",
-            "frustration": "annoyance", "frustrations": "problems",
-            "absence": "lack",
-            "guidance": "direction", "guide": "lead",
-            "project": "task", "projects": "tasks",
-            "impact": "effect", "impacts": "effects",
-            "effort": "work", "efforts": "work",
-            
-            # Transitions
-            "therefore": "so",
-            "however": "but",
-            "nevertheless": "but",
-            "nonetheless": "but",
-            "consequently": "so",
-            "accordingly": "so",
-            "additionally": "also",
-            "furthermore": "also",
-            "moreover": "also",
-            "thus": "so",
-            "hence": "so",
-            "whereas": "while",
-            "notwithstanding": "despite",
-            "although": "though",
-            "ultimately": "in the end", "ultimate": "final",
-            
-            # Common phrases
-            "prior to": "before",
-            "subsequent to": "after",
-            "in order to": "to",
-            "due to the fact that": "because",
-            "at this point in time": "now",
-            "for the purpose of": "to",
-        }
-        
-        # Words to NEVER replace (already simple or no good alternative)
-        self.keep_words = {
-            'the', 'be', 'to', 'of', 'and', 'a', 'in', 'that', 'have', 'i',
-            'it', 'for', 'not', 'on', 'with', 'he', 'as', 'you', 'do', 'at',
-            'this', 'but', 'his', 'by', 'from', 'they', 'we', 'say', 'her', 'she',
-            'or', 'an', 'will', 'my', 'one', 'all', 'would', 'there', 'their', 'what',
-            'so', 'up', 'out', 'if', 'about', 'who', 'get', 'which', 'go', 'me',
-            'when', 'make', 'can', 'like', 'time', 'no', 'just', 'him', 'know', 'take',
-            'people', 'into', 'year', 'your', 'good', 'some', 'could', 'them', 'see', 'other',
-            'than', 'then', 'now', 'look', 'only', 'come', 'its', 'over', 'think', 'also',
-            'back', 'after', 'use', 'two', 'how', 'our', 'work', 'first', 'well', 'way',
-            'even', 'new', 'want', 'any', 'these', 'give', 'day', 'most', 'us', 'was',
-            'team', 'clear', 'among', 'style', 'trust', 'manager', 'poorly', 'caused',
-            'causing', 'led', 'wasted', 'due', 'failed'
-        }
+        # Static dictionaries are shared by every instance (see _build_lexicon)
+        lexicon = get_lexicon()
+        self.verified_replacements = lexicon.verified_replacements
+        self.keep_words = lexicon.keep_words
+        self.matcher = lexicon.matcher
     
     def load_cache(self):
-        """Load cached word simplifications"""
-        if os.path.exists(self.cache_file):
-            try:
-                with open(self.cache_file, 'r') as f:
-                    return json.load(f)
-            except:
-                return {}
-        return {}
+        """Shared persistent cache of API word simplifications (see word_cache.py)"""
+        return get_word_cache()
     
     def save_cache(self):
-        """Save word cache to disk"""
-        try:
-            with open(self.cache_file, 'w') as f:
-                json.dump(self.word_cache, f, indent=2)
-        except:
-            pass
+        """Writes are incremental and atomic; kept for backwards compatibility"""
+        pass
     
     def get_word_complexity(self, word):
         """Calculate complexity score (higher = more complex)"""
-        syllables = self.count_syllables(word)
-        length = len(word)
-        return syllables * 2 + length
+        return word_complexity(word)
     
     def count_syllables(self, word):
         """Count syllables in a word"""
-        word = word.lower()
-        count = 0
-        vowels = 'aeiouy'
-        previous_was_vowel = False
-        
-        for char in word:
-            is_vowel = char in vowels
-            if is_vowel and not previous_was_vowel:
-                count += 1
-            previous_was_vowel = is_vowel
-        
-        if word.endswith('e'):
-            count -= 1
-        
-        return max(1, count)
+        return count_syllables(word)
     
     def get_synonyms_api(self, word):
-        """Get REAL synonyms using multiple APIs for accuracy"""
-        synonyms = []
-        
-        try:
-            # API 1: Datamuse with synonym relationship (more accurate)
-            url = f"https://api.datamuse.com/words?rel_syn={word}&max=15"
-            response = requests.get(url, timeout=3)
-            
-            if response.status_code == 200:
-                data = response.json()
-                synonyms.extend([item['word'] for item in data if 'word' in item])
-        except:
-            pass
-        
-        return synonyms
+        """Get REAL synonyms from the Datamuse API (blocking); None if the request failed"""
+        return get_resolver().fetch(word)
     
-    def find_best_synonym(self, word):
-        """Find the BEST simpler synonym (accuracy first!)"""
+    def lookup_offline(self, word):
+        """
+        Resolve a word without the network (keep list, verified replacements,
+        synonym index, cache of API answers). Returns None if the word is unknown.
+        """
         word_lower = word.lower()
         
         # Step 1: Check if word should be kept as-is
         if word_lower in self.keep_words or len(word_lower) <= 4:
             return word
         
-        # Step 2: Check cache
-        if word_lower in self.word_cache:
-            return self.word_cache[word_lower]
-        
-        # Step 3: Check verified manual replacements (MOST ACCURATE)
+        # Step 2: Check verified manual replacements (MOST ACCURATE)
         if word_lower in self.verified_replacements:
-            simpler = self.verified_replacements[word_lower]
-            self.word_cache[word_lower] = simpler
-            return simpler
+            return self.verified_replacements[word_lower]
         
-        # Step 4: Try API for other words
-        print(f"  🔍 {word}...", end=" ")
-        synonyms = self.get_synonyms_api(word)
+        # Step 3: Offline synonym index (no network, so not worth persisting)
+        index = get_index()
+        candidates = index.lookup(word_lower) if index else None
+        if candidates is not None:
+            simpler = self.choose_simpler(word_lower, [syn for syn, _ in candidates])
+            return simpler or word
         
-        if synonyms:
-            # Filter: Only use synonyms that are actually simpler
-            original_complexity = self.get_word_complexity(word_lower)
-            
-            valid_synonyms = []
-            for syn in synonyms:
-                syn_complexity = self.get_word_complexity(syn)
-                # Must be at least 20% simpler to be considered
-                if syn_complexity < original_complexity * 0.8:
-                    valid_synonyms.append((syn, syn_complexity))
-            
-            if valid_synonyms:
-                # Pick the simplest valid synonym
-                best_syn = min(valid_synonyms, key=lambda x: x[1])[0]
-                print(f"→ {best_syn}")
-                self.word_cache[word_lower] = best_syn
-                self.save_cache()
-                return best_syn
+        # Step 4: Cached API answers, only for words the curated sources don't cover
+        return self.word_cache.get(word_lower)
+    
+    def accepts_cached(self, word, replacement):
+        """
+        Whether a (word, replacement) pair from an old cache is worth importing:
+        the word isn't kept or covered by the curated sources, and the
+        replacement is a single word choose_simpler() would pick.
+        """
+        if word in self.keep_words or len(word) <= 4 or word in self.verified_replacements:
+            return False
+        index = get_index()
+        if index and word in index:
+            return False
+        replacement = replacement.lower()
+        return (replacement != word and replacement.isalpha()
+                and self.choose_simpler(word, [replacement]) == replacement)
+    
+    def find_best_synonym(self, word):
+        """Find the BEST simpler synonym (accuracy first!)"""
+        simpler = self.lookup_offline(word)
+        if simpler is not None:
+            return simpler
         
-        # Step 5: Keep original if no good alternative found
-        print("✗ kept")
-        self.word_cache[word_lower] = word
+        # Step 5: Keep original; the API fills the cache in the background
+        if ONLINE_FALLBACK:
+            self.resolve_online([word], deadline=0)
         return word
     
-    def simplify_words(self, text):
-        """Replace complex words with accurate simpler alternatives"""
-        # Extract all words
-        words = re.findall(r'\b\w+\b', text)
+    def choose_simpler(self, word, synonyms):
+        """Pick the simplest synonym that is at least 20% simpler, or None"""
+        valid_synonyms = simpler_synonyms(word, synonyms)
+        return valid_synonyms[0][0] if valid_synonyms else None
+    
+    def resolve_online(self, words, deadline=LOOKUP_DEADLINE):
+        """
+        Look up all words concurrently through the shared resolver and wait
+        up to deadline seconds. Returns {word: simpler} for the lookups that
+        succeeded in time; the rest still update the cache if they complete
+        successfully. Failed lookups are never cached, so the word is retried.
+        """
+        futures = get_resolver().submit_many(w.lower() for w in words)
+        for word_lower, future in futures.items():
+            future.add_done_callback(
+                lambda f, w=word_lower: self.store_api_result(w, f.result())
+            )
+        
+        with metrics.span("simplify.datamuse_wait"):
+            done, _ = wait(futures.values(), timeout=deadline) if deadline > 0 else (set(), None)
+        
+        resolved = {}
+        for word in words:
+            future = futures[word.lower()]
+            if future in done and future.result() is not None:
+                resolved[word] = self.choose_simpler(word.lower(), future.result()) or word
+        return resolved
+    
+    def store_api_result(self, word, synonyms):
+        if synonyms is None:
+            # The request failed; caching the word as-is would pin it forever
+            print(f"  🔍 {word} → ✗ lookup failed", file=sys.stderr)
+            return
+        best_syn = self.choose_simpler(word, synonyms)
+        # Runs on resolver threads, possibly after the caller restored
+        # sys.stdout and started writing its JSON; keep stdout clean
+        print(f"  🔍 {word} → {best_syn or '✗ kept'}", file=sys.stderr)
+        self.word_cache[word] = best_syn or word
+    
+    @metrics.timed("simplify.words")
+    def simplify_words(self, text, missed=None):
+        """
+        Replace complex words and phrases with accurate simpler alternatives.
+        Words whose Datamuse lookup failed or missed the deadline are kept
+        as-is and, if missed is a list, appended to it.
+        """
+        # Single scan: phrase matches win over the words inside them
+        matches = list(self.matcher.finditer(text))
         
         replacements = {}
-        unique_words = set(words)
+        unique_words = {m.group(0) for m in matches if m.group('phrase') is None}
         
-        for word in unique_words:
-            simpler = self.find_best_synonym(word)
+        for m in matches:
+            if m.group('phrase') is not None:
+                phrase = ' '.join(m.group('phrase').split()).lower()
+                replacements[phrase] = self.verified_replacements[phrase]
+        
+        # Resolve everything possible offline, then look up the misses together
+        resolved = {}
+        unresolved = []
+        with metrics.span("simplify.offline_lookup"):
+            for word in unique_words:
+                simpler = self.lookup_offline(word)
+                if simpler is None:
+                    unresolved.append(word)
+                else:
+                    resolved[word] = simpler
+        
+        if unresolved and ONLINE_FALLBACK:
+            resolved.update(self.resolve_online(unresolved))
+            if missed is not None:
+                missed.extend(word for word in unresolved if word not in resolved)
+        
+        for word, simpler in resolved.items():
             if simpler.lower() != word.lower():
-                replacements[word] = simpler
+                replacements[word.lower()] = simpler
         
-        # Apply replacements (preserve case)
-        result = text
-        for original, simpler in replacements.items():
-            pattern = re.compile(r'\b' + re.escape(original) + r'\b', re.IGNORECASE)
-            
-            def replace_preserve_case(match):
-                matched = match.group(0)
-                if matched[0].isupper():
-                    return simpler.capitalize()
-                return simpler
-            
-            result = pattern.sub(replace_preserve_case, result)
+        # Apply replacements in the same pass order (preserve case)
+        parts = []
+        position = 0
+        for m in matches:
+            matched = m.group(0)
+            key = ' '.join(matched.split()).lower() if m.group('phrase') is not None else matched.lower()
+            simpler = replacements.get(key)
+            if simpler is None:
+                continue
+            parts.append(text[position:m.start()])
+            parts.append(simpler.capitalize() if matched[0].isupper() else simpler)
+            position = m.end()
+        parts.append(text[position:])
         
-        return result
+        return ''.join(parts)
     
+    @metrics.timed("simplify.split_sentences")
     def split_sentences(self, text):
         """Break long sentences into shorter ones"""
         sentences = re.split(r'([.!?])\s+', text)
@@ -321,13 +410,13 @@ class AccurateTextSimplifier:
         
         return ' '.join(result)
     
-    def simplify(self, text):
-        """Main simplification pipeline"""
+    def simplify(self, text, missed=None):
+        """Main simplification pipeline (missed: see simplify_words)"""
         print("\n🔄 Step 1: Breaking long sentences...")
         result = self.split_sentences(text)
         
         print("🔄 Step 2: Simplifying words (accuracy first)...")
-        result = self.simplify_words(result)
+        result = self.simplify_words(result, missed)
         
         # Clean up formatting
         result = re.sub(r'\s+', ' ', result)
@@ -380,9 +469,41 @@ def print_comparison(original, simplified):
 # MAIN
 # --------------------------------------------------
 
+_shared_simplifier = None
+_shared_lock = threading.Lock()
+
+def get_simplifier():
+    """
+    Process-wide simplifier. It is safe to share between threads: the
+    lexicon is immutable and the word cache and API resolver are thread-safe.
+    """
+    global _shared_simplifier
+    if _shared_simplifier is None:
+        with _shared_lock:
+            if _shared_simplifier is None:
+                _shared_simplifier = AccurateTextSimplifier()
+    return _shared_simplifier
+
+
+_cache_version = None
+
+def cache_version():
+    """
+    Digest of everything besides the input that decides simplify() output:
+    VERSION, the lexicon and the synonym index. Part of result cache keys.
+    """
+    global _cache_version
+    if _cache_version is None:
+        lexicon = get_lexicon()
+        index = get_index()
+        spec = json.dumps([VERSION, dict(lexicon.verified_replacements), sorted(lexicon.keep_words),
+                           index.digest() if index else None])
+        _cache_version = hashlib.sha256(spec.encode("utf-8")).hexdigest()[:16]
+    return _cache_version
+
+
 def simplify_text(text):
-    simplifier = AccurateTextSimplifier()
-    return simplifier.simplify(text)
+    return get_simplifier().simplify(text)
 
 if __name__ == "__main__":
     print("="*70)
@@ -410,4 +531,4 @@ if __name__ == "__main__":
     print_comparison(user_text, simplified_text)
 
     print("\n✅ All replacements are accuracy-checked!")
-    print("💾 Results cached in 'word_cache.json'")
+    print(f"💾 Results cached in '{simplifier.word_cache.path}'")
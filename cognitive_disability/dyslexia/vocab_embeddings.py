@@ -0,0 +1,273 @@
+import os
+import sys
+import json
+import argparse
+import threading
+from collections import OrderedDict
+
+import metrics
+
+# --------------------------------------------------
+# PRECOMPUTED VOCABULARY EMBEDDINGS
+# --------------------------------------------------
+# Keyword candidates are single lowercase dictionary words that repeat across
+# documents, so their MiniLM embeddings are computed once offline:
+#
+#     vocab_embeddings/embeddings.npy   float16 [n_words, dim], L2-normalized
+#     vocab_embeddings/words.txt        one word per line, row order
+#     vocab_embeddings/meta.json        {"model", "dim", "count"}
+#
+# The matrix is opened with mmap_mode='r', so every worker process shares the
+# same read-only pages. Words missing from the table are encoded with the model
+# and kept in an in-memory LRU.
+#
+# Build (needs sentence-transformers; vocabulary defaults to WordNet's words):
+#     python vocab_embeddings.py build [--word-list words.txt] [--nltk-data DIR] [--limit N]
+
+MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_TABLE_DIR = os.path.join(MODULE_DIR, "vocab_embeddings")
+
+BUILD_BATCH_SIZE = 512
+
+
+class EmbeddingTable:
+    def __init__(self, directory=DEFAULT_TABLE_DIR):
+        import numpy as np
+
+        with open(os.path.join(directory, "meta.json"), "r", encoding="utf-8") as f:
+            self.meta = json.load(f)
+        self.vectors = np.load(os.path.join(directory, "embeddings.npy"), mmap_mode="r")
+        with open(os.path.join(directory, "words.txt"), "r", encoding="utf-8") as f:
+            self.rows = {line.rstrip("\n"): i for i, line in enumerate(f)}
+
+    @property
+    def model(self):
+        return self.meta.get("model")
+
+    def __contains__(self, word):
+        return word in self.rows
+
+    def __len__(self):
+        return len(self.rows)
+
+    def lookup(self, words):
+        """Return (row indices, positions found, positions missing) for a word list"""
+        indices, found, missing = [], [], []
+        for position, word in enumerate(words):
+            row = self.rows.get(word)
+            if row is None:
+                missing.append(position)
+            else:
+                indices.append(row)
+                found.append(position)
+        return indices, found, missing
+
+
+_table = None
+_table_loaded = False
+_table_lock = threading.Lock()
+
+def get_table(model_name=None):
+    """
+    Shared read-only table (KEYWORD_VOCAB_DIR), or None when it has not been
+    built or was built with a different model.
+    """
+    global _table, _table_loaded
+    if not _table_loaded:
+        with _table_lock:
+            if not _table_loaded:
+                directory = os.environ.get("KEYWORD_VOCAB_DIR", DEFAULT_TABLE_DIR)
+                if os.path.exists(os.path.join(directory, "meta.json")):
+                    table = EmbeddingTable(directory)
+                    if model_name and table.model != model_name:
+                        print(f"Ignoring {directory}: built for {table.model}, not {model_name}",
+                              file=sys.stderr)
+                    else:
+                        _table = table
+                _table_loaded = True
+    return _table
+
+
+# --------------------------------------------------
+# OUT-OF-VOCABULARY CACHE
+# --------------------------------------------------
+
+class VectorCache:
+    """Thread-safe LRU of word -> normalized float32 vector"""
+
+    def __init__(self, max_size=50000):
+        self.max_size = max_size
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, word):
+        with self._lock:
+            vector = self._items.get(word)
+            if vector is not None:
+                self._items.move_to_end(word)
+            return vector
+
+    def set(self, word, vector):
+        with self._lock:
+            self._items[word] = vector
+            self._items.move_to_end(word)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def __len__(self):
+        return len(self._items)
+
+
+_oov_cache = VectorCache(int(os.environ.get("KEYWORD_OOV_CACHE_SIZE", "50000")))
+
+
+def embed_words(words, encode, model_name=None):
+    """
+    L2-normalized float32 embeddings [len(words), dim] for a list of words.
+
+    Rows come from the precomputed table when possible, then from the OOV
+    cache; only the remaining words are passed to encode(list) -> array, in
+    a single batch.
+    """
+    import numpy as np
+
+    table = get_table(model_name)
+    result = [None] * len(words)
+    pending = list(range(len(words)))
+
+    if table is not None:
+        indices, found, pending = table.lookup(words)
+        if found:
+            # Fancy indexing copies just these rows out of the mapped file
+            rows = table.vectors[indices].astype(np.float32)
+            for position, vector in zip(found, rows):
+                result[position] = vector
+
+    missing = []
+    for position in pending:
+        vector = _oov_cache.get(words[position])
+        if vector is None:
+            missing.append(position)
+        else:
+            result[position] = vector
+
+    metrics.inc("keyword_vocab_lookups_total", len(words) - len(pending), source="table")
+    metrics.inc("keyword_vocab_lookups_total", len(pending) - len(missing), source="oov_cache")
+    metrics.inc("keyword_vocab_lookups_total", len(missing), source="encoded")
+
+    if missing:
+        encoded = np.asarray(encode([words[p] for p in missing]), dtype=np.float32)
+        encoded /= np.maximum(np.linalg.norm(encoded, axis=1, keepdims=True), 1e-12)
+        for position, vector in zip(missing, encoded):
+            _oov_cache.set(words[position], vector)
+            result[position] = vector
+
+    if not result:
+        return np.zeros((0, 0), dtype=np.float32)
+    return np.vstack(result)
+
+
+# --------------------------------------------------
+# TABLE BUILDER
+# --------------------------------------------------
+
+def _unique_words(candidates, limit=None):
+    words = []
+    seen = set()
+    for word in candidates:
+        word = word.strip().lower()
+        if word.isalpha() and word not in seen:
+            seen.add(word)
+            words.append(word)
+            if limit and len(words) >= limit:
+                break
+    return words
+
+
+def read_vocabulary(path, limit=None):
+    """Lowercase alphabetic words from a word list (or a TSV's first column)"""
+    with open(path, "r", encoding="utf-8") as f:
+        return _unique_words((line.split("\t", 1)[0] for line in f), limit)
+
+
+def wordnet_vocabulary(wordnet, limit=None):
+    """Lowercase single-word lemma names from WordNet"""
+    return _unique_words(wordnet.all_lemma_names(), limit)
+
+
+def build_table(words, encode, model_name, out_dir, batch_size=BUILD_BATCH_SIZE):
+    """Encode words in batches and write the float16 table atomically"""
+    import numpy as np
+
+    if not words:
+        raise ValueError("Cannot build an embedding table from an empty word list")
+
+    os.makedirs(out_dir, exist_ok=True)
+    tmp_path = os.path.join(out_dir, "embeddings.tmp.npy")
+
+    matrix = None
+    for start in range(0, len(words), batch_size):
+        batch = np.asarray(encode(words[start:start + batch_size]), dtype=np.float32)
+        batch /= np.maximum(np.linalg.norm(batch, axis=1, keepdims=True), 1e-12)
+        if matrix is None:
+            matrix = np.lib.format.open_memmap(
+                tmp_path, mode="w+", dtype=np.float16, shape=(len(words), batch.shape[1])
+            )
+        matrix[start:start + len(batch)] = batch.astype(np.float16)
+        print(f"\rEncoded {min(start + batch_size, len(words))}/{len(words)}", end="", file=sys.stderr)
+    print(file=sys.stderr)
+
+    matrix.flush()
+    dim = matrix.shape[1]
+    del matrix
+    os.replace(tmp_path, os.path.join(out_dir, "embeddings.npy"))
+
+    with open(os.path.join(out_dir, "words.txt"), "w", encoding="utf-8") as f:
+        f.write("\n".join(words) + "\n")
+    with open(os.path.join(out_dir, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump({"model": model_name, "dim": dim, "count": len(words)}, f)
+    return len(words)
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Build or query the keyword vocabulary embedding table")
+    parser.add_argument("command", choices=["build", "info"])
+    parser.add_argument("--out", default=DEFAULT_TABLE_DIR)
+    parser.add_argument("--word-list", help="one word per line, or a TSV whose first column is the word "
+                                            "(default: every single-word WordNet lemma)")
+    parser.add_argument("--nltk-data", help="extra NLTK data directory containing corpora/wordnet")
+    parser.add_argument("--limit", type=int, help="only the first N words")
+    parser.add_argument("--model", default="all-MiniLM-L6-v2")
+    args = parser.parse_args(argv)
+
+    if args.command == "info":
+        table = EmbeddingTable(args.out)
+        print(json.dumps(table.meta))
+        return 0
+
+    if args.word_list:
+        words = read_vocabulary(args.word_list, args.limit)
+    else:
+        import nltk
+        if args.nltk_data:
+            nltk.data.path.insert(0, args.nltk_data)
+        try:
+            nltk.data.find("corpora/wordnet")
+        except LookupError:
+            nltk.download("wordnet", quiet=True)
+        from nltk.corpus import wordnet
+        words = wordnet_vocabulary(wordnet, args.limit)
+    if not words:
+        print("No words to encode", file=sys.stderr)
+        return 1
+
+    from sentence_transformers import SentenceTransformer
+    model = SentenceTransformer(args.model)
+    count = build_table(words, lambda batch: model.encode(batch, batch_size=BUILD_BATCH_SIZE),
+                        args.model, args.out)
+    print(f"Wrote {count} embeddings to {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,209 @@
+import os
+import sys
+import json
+import time
+import argparse
+import sqlite3
+import threading
+from collections import OrderedDict
+
+import metrics
+
+# --------------------------------------------------
+# PERSISTENT WORD CACHE (SQLite, WAL mode)
+# --------------------------------------------------
+# Replaces rewriting the whole word_cache.json on every API hit:
+#   - each set() is one small atomic INSERT, safe across processes (WAL + busy timeout)
+#   - entries expire after SIMPLIFIER_CACHE_TTL seconds (0 = never)
+#   - the table is trimmed to SIMPLIFIER_CACHE_MAX_ENTRIES, oldest first
+#   - a small in-memory LRU sits in front of SQLite, with hit/miss counters
+#
+# An old word_cache.json is never read automatically; its entries are
+# unvetted API answers. Import one explicitly, with the simplifier's checks:
+#   python word_cache.py import [word_cache.json] [--cache PATH]
+
+MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CACHE_PATH = os.path.join(MODULE_DIR, "word_cache.sqlite3")
+LEGACY_JSON_PATH = os.path.join(MODULE_DIR, "word_cache.json")
+
+# How many writes between size-based eviction passes
+EVICT_EVERY = 256
+
+
+class WordCache:
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttl=0, max_entries=50000, memory_size=4096):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.memory_size = memory_size
+
+        self._local = threading.local()
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes = 0
+
+        self.hits = 0
+        self.memory_hits = 0
+        self.misses = 0
+
+        self._init_db()
+
+    # ---------- SQLite ----------
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _init_db(self):
+        conn = self._connect()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS words ("
+            " word TEXT PRIMARY KEY,"
+            " replacement TEXT NOT NULL,"
+            " updated_at REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS words_updated_at ON words(updated_at)")
+
+    def import_json(self, path, accept=None):
+        """
+        Import a legacy {word: replacement} JSON cache. Only pairs for which
+        accept(word, replacement) is true are inserted; existing entries are
+        kept. Returns (imported, skipped).
+        """
+        with open(path, 'r') as f:
+            legacy = json.load(f)
+
+        now = time.time()
+        rows = [(w.lower(), r, now) for w, r in legacy.items()
+                if accept is None or accept(w.lower(), r)]
+        self._connect().executemany("INSERT OR IGNORE INTO words VALUES (?, ?, ?)", rows)
+        return len(rows), len(legacy) - len(rows)
+
+    def _evict(self, conn):
+        if self.ttl:
+            conn.execute("DELETE FROM words WHERE updated_at < ?", (time.time() - self.ttl,))
+        if self.max_entries:
+            conn.execute(
+                "DELETE FROM words WHERE word IN ("
+                " SELECT word FROM words ORDER BY updated_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+
+    # ---------- Public API ----------
+
+    def get(self, word, default=None):
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(word)
+            fresh = entry is not None and (not self.ttl or now - entry[1] < self.ttl)
+            if fresh:
+                self._memory.move_to_end(word)
+                self.hits += 1
+                self.memory_hits += 1
+        if fresh:
+            metrics.inc("word_cache_lookups_total", result="memory_hit")
+            return entry[0]
+
+        row = self._connect().execute(
+            "SELECT replacement, updated_at FROM words WHERE word = ?", (word,)
+        ).fetchone()
+
+        with self._lock:
+            if row is None or (self.ttl and now - row[1] >= self.ttl):
+                self.misses += 1
+                hit = False
+            else:
+                self.hits += 1
+                self._remember(word, row[0], row[1])
+                hit = True
+        metrics.inc("word_cache_lookups_total", result="disk_hit" if hit else "miss")
+        return row[0] if hit else default
+
+    def set(self, word, replacement):
+        now = time.time()
+        conn = self._connect()
+        conn.execute("INSERT OR REPLACE INTO words VALUES (?, ?, ?)", (word, replacement, now))
+
+        with self._lock:
+            self._remember(word, replacement, now)
+            self._writes += 1
+            evict = self._writes % EVICT_EVERY == 0
+        if evict:
+            self._evict(conn)
+
+    def _remember(self, word, replacement, stamp):
+        self._memory[word] = (replacement, stamp)
+        self._memory.move_to_end(word)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def __contains__(self, word):
+        return self.get(word) is not None
+
+    def __getitem__(self, word):
+        value = self.get(word)
+        if value is None:
+            raise KeyError(word)
+        return value
+
+    def __setitem__(self, word, replacement):
+        self.set(word, replacement)
+
+    def __len__(self):
+        return self._connect().execute("SELECT COUNT(*) FROM words").fetchone()[0]
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "memory_hits": self.memory_hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "memory_entries": len(self._memory),
+            }
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+def get_word_cache(path=None):
+    """Process-wide WordCache for a path (default: SIMPLIFIER_CACHE_PATH)"""
+    path = path or os.environ.get("SIMPLIFIER_CACHE_PATH", DEFAULT_CACHE_PATH)
+    with _caches_lock:
+        if path not in _caches:
+            _caches[path] = WordCache(
+                path,
+                ttl=float(os.environ.get("SIMPLIFIER_CACHE_TTL", "0")),
+                max_entries=int(os.environ.get("SIMPLIFIER_CACHE_MAX_ENTRIES", "50000")),
+            )
+        return _caches[path]
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Maintain the simplifier's word cache")
+    parser.add_argument("command", choices=["import", "stats"])
+    parser.add_argument("json", nargs="?", default=LEGACY_JSON_PATH, help="legacy JSON cache to import")
+    parser.add_argument("--cache", help="SQLite cache path (default: SIMPLIFIER_CACHE_PATH)")
+    args = parser.parse_args(argv)
+
+    cache = get_word_cache(args.cache)
+    if args.command == "stats":
+        print(f"{len(cache)} entries in {cache.path}")
+        return 0
+
+    # Imported here: the simplifier itself imports this module
+    from text_simplification_advanced import AccurateTextSimplifier
+    simplifier = AccurateTextSimplifier()
+    imported, skipped = cache.import_json(args.json, accept=simplifier.accepts_cached)
+    print(f"Imported {imported} entries into {cache.path} ({skipped} rejected)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))